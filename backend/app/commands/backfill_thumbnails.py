@@ -0,0 +1,105 @@
+"""
+Generate list thumbnails for receipts uploaded before thumbnails existed (or whose
+thumbnail upload failed). Safe to re-run: only rows without thumbnail_path are visited.
+
+    python -m app.commands.backfill_thumbnails                   # every receipt
+    python -m app.commands.backfill_thumbnails --user <uuid>     # one user's receipts
+    python -m app.commands.backfill_thumbnails --limit 500       # at most 500 receipts
+"""
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from supabase import Client
+
+from app.config import settings
+from app.db.supabase import get_supabase_admin
+from app.services.images import make_thumbnail
+from app.services.receipts import (
+    BUCKET,
+    THUMBNAIL_CONTENT_TYPE,
+    _sniff_content_type,
+    _thumbnail_path,
+)
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = 200
+
+
+def pending_page(supabase: Client, after_id: Optional[str], user_id: Optional[str]) -> list[dict]:
+    """Next receipts without a thumbnail, in id order (keyset, so undecodable files are passed once)."""
+    query = supabase.table("receipts").select("id,user_id,storage_path").is_("thumbnail_path", "null")
+    if user_id:
+        query = query.eq("user_id", user_id)
+    if after_id:
+        query = query.gt("id", after_id)
+    return query.order("id").limit(_PAGE_SIZE).execute().data
+
+
+def backfill(supabase: Client, row: dict) -> bool:
+    """Thumbnail one receipt. False when its file can't be thumbnailed (e.g. a PDF)."""
+    if row["storage_path"].endswith(".pdf"):
+        return False
+    bucket = supabase.storage.from_(BUCKET)
+    original = bucket.download(row["storage_path"])
+    thumbnail = make_thumbnail(original, _sniff_content_type(original[:16]))
+    if thumbnail is None:
+        return False
+
+    path = _thumbnail_path(row["user_id"], row["id"])
+    bucket.upload(path=path, file=thumbnail, file_options={"content-type": THUMBNAIL_CONTENT_TYPE, "upsert": "true"})
+    updated = (
+        supabase.table("receipts")
+        .update({"thumbnail_path": path})
+        .eq("id", row["id"])
+        .is_("thumbnail_path", "null")
+        .execute()
+    ).data
+    if not updated:
+        # Deleted meanwhile (or thumbnailed by an upload retry): don't leave an orphan
+        bucket.remove([path])
+        return False
+    return True
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate missing receipt thumbnails.")
+    parser.add_argument("--user", help="only this user id")
+    parser.add_argument("--limit", type=int, help="stop after this many receipts")
+    args = parser.parse_args(argv)
+    if settings.thumbnail_size <= 0:
+        parser.error("THUMBNAIL_SIZE is 0 (thumbnails disabled)")
+
+    supabase = get_supabase_admin()
+    visited = created = failed = 0
+    after_id = None
+
+    def _one(row: dict) -> Optional[bool]:
+        try:
+            return backfill(supabase, row)
+        except Exception as e:
+            logger.error("Thumbnail for receipt %s failed: %s", row["id"], e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=settings.storage_upload_concurrency) as pool:
+        while args.limit is None or visited < args.limit:
+            page = pending_page(supabase, after_id, args.user)
+            if args.limit is not None:
+                page = page[:args.limit - visited]
+            if not page:
+                break
+            results = list(pool.map(_one, page))
+            visited += len(page)
+            created += sum(1 for r in results if r)
+            failed += sum(1 for r in results if r is None)
+            after_id = page[-1]["id"]
+
+    print(f"Created {created} thumbnails for {visited} receipts ({failed} failed, {visited - created - failed} skipped)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+"""
+Rebuild stored dashboard summaries from the source tables — repair after a failed
+incremental update, a manual data fix or a public holiday correction.
+
+    python -m app.commands.rebuild_summaries                          # every stored summary
+    python -m app.commands.rebuild_summaries --user <uuid>            # one user's stored years
+    python -m app.commands.rebuild_summaries --user <uuid> --year 2025
+"""
+import argparse
+import logging
+from typing import Optional
+
+from supabase import Client
+
+from app.db.supabase import get_supabase_admin
+from app.services import summaries
+from app.services.dashboard import DEFAULT_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = 1000  # PostgREST's default max rows per response
+
+
+def stored_years(supabase: Client, user_id: Optional[str] = None) -> list[tuple[str, int]]:
+    """(user_id, year) of every stored summary, optionally for one user."""
+    keys: list[tuple[str, int]] = []
+    while True:
+        query = supabase.table(summaries.TABLE).select("user_id,year")
+        if user_id:
+            query = query.eq("user_id", user_id)
+        page = query.order("user_id").order("year").range(len(keys), len(keys) + _PAGE_SIZE - 1).execute().data
+        keys += [(r["user_id"], r["year"]) for r in page]
+        if len(page) < _PAGE_SIZE:
+            return keys
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild stored dashboard summaries.")
+    parser.add_argument("--user", help="only this user id")
+    parser.add_argument("--year", type=int, help="only this year (requires --user; built even if not stored yet)")
+    args = parser.parse_args(argv)
+    if args.year is not None and not args.user:
+        parser.error("--year requires --user")
+
+    supabase = get_supabase_admin()
+    targets = [(args.user, args.year)] if args.year is not None else stored_years(supabase, args.user)
+    failed = 0
+    for user_id, year in targets:
+        try:
+            summaries.rebuild(supabase, user_id, year, DEFAULT_SETTINGS)
+        except Exception as e:
+            failed += 1
+            logger.error("Rebuilding summary %s/%s failed: %s", user_id, year, e)
+    print(f"Rebuilt {len(targets) - failed} of {len(targets)} summaries")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
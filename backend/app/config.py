@@ -15,10 +15,91 @@ class Settings(BaseSettings):
     supabase_anon_key: str
     supabase_service_role_key: str = ""
 
+    # Access-token verification — "local" checks the JWT signature/claims in-process
+    # and only falls back to Supabase Auth when that fails; "remote" always asks Supabase
+    auth_verification: str = "local"
+    supabase_jwt_secret: str = ""              # legacy HS256 secret (Project Settings > API)
+    supabase_jwt_audience: str = "authenticated"
+    jwks_cache_ttl: int = 600                  # seconds before the JWKS is re-fetched
+
+    # Shared Supabase HTTP connection pool
+    supabase_pool_max_connections: int = 50
+    supabase_pool_max_keepalive: int = 20
+    supabase_pool_keepalive_expiry: float = 30.0  # seconds an idle connection is kept open
+    supabase_http_timeout: float = 30.0
+
+    # Nager.Date response cache (memory + SQLite); empty path disables the disk tier
+    holiday_cache_path: str = ".cache/nager.sqlite3"
+    holiday_cache_ttl: int = 7 * 24 * 3600         # serve without revalidating
+    holiday_cache_stale_ttl: int = 90 * 24 * 3600  # then serve stale while refreshing
+    # Countries served by the built-in holiday rules instead of Nager.Date ([] = always Nager)
+    offline_holiday_countries: list[str] = ["LU", "BE", "FR", "DE"]
+
     # Google Cloud Vision — use file path locally, JSON content in cloud
     google_application_credentials: str = ""  # path to JSON file (local dev)
     google_credentials_json: str = ""          # raw JSON content (cloud deployment)
 
+    # OCR pipeline — "sync" runs OCR inside the upload request, "background" returns
+    # a "pending" receipt immediately and resolves it on a worker pool
+    ocr_mode: str = "sync"
+    ocr_workers: int = 4
+    ocr_pending_timeout: int = 600             # seconds before a pending receipt is re-queued by recovery
+    # OCR engine — "vision" (Google Cloud Vision), "fixture" (deterministic, offline)
+    # or "tesseract" (optional local backend)
+    ocr_engine: str = "vision"
+    ocr_fixture_dir: str = ""                  # <sha256>.txt files for the fixture engine
+    # OCR text cache keyed by image hash (memory + SQLite); empty path = memory only
+    ocr_cache_path: str = ".cache/ocr.sqlite3"
+    ocr_cache_ttl: int = 365 * 24 * 3600
+
+    # Uploads larger than this are rejected (on Content-Length before the body is read,
+    # else while reading the received file), before any upstream call
+    upload_max_bytes: int = 15 * 1024 * 1024
+
+    # Image normalization before OCR (EXIF rotate, downscale, recompress)
+    image_normalize: bool = True
+    image_store_normalized: bool = False       # store the normalized image instead of the original
+    image_max_dimension: int = 2048            # longest side in pixels
+    image_grayscale: bool = False
+    image_jpeg_quality: int = 80
+
+    # Receipt list thumbnails, WebP, generated at upload (0 = none)
+    thumbnail_size: int = 256                  # longest side in pixels
+    thumbnail_quality: int = 70
+
+    # Multi-file uploads
+    upload_batch_max_files: int = 50
+    ocr_batch_size: int = 16                   # images per batched OCR call (Vision max: 16)
+    storage_upload_concurrency: int = 8
+
+    # Concurrent upstream loading for dashboard/report
+    loader_workers: int = 32
+    loader_timeout: float = 10.0               # seconds per upstream call
+
+    # GET /dashboard/range
+    dashboard_max_range_years: int = 10
+
+    # GET /receipts pagination
+    receipts_page_size: int = 50
+    receipts_max_page_size: int = 200
+
+    # Generated report PDFs stored in Storage and reused while their inputs are unchanged
+    report_cache: bool = True
+
+    # Background report generation (POST /report/jobs)
+    report_workers: int = 2
+    report_max_active_jobs: int = 3            # queued or running jobs per user
+    report_job_lease: int = 600                # seconds without progress before a job is re-queued
+
+    # PDF rendering on worker processes (0 = render in the API process's threadpool)
+    report_renderers: int = 2
+    report_render_timeout: float = 60.0        # seconds per report
+    report_group_receipts_by_month: bool = False  # month rows with receipt/day subtotals
+
+    # Signed URLs (reused until less than this fraction of their lifetime is left)
+    signed_url_reuse_fraction: float = 0.5
+    signed_url_cache_size: int = 10_000
+
     # App
     app_env: str = "development"
     secret_key: str = "change-me"
@@ -1,13 +1,118 @@
-from supabase import Client, create_client
+import threading
+from typing import Optional
+
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, Client, ClientOptions, acreate_client, create_client
 
 from app.config import settings
 
+# Process-wide state, created in the FastAPI lifespan hook (lazily for scripts/workers)
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_admin_client: Optional[Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_async_admin_client: Optional[AsyncClient] = None
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "timeout": httpx.Timeout(settings.supabase_http_timeout),
+        "limits": httpx.Limits(
+            max_connections=settings.supabase_pool_max_connections,
+            max_keepalive_connections=settings.supabase_pool_max_keepalive,
+            keepalive_expiry=settings.supabase_pool_keepalive_expiry,
+        ),
+        "follow_redirects": True,
+        "http2": True,
+    }
+
+
+def _pooled_http_client() -> httpx.Client:
+    return httpx.Client(**_pool_kwargs())
+
+
+def _options() -> ClientOptions:
+    # No session persistence/refresh: this API never acts as a logged-in Supabase user
+    return ClientOptions(
+        httpx_client=_http_client,
+        persist_session=False,
+        auto_refresh_token=False,
+    )
+
+
+def init_clients() -> None:
+    """Create the shared connection pool and service-role client (idempotent)."""
+    global _http_client, _admin_client
+    with _lock:
+        if _http_client is None:
+            _http_client = _pooled_http_client()
+        if _admin_client is None:
+            _admin_client = create_client(
+                settings.supabase_url, settings.supabase_service_role_key, options=_options()
+            )
+
+
+def close_clients() -> None:
+    """Drop the shared clients and close pooled connections."""
+    global _http_client, _admin_client
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _admin_client = None
+
 
 def get_supabase() -> Client:
-    """Anon-key client — for auth operations (sign in, sign up, JWT verification)."""
-    return create_client(settings.supabase_url, settings.supabase_anon_key)
+    """Anon-key client — for auth operations (sign in, sign up, JWT verification).
+
+    A fresh client per call because sign-in stores the session on the client,
+    but it rides on the shared connection pool.
+    """
+    if _http_client is None:
+        init_clients()
+    return create_client(settings.supabase_url, settings.supabase_anon_key, options=_options())
 
 
 def get_supabase_admin() -> Client:
-    """Service-role client — for DB access and admin auth actions (e.g. sign out)."""
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    """Service-role client — for DB access and admin auth actions (e.g. sign out).
+
+    Shared across requests and threads; it never holds a user session.
+    """
+    if _admin_client is None:
+        init_clients()
+    return _admin_client
+
+
+async def init_async_clients() -> None:
+    """Create the event-loop connection pool and async service-role client (idempotent).
+
+    Must run on the serving event loop: httpx.AsyncClient is bound to the loop it's used on.
+    """
+    global _async_http_client, _async_admin_client
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(**_pool_kwargs())
+    if _async_admin_client is None:
+        _async_admin_client = await acreate_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=AsyncClientOptions(
+                httpx_client=_async_http_client,
+                persist_session=False,
+                auto_refresh_token=False,
+            ),
+        )
+
+
+async def close_async_clients() -> None:
+    global _async_http_client, _async_admin_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+    _async_http_client = None
+    _async_admin_client = None
+
+
+async def get_async_supabase_admin() -> AsyncClient:
+    """Async service-role client for `async def` endpoints — never blocks a worker thread."""
+    if _async_admin_client is None:
+        await init_async_clients()
+    return _async_admin_client
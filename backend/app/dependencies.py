@@ -1,21 +1,33 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from supabase_auth.errors import AuthApiError
-from supabase import Client
 
+from app.config import settings
 from app.db.supabase import get_supabase_admin
+from app.models.auth import AuthenticatedUser
+from app.services.tokens import verify_access_token
 
 bearer_scheme = HTTPBearer()
 
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    supabase: Client = Depends(get_supabase_admin),
-):
-    """Verify the Bearer JWT and return the authenticated Supabase user."""
+) -> AuthenticatedUser:
+    """Verify the Bearer JWT and return the authenticated user.
+
+    In "local" mode the token is checked in-process; Supabase Auth is only
+    consulted for tokens that can't be verified locally (unknown key, missing secret…).
+    Both paths return the same AuthenticatedUser (UUID `id`).
+    """
+    token = credentials.credentials
+    if settings.auth_verification == "local":
+        user = verify_access_token(token)
+        if user is not None:
+            return user
+
     try:
-        response = supabase.auth.get_user(credentials.credentials)
-        return response.user
+        user = get_supabase_admin().auth.get_user(token).user
+        return AuthenticatedUser(id=user.id, email=user.email, role=user.role, aud=user.aud)
     except (AuthApiError, Exception):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
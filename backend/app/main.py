@@ -1,16 +1,61 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from typing import Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.services.receipts import _too_large
+
+logger = logging.getLogger(__name__)
+
+# Room for a multipart part's boundary and headers, on top of UPLOAD_MAX_BYTES per file
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+async def _periodically(job: Callable[[], object], interval: float) -> None:
+    """Run a blocking recovery job now and then every `interval` seconds; errors are logged, never raised."""
+    while True:
+        try:
+            await asyncio.to_thread(job)
+        except Exception as e:
+            logger.error("%s.%s failed: %s", job.__module__, job.__qualname__, e)
+        await asyncio.sleep(interval)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: validate Supabase connection
-    from app.db.supabase import get_supabase
-    get_supabase()
+    # Startup: create the shared Supabase clients (sync and async) and connection pools
+    from app.db.supabase import close_async_clients, close_clients, init_async_clients, init_clients
+    from app.services import loaders, nager, ocr_jobs, renderer, report_jobs
+    init_clients()
+    await init_async_clients()
+    recovery = []
+    if settings.ocr_mode == "background":
+        ocr_jobs.start()
+        # Receipts left pending by a crashed or stopped instance
+        recovery.append(asyncio.create_task(
+            _periodically(ocr_jobs.recover_pending, settings.ocr_pending_timeout / 2)
+        ))
+    renderer.start()
+    # Report jobs left without progress by a crashed or stopped instance
+    recovery.append(asyncio.create_task(
+        _periodically(report_jobs.recover_pending, settings.report_job_lease / 2)
+    ))
     yield
-    # Shutdown: nothing to clean up for now
+    # Shutdown: let running OCR and report jobs finish, then close pooled connections
+    for task in recovery:
+        task.cancel()
+    ocr_jobs.shutdown()
+    report_jobs.shutdown()
+    renderer.shutdown()
+    loaders.shutdown()
+    await nager.aclose()
+    await close_async_clients()
+    close_clients()
 
 
 app = FastAPI(
@@ -20,6 +65,25 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+# Registered before CORS so a 413 still carries CORS headers
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    413 for an upload whose declared Content-Length is already over the limit. Starlette
+    spools the whole multipart body to a temporary file before the route runs, so this is
+    the only check that comes before the body is received; chunked uploads (no
+    Content-Length) are stopped by the per-file check while the route reads them.
+    """
+    files = {"/receipts/upload": 1, "/receipts/upload-batch": settings.upload_batch_max_files}
+    max_files = files.get(request.url.path) if request.method == "POST" else None
+    length = request.headers.get("content-length", "")
+    if max_files and length.isdigit() and int(length) > max_files * (settings.upload_max_bytes + _MULTIPART_OVERHEAD):
+        error = _too_large(settings.upload_max_bytes)
+        return JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+    return await call_next(request)
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Tighten in production
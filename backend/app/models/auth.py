@@ -1,3 +1,6 @@
+from typing import Optional
+from uuid import UUID
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -24,3 +27,11 @@ class AuthResponse(BaseModel):
 
 class MessageResponse(BaseModel):
     message: str
+
+
+class AuthenticatedUser(BaseModel):
+    """Caller identity built from verified access-token claims."""
+    id: UUID
+    email: Optional[str] = None
+    role: Optional[str] = None
+    aud: Optional[str] = None
@@ -63,3 +63,22 @@ class DashboardSummary(BaseModel):
     remaining_allowed_homeworking_days: int
     is_at_risk: bool
     compliance_status: str               # "compliant" | "at_risk" for iOS
+
+
+class DashboardRange(BaseModel):
+    from_year: int
+    to_year: int
+    years: list[DashboardSummary]
+
+
+class RollingSummary(BaseModel):
+    start_date: date
+    end_date: date
+    working_country_code: str
+    homeworking_threshold: int
+    total_working_days: int              # working days in the window up to today
+    days_with_proof: int
+    days_without_proof: int
+    remaining_allowed_homeworking_days: int
+    is_at_risk: bool
+    compliance_status: str
@@ -9,13 +9,21 @@ class ReceiptOut(BaseModel):
     id: UUID
     user_id: UUID
     receipt_date: Optional[date]
-    ocr_status: str   # success | no_date_found | failed | skipped | manual
+    ocr_status: str   # pending | success | no_date_found | failed | skipped | manual
     storage_path: str
     image_url: str
+    thumbnail_path: Optional[str] = None   # null for PDFs and receipts not backfilled yet
+    thumbnail_url: Optional[str] = None
     notes: Optional[str]
     created_at: datetime
 
 
+class ReceiptOcrStatus(BaseModel):
+    id: UUID
+    ocr_status: str
+    receipt_date: Optional[date]
+
+
 class ReceiptDateUpdate(BaseModel):
     receipt_date: date
 
@@ -23,3 +31,18 @@ class ReceiptDateUpdate(BaseModel):
 class ReceiptListResponse(BaseModel):
     receipts: list[ReceiptOut]
     total: int
+    next_cursor: Optional[str]
+
+
+class BatchUploadResult(BaseModel):
+    filename: Optional[str]
+    status: str   # created | existing | failed
+    receipt: Optional[ReceiptOut]
+    error: Optional[str]
+
+
+class BatchUploadResponse(BaseModel):
+    results: list[BatchUploadResult]
+    created: int
+    existing: int
+    failed: int
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ReportJob(BaseModel):
+    id: UUID
+    year: int
+    status: str                  # queued | running | done | failed
+    stage: Optional[str]         # loading | signing | rendering | storing while running
+    progress: int                # percent
+    download_url: Optional[str]  # signed link to the PDF once done
+    error: Optional[str]
+    created_at: datetime
@@ -29,4 +29,4 @@ def logout(
     current_user=Depends(get_current_user),
     admin: Client = Depends(get_supabase_admin),
 ):
-    auth_service.logout(admin, current_user.id)
+    auth_service.logout(admin, str(current_user.id))
@@ -1,93 +1,98 @@
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status
-from supabase import Client
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from supabase import AsyncClient
 
-from app.db.supabase import get_supabase_admin
+from app.config import settings as app_settings
+from app.db.supabase import get_async_supabase_admin
 from app.dependencies import get_current_user
 from app.models.dashboard import (
-    DashboardSummary, UserHolidayIn, UserHolidayOut, UserSettings, UserSettingsUpdate,
+    DashboardRange, DashboardSummary, RollingSummary, UserHolidayIn, UserHolidayOut, UserSettings, UserSettingsUpdate,
     WorkSchedulePeriodIn, WorkSchedulePeriodOut,
 )
 from app.services import dashboard as dashboard_service
-from app.services.nager import fetch_public_holidays
+from app.services import loaders, summaries
+from app.services.dashboard import DEFAULT_SETTINGS
 
 router = APIRouter()
 
-# ---------------------------------------------------------------------------
-# Default settings used when a user hasn't configured their profile yet
-# ---------------------------------------------------------------------------
-_DEFAULTS = {
-    "working_country_code": "LU",
-    "residence_country_code": "BE",
-    "homeworking_threshold": 34,
-    "working_days": [0, 1, 2, 3, 4],
-}
-
-
 # ---------------------------------------------------------------------------
 # Main dashboard summary
 # ---------------------------------------------------------------------------
 
 @router.get("", response_model=DashboardSummary)
-def get_summary(
+async def get_summary(
+    response: Response,
     year: int = date.today().year,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
-    user_id = str(current_user.id)
+    # One stored row per (user, year); rebuilt from the source tables when missing or stale
+    summary, server_timing = await summaries.get_summary_async(supabase, str(current_user.id), year, DEFAULT_SETTINGS)
+    response.headers["Server-Timing"] = server_timing
+    return summary
 
-    # User settings (fall back to defaults if not configured)
-    settings_row = (
-        supabase.table("user_settings").select("*").eq("user_id", user_id).execute()
-    )
-    settings = settings_row.data[0] if settings_row.data else {**_DEFAULTS, "user_id": user_id}
-
-    # Receipts for the year
-    receipts = (
-        supabase.table("receipts")
-        .select("receipt_date")
-        .eq("user_id", user_id)
-        .gte("receipt_date", date(year, 1, 1).isoformat())
-        .lte("receipt_date", date(year, 12, 31).isoformat())
-        .execute()
-    )
-    receipt_dates = {
-        date.fromisoformat(r["receipt_date"])
-        for r in receipts.data
-        if r["receipt_date"]
-    }
-
-    # Public holidays for the working country
-    public_holidays = fetch_public_holidays(year, settings["working_country_code"])
-
-    # User-defined holiday periods
-    holidays = (
-        supabase.table("user_holidays")
-        .select("start_date,end_date")
-        .eq("user_id", user_id)
-        .execute()
-    )
-    user_holiday_dates = dashboard_service.expand_holiday_periods(holidays.data)
-
-    # Work schedule periods
-    schedule_periods = (
-        supabase.table("work_schedule_periods")
-        .select("*")
-        .eq("user_id", user_id)
-        .execute()
-    ).data
 
-    return dashboard_service.compute_summary(
-        year=year,
-        receipt_dates=receipt_dates,
-        public_holidays=public_holidays,
-        user_holiday_dates=user_holiday_dates,
+@router.get("/range", response_model=DashboardRange)
+async def get_range(
+    response: Response,
+    from_year: int,
+    to_year: int,
+    current_user=Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
+):
+    max_years = app_settings.dashboard_max_range_years
+    if from_year > to_year or to_year - from_year + 1 > max_years:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"from_year must not be after to_year, and the range can span at most {max_years} years",
+        )
+
+    # One load for the whole span instead of one GET /dashboard per year
+    user_id = str(current_user.id)
+    inputs, calls = await loaders.load_range_inputs_async(supabase, user_id, from_year, to_year, DEFAULT_SETTINGS)
+    response.headers["Server-Timing"] = calls.server_timing()
+    settings = inputs["settings"]
+
+    years = [
+        dashboard_service.compute_summary(
+            year=year,
+            receipt_dates=inputs["receipt_dates"][year],
+            public_holidays=inputs["public_holidays"][year],
+            user_holidays=inputs["user_holiday_intervals"][year],
+            threshold=settings["homeworking_threshold"],
+            working_country_code=settings["working_country_code"],
+            working_days=settings.get("working_days"),
+            schedule_periods=inputs["schedule_periods"],
+        )
+        for year in range(from_year, to_year + 1)
+    ]
+    return {"from_year": from_year, "to_year": to_year, "years": years}
+
+
+@router.get("/rolling", response_model=RollingSummary)
+async def get_rolling(
+    response: Response,
+    current_user=Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
+):
+    start, end = dashboard_service.rolling_window(date.today())
+    user_id = str(current_user.id)
+    inputs, calls = await loaders.load_range_inputs_async(supabase, user_id, start.year, end.year, DEFAULT_SETTINGS)
+    response.headers["Server-Timing"] = calls.server_timing()
+    settings = inputs["settings"]
+
+    return dashboard_service.compute_window_summary(
+        start=start,
+        end=end,
+        receipt_dates=inputs["receipt_dates"],
+        public_holidays=inputs["public_holidays"],
+        user_holidays=inputs["user_holiday_intervals"],
         threshold=settings["homeworking_threshold"],
         working_country_code=settings["working_country_code"],
         working_days=settings.get("working_days"),
-        schedule_periods=schedule_periods,
+        schedule_periods=inputs["schedule_periods"],
     )
 
 
@@ -96,22 +101,22 @@ def get_summary(
 # ---------------------------------------------------------------------------
 
 @router.get("/settings", response_model=UserSettings)
-def get_settings(
+async def get_settings(
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     user_id = str(current_user.id)
-    result = supabase.table("user_settings").select("*").eq("user_id", user_id).execute()
+    result = await supabase.table("user_settings").select("*").eq("user_id", user_id).execute()
     if not result.data:
-        return {**_DEFAULTS, "user_id": user_id}
+        return {**DEFAULT_SETTINGS, "user_id": user_id}
     return result.data[0]
 
 
 @router.put("/settings", response_model=UserSettings)
-def update_settings(
+async def update_settings(
     body: UserSettingsUpdate,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     user_id = str(current_user.id)
 
@@ -119,11 +124,12 @@ def update_settings(
     payload = {k: v for k, v in body.model_dump().items() if v is not None}
     payload["user_id"] = user_id
 
-    result = (
+    result = await (
         supabase.table("user_settings")
         .upsert(payload, on_conflict="user_id")
         .execute()
     )
+    await summaries.settings_changed_async(supabase, user_id)
     return result.data[0]
 
 
@@ -132,10 +138,10 @@ def update_settings(
 # ---------------------------------------------------------------------------
 
 @router.get("/holidays", response_model=list[UserHolidayOut])
-def list_holidays(
+async def list_holidays(
     year: Optional[int] = None,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     user_id = str(current_user.id)
     query = (
@@ -147,14 +153,14 @@ def list_holidays(
     if year:
         query = query.gte("start_date", date(year, 1, 1).isoformat()).lte("end_date", date(year, 12, 31).isoformat())
 
-    return query.execute().data
+    return (await query.execute()).data
 
 
 @router.post("/holidays", response_model=UserHolidayOut, status_code=status.HTTP_201_CREATED)
-def create_holiday(
+async def create_holiday(
     body: UserHolidayIn,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     user_id = str(current_user.id)
     row = {
@@ -163,16 +169,17 @@ def create_holiday(
         "end_date": body.end_date.isoformat(),
         "description": body.description,
     }
-    result = supabase.table("user_holidays").insert(row).execute()
+    result = await supabase.table("user_holidays").insert(row).execute()
+    await summaries.period_changed_async(supabase, user_id, result.data[0])
     return result.data[0]
 
 
 @router.put("/holidays/{holiday_id}", response_model=UserHolidayOut)
-def update_holiday(
+async def update_holiday(
     holiday_id: str,
     body: UserHolidayIn,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     row = {
         "start_date": body.start_date.isoformat(),
@@ -180,26 +187,30 @@ def update_holiday(
         "description": body.description,
     }
     from fastapi import HTTPException
-    result = (
+    user_id = str(current_user.id)
+    previous = await _period(supabase, "user_holidays", holiday_id, user_id)
+    result = await (
         supabase.table("user_holidays")
         .update(row)
         .eq("id", holiday_id)
-        .eq("user_id", str(current_user.id))
+        .eq("user_id", user_id)
         .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Holiday not found")
+    await summaries.period_changed_async(supabase, user_id, previous, result.data[0])
     return result.data[0]
 
 
 @router.delete("/holidays/{holiday_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_holiday(
+async def delete_holiday(
     holiday_id: str,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     user_id = str(current_user.id)
-    supabase.table("user_holidays").delete().eq("id", holiday_id).eq("user_id", user_id).execute()
+    result = await supabase.table("user_holidays").delete().eq("id", holiday_id).eq("user_id", user_id).execute()
+    await summaries.period_changed_async(supabase, user_id, *result.data)
 
 
 # ---------------------------------------------------------------------------
@@ -207,12 +218,12 @@ def delete_holiday(
 # ---------------------------------------------------------------------------
 
 @router.get("/schedule", response_model=list[WorkSchedulePeriodOut])
-def list_schedule_periods(
+async def list_schedule_periods(
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     return (
-        supabase.table("work_schedule_periods")
+        await supabase.table("work_schedule_periods")
         .select("*")
         .eq("user_id", str(current_user.id))
         .order("start_date")
@@ -221,27 +232,30 @@ def list_schedule_periods(
 
 
 @router.post("/schedule", response_model=WorkSchedulePeriodOut, status_code=status.HTTP_201_CREATED)
-def create_schedule_period(
+async def create_schedule_period(
     body: WorkSchedulePeriodIn,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
+    user_id = str(current_user.id)
     row = {
-        "user_id": str(current_user.id),
+        "user_id": user_id,
         "start_date": body.start_date.isoformat(),
         "end_date": body.end_date.isoformat() if body.end_date else None,
         "working_days": body.working_days,
         "description": body.description,
     }
-    return supabase.table("work_schedule_periods").insert(row).execute().data[0]
+    created = (await supabase.table("work_schedule_periods").insert(row).execute()).data[0]
+    await summaries.period_changed_async(supabase, user_id, created)
+    return created
 
 
 @router.put("/schedule/{period_id}", response_model=WorkSchedulePeriodOut)
-def update_schedule_period(
+async def update_schedule_period(
     period_id: str,
     body: WorkSchedulePeriodIn,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     row = {
         "start_date": body.start_date.isoformat(),
@@ -249,23 +263,36 @@ def update_schedule_period(
         "working_days": body.working_days,
         "description": body.description,
     }
-    result = (
+    user_id = str(current_user.id)
+    previous = await _period(supabase, "work_schedule_periods", period_id, user_id)
+    result = await (
         supabase.table("work_schedule_periods")
         .update(row)
         .eq("id", period_id)
-        .eq("user_id", str(current_user.id))
+        .eq("user_id", user_id)
         .execute()
     )
     if not result.data:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Schedule period not found")
+    await summaries.period_changed_async(supabase, user_id, previous, result.data[0])
     return result.data[0]
 
 
 @router.delete("/schedule/{period_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_schedule_period(
+async def delete_schedule_period(
     period_id: str,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
-    supabase.table("work_schedule_periods").delete().eq("id", period_id).eq("user_id", str(current_user.id)).execute()
+    user_id = str(current_user.id)
+    result = await supabase.table("work_schedule_periods").delete().eq("id", period_id).eq("user_id", user_id).execute()
+    await summaries.period_changed_async(supabase, user_id, *result.data)
+
+
+async def _period(supabase: AsyncClient, table: str, period_id: str, user_id: str) -> Optional[dict]:
+    """A holiday or schedule period's current dates, before it is edited."""
+    rows = (
+        await supabase.table(table).select("start_date,end_date").eq("id", period_id).eq("user_id", user_id).execute()
+    ).data
+    return rows[0] if rows else None
@@ -1,59 +1,86 @@
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, UploadFile, status
-from supabase import Client
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from supabase import AsyncClient, Client
 
-from app.db.supabase import get_supabase_admin
+from app.config import settings
+from app.db.supabase import get_async_supabase_admin, get_supabase_admin
 from app.dependencies import get_current_user
-from app.models.receipts import ReceiptDateUpdate
+from app.models.receipts import BatchUploadResponse, ReceiptDateUpdate, ReceiptOcrStatus
 from app.services import receipts as receipts_service
 
 router = APIRouter()
 
 
 @router.post("/upload", status_code=status.HTTP_201_CREATED)
-def upload_receipt(
+async def upload_receipt(
     file: UploadFile = File(...),
     current_user=Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
+):
+    return await receipts_service.upload_receipt_async(supabase, str(current_user.id), file)
+
+
+@router.post("/upload-batch", response_model=BatchUploadResponse)
+def upload_receipts_batch(
+    files: list[UploadFile] = File(...),
+    current_user=Depends(get_current_user),
     supabase: Client = Depends(get_supabase_admin),
 ):
-    return receipts_service.upload_receipt(supabase, str(current_user.id), file)
+    return receipts_service.upload_receipts_batch(supabase, str(current_user.id), files)
 
 
 @router.get("")
-def list_receipts(
+async def list_receipts(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.receipts_max_page_size),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
-    return receipts_service.list_receipts(supabase, str(current_user.id), start_date, end_date)
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    return await receipts_service.list_receipts_async(
+        supabase, str(current_user.id), start_date, end_date, limit, cursor, field_list
+    )
 
 
 @router.get("/{receipt_id}")
-def get_receipt(
+async def get_receipt(
     receipt_id: str,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
-    return receipts_service.get_receipt(supabase, str(current_user.id), receipt_id)
+    return await receipts_service.get_receipt_async(supabase, str(current_user.id), receipt_id)
+
+
+@router.get("/{receipt_id}/status", response_model=ReceiptOcrStatus)
+async def get_ocr_status(
+    receipt_id: str,
+    current_user=Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
+):
+    return await receipts_service.get_ocr_status_async(supabase, str(current_user.id), receipt_id)
 
 
 @router.put("/{receipt_id}/date")
-def update_receipt_date(
+async def update_receipt_date(
     receipt_id: str,
     body: ReceiptDateUpdate,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
-    return receipts_service.update_receipt_date(supabase, str(current_user.id), receipt_id, body.receipt_date)
+    return await receipts_service.update_receipt_date_async(
+        supabase, str(current_user.id), receipt_id, body.receipt_date
+    )
 
 
 @router.delete("/{receipt_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_receipt(
+async def delete_receipt(
     receipt_id: str,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
-    receipts_service.delete_receipt(supabase, str(current_user.id), receipt_id)
+    await receipts_service.delete_receipt_async(supabase, str(current_user.id), receipt_id)
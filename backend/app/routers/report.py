@@ -1,109 +1,74 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 from fastapi.responses import Response
-from supabase import Client
+from supabase import AsyncClient
 
-from app.db.supabase import get_supabase_admin
+from app.config import settings as app_settings
+from app.db.supabase import get_async_supabase_admin
 from app.dependencies import get_current_user
-from app.services import dashboard as dashboard_service
-from app.services.nager import fetch_public_holidays, fetch_public_holidays_detailed
-from app.services.pdf import REPORT_SIGNED_URL_EXPIRY, generate_compliance_report
+from app.models.report import ReportJob
+from app.services import loaders, renderer, report_cache, report_jobs
+from app.services.dashboard import DEFAULT_SETTINGS
+from app.services.pdf import REPORT_SIGNED_URL_EXPIRY
 
 router = APIRouter()
 
-_DEFAULTS = {
-    "working_country_code": "LU",
-    "residence_country_code": "BE",
-    "homeworking_threshold": 34,
-    "working_days": [0, 1, 2, 3, 4],
-}
-
-
 @router.get("")
-def get_compliance_report(
+async def get_compliance_report(
     year: int = date.today().year,
     current_user=Depends(get_current_user),
-    supabase: Client = Depends(get_supabase_admin),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
 ):
     user_id = str(current_user.id)
     user_email = current_user.email or user_id
 
-    # User settings
-    settings_row = supabase.table("user_settings").select("*").eq("user_id", user_id).execute()
-    settings = settings_row.data[0] if settings_row.data else {**_DEFAULTS, "user_id": user_id}
+    # Settings, receipts, holidays and schedule periods, loaded concurrently. Receipt
+    # URLs are only signed if the report has to be generated.
+    inputs, calls = await loaders.load_report_inputs_async(supabase, user_id, year, DEFAULT_SETTINGS, None)
 
-    # Receipts for the year with long-lived signed URLs
-    receipts_result = (
-        supabase.table("receipts")
-        .select("*")
-        .eq("user_id", user_id)
-        .gte("receipt_date", date(year, 1, 1).isoformat())
-        .lte("receipt_date", date(year, 12, 31).isoformat())
-        .order("receipt_date")
-        .execute()
-    )
-    receipts = receipts_result.data
-    for r in receipts:
-        signed = supabase.storage.from_("receipts").create_signed_url(
-            r["storage_path"], REPORT_SIGNED_URL_EXPIRY
-        )
-        r["image_url"] = signed["signedUrl"]
+    fingerprint = report_cache.fingerprint(user_email, year, inputs, date.today())
+    cached = await report_cache.get_async(supabase, user_id, year, fingerprint)
+    if cached is not None:
+        return _pdf_response(cached, year, f'{calls.server_timing()}, report_cache;desc="hit"')
 
-    # Public holidays (dates for computation + detailed for the report)
-    public_holidays_dates = fetch_public_holidays(year, settings["working_country_code"])
-    public_holidays_detailed = fetch_public_holidays_detailed(year, settings["working_country_code"])
+    await loaders.sign_receipt_urls_async(supabase, inputs["receipts"], REPORT_SIGNED_URL_EXPIRY, calls)
 
-    # User-defined holidays
-    user_holidays = (
-        supabase.table("user_holidays")
-        .select("*")
-        .eq("user_id", user_id)
-        .order("start_date")
-        .execute()
-    ).data
+    # The summary is cheap; PDF rendering is CPU-bound and runs on the renderer processes
+    pdf_bytes = await renderer.render_async(renderer.report_data(user_email, year, inputs))
 
-    user_holiday_dates = dashboard_service.expand_holiday_periods(user_holidays)
+    if app_settings.report_cache:
+        await report_cache.put_async(supabase, user_id, year, fingerprint, pdf_bytes)
+    return _pdf_response(pdf_bytes, year, f'{calls.server_timing()}, report_cache;desc="miss"')
 
-    # Work schedule periods
-    schedule_periods = (
-        supabase.table("work_schedule_periods")
-        .select("*")
-        .eq("user_id", user_id)
-        .order("start_date")
-        .execute()
-    ).data
 
-    # Compliance summary
-    receipt_dates = {
-        date.fromisoformat(r["receipt_date"])
-        for r in receipts
-        if r.get("receipt_date")
-    }
-    summary = dashboard_service.compute_summary(
-        year=year,
-        receipt_dates=receipt_dates,
-        public_holidays=public_holidays_dates,
-        user_holiday_dates=user_holiday_dates,
-        threshold=settings["homeworking_threshold"],
-        working_country_code=settings["working_country_code"],
-        working_days=settings.get("working_days"),
-        schedule_periods=schedule_periods,
-    )
+@router.post("/jobs", response_model=ReportJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_report_job(
+    year: int = date.today().year,
+    current_user=Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
+):
+    # Generated on the report worker pool; poll GET /report/jobs/{id} for the download link
+    user_id = str(current_user.id)
+    return await report_jobs.create_async(supabase, user_id, current_user.email or user_id, year)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJob)
+async def get_report_job(
+    job_id: str,
+    current_user=Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_async_supabase_admin),
+):
+    return await report_jobs.get_async(supabase, str(current_user.id), job_id)
 
-    pdf_bytes = generate_compliance_report(
-        user_email=user_email,
-        year=year,
-        summary=summary,
-        receipts=receipts,
-        public_holidays=public_holidays_detailed,
-        user_holidays=user_holidays,
-        schedule_periods=schedule_periods,
-    )
 
+def _pdf_response(pdf_bytes: bytes, year: int, server_timing: str) -> Response:
     filename = f"compliance_report_{year}.pdf"
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Server-Timing": server_timing,
+        },
     )
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_PRUNE_INTERVAL = 3600  # seconds between deletes of expired disk rows
+
+
+class _Flight:
+    """One in-progress upstream fetch that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TieredCache:
+    """
+    Two-tier (in-process LRU + SQLite) cache for JSON-serialisable values.
+
+    - fresh (age < ttl): served directly
+    - stale (age < ttl + stale_ttl): served immediately, refreshed in the background
+    - expired or missing: fetched upstream; concurrent callers for the same key
+      share a single fetch (single-flight)
+    - if the upstream fetch fails, any cached value — however old — is served instead
+
+    The memory tier's lock is never held across SQLite I/O, and aget_or_fetch reads and
+    writes the disk tier on a worker thread, so event-loop callers never block on disk.
+    A disk error (locked by another worker, full or read-only disk) is logged and that
+    read or write falls back to the memory tier; it never fails a lookup. Disk rows older
+    than ttl + stale_ttl (not requested for that long, or they'd have been refreshed) are
+    deleted on open and then at most every _PRUNE_INTERVAL seconds on write.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[str],
+        ttl: float,
+        stale_ttl: float,
+        max_entries: int = 256,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._memory: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()     # memory tier and in-flight fetches
+        self._db_lock = threading.Lock()  # the SQLite connection
+        self._inflight: dict[str, _Flight] = {}
+        self._ainflight: dict[str, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pruned_at = 0.0
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                # WAL lets several uvicorn workers read while one writes
+                self._db.execute("pragma journal_mode=wal")
+                self._db.execute(
+                    "create table if not exists cache ("
+                    "key text primary key, value text not null, fetched_at real not null)"
+                )
+                self._db.execute("create index if not exists cache_fetched_at_idx on cache (fetched_at)")
+                self._prune()
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Cache %s: disk tier disabled (%s)", name, e)
+                self._db = None
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        entry = self._lookup(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(key, fetch)
+                return value
+
+        try:
+            return self._fetch_once(key, fetch)
+        except Exception:
+            if entry is not None:
+                logger.warning("Cache %s: upstream failed, serving expired entry for %s", self.name, key)
+                return entry[0]
+            raise
+
+    async def aget_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """get_or_fetch for event-loop callers: same freshness rules, single-flight per loop."""
+        entry = self._lookup_memory(key)
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._lookup_disk, key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._arefresh_in_background(key, fetch)
+                return value
+
+        try:
+            return await self._afetch_once(key, fetch)
+        except Exception:
+            if entry is not None:
+                logger.warning("Cache %s: upstream failed, serving expired entry for %s", self.name, key)
+                return entry[0]
+            raise
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """(True, value) for a fresh entry, (False, None) otherwise. Never fetches."""
+        entry = self._lookup(key)
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            return False, None
+        return True, entry[0]
+
+    def set(self, key: str, value: Any) -> None:
+        self._store(key, value)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.execute("delete from cache where key = ?", (key,))
+                    self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Cache %s: could not delete %s from disk: %s", self.name, key, e)
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _lookup(self, key: str) -> Optional[tuple[Any, float]]:
+        entry = self._lookup_memory(key)
+        if entry is None and self._db is not None:
+            entry = self._lookup_disk(key)
+        return entry
+
+    def _lookup_memory(self, key: str) -> Optional[tuple[Any, float]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    def _lookup_disk(self, key: str) -> Optional[tuple[Any, float]]:
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "select value, fetched_at from cache where key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Cache %s: disk read of %s failed, treated as a miss: %s", self.name, key, e)
+            return None
+        if row is None:
+            return None
+        entry = (json.loads(row[0]), row[1])
+        with self._lock:
+            self._remember(key, entry)
+        return entry
+
+    def _store(self, key: str, value: Any) -> None:
+        fetched_at = self._store_memory(key, value)
+        if self._db is not None:
+            self._store_disk(key, json.dumps(value), fetched_at)
+
+    async def _astore(self, key: str, value: Any) -> None:
+        fetched_at = self._store_memory(key, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._store_disk, key, json.dumps(value), fetched_at)
+
+    def _store_memory(self, key: str, value: Any) -> float:
+        entry = (value, time.time())
+        with self._lock:
+            self._remember(key, entry)
+        return entry[1]
+
+    def _store_disk(self, key: str, serialized: str, fetched_at: float) -> None:
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "insert or replace into cache (key, value, fetched_at) values (?, ?, ?)",
+                    (key, serialized, fetched_at),
+                )
+                if fetched_at - self._pruned_at >= _PRUNE_INTERVAL:
+                    self._prune()
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Cache %s: disk write of %s failed, kept in memory only: %s", self.name, key, e)
+
+    def _prune(self) -> None:
+        # Caller holds self._db_lock (or is __init__) and commits
+        self._pruned_at = time.time()
+        self._db.execute("delete from cache where fetched_at < ?", (self._pruned_at - self.ttl - self.stale_ttl,))
+
+    def _remember(self, key: str, entry: tuple[Any, float]) -> None:
+        # Caller holds self._lock
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _fetch_once(self, key: str, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = fetch()
+            self._store(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._inflight:
+                return
+
+        def _run():
+            try:
+                self._fetch_once(key, fetch)
+            except Exception as e:
+                logger.warning("Cache %s: background refresh of %s failed: %s", self.name, key, e)
+
+        threading.Thread(target=_run, name=f"{self.name}-refresh", daemon=True).start()
+
+    async def _afetch_once(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._ainflight.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+
+        flight = self._ainflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fetch()
+            await self._astore(key, value)
+            flight.set_result(value)
+            return value
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # mark retrieved: followers may not exist
+            raise
+        finally:
+            self._ainflight.pop(key, None)
+
+    def _arefresh_in_background(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._ainflight:
+            return
+
+        async def _run():
+            try:
+                await self._afetch_once(key, fetch)
+            except Exception as e:
+                logger.warning("Cache %s: background refresh of %s failed: %s", self.name, key, e)
+
+        task = asyncio.get_running_loop().create_task(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -1,22 +1,38 @@
 from datetime import date, timedelta
 
-
-def _date_range(start: date, end: date):
-    d = start
-    while d <= end:
-        yield d
-        d += timedelta(days=1)
-
-
-def expand_holiday_periods(periods: list[dict]) -> set[date]:
-    """Flatten a list of {start_date, end_date} dicts into a set of individual dates."""
-    dates: set[date] = set()
-    for p in periods:
-        start = date.fromisoformat(p["start_date"]) if isinstance(p["start_date"], str) else p["start_date"]
-        end = date.fromisoformat(p["end_date"]) if isinstance(p["end_date"], str) else p["end_date"]
-        for d in _date_range(start, end):
-            dates.add(d)
-    return dates
+from app.services import workdays
+
+# Settings used when a user hasn't configured their profile yet
+DEFAULT_SETTINGS = {
+    "working_country_code": "LU",
+    "residence_country_code": "BE",
+    "homeworking_threshold": 34,
+    "working_days": [0, 1, 2, 3, 4],
+}
+
+
+def _as_date(value) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def holiday_intervals(periods: list[dict], year: int) -> list[tuple[date, date]]:
+    """
+    {start_date, end_date} periods as sorted, non-overlapping (start, end) intervals
+    clipped to the year. Overlapping and back-to-back periods are merged.
+    """
+    year_start, year_end = date(year, 1, 1), date(year, 12, 31)
+    clipped = sorted(
+        (max(start, year_start), min(end, year_end))
+        for start, end in ((_as_date(p["start_date"]), _as_date(p["end_date"])) for p in periods)
+        if start <= year_end and end >= year_start
+    )
+    merged: list[tuple[date, date]] = []
+    for start, end in clipped:
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
 
 
 def _parse_periods(raw: list[dict]) -> list[tuple[date, date | None, set[int]]]:
@@ -30,47 +46,64 @@ def _parse_periods(raw: list[dict]) -> list[tuple[date, date | None, set[int]]]:
     return sorted(result, key=lambda x: x[0], reverse=True)
 
 
-def _weekdays_for_date(d: date, periods: list[tuple], default: set[int]) -> set[int]:
-    """Return the applicable working weekdays for a given date."""
-    for start, end, weekdays in periods:
-        if d >= start and (end is None or d <= end):
-            return weekdays
-    return default
+def rolling_window(end: date) -> tuple[date, date]:
+    """The 12 months ending on `end`, both inclusive."""
+    try:
+        year_before = end.replace(year=end.year - 1)
+    except ValueError:  # 29 February
+        year_before = end.replace(year=end.year - 1, day=28)
+    return year_before + timedelta(days=1), end
+
+
+def working_mask(
+    year: int,
+    public_holidays: set[date],
+    user_holidays: list[tuple[date, date]],
+    working_days: list[int] | None,
+    schedule_periods: list[dict] | None,
+) -> int:
+    """Whole-year bitset (see workdays): scheduled weekdays minus public holidays and the user's holiday intervals."""
+    default_weekdays = set(working_days) if working_days else {0, 1, 2, 3, 4}
+    scheduled = workdays.schedule_mask(year, default_weekdays, _parse_periods(schedule_periods or []))
+    days_off = workdays.dates_mask(year, public_holidays)
+    for start, end in user_holidays:
+        days_off |= workdays.range_mask(year, start, end)
+    return scheduled & ~days_off
 
 
 def compute_summary(
     year: int,
     receipt_dates: set[date],
     public_holidays: set[date],
-    user_holiday_dates: set[date],
+    user_holidays: list[tuple[date, date]],
     threshold: int,
     working_country_code: str,
     working_days: list[int] | None = None,
     schedule_periods: list[dict] | None = None,
 ) -> dict:
-    today = date.today()
-    year_start = date(year, 1, 1)
-    year_end = date(year, 12, 31)
-
-    default_weekdays = set(working_days) if working_days else {0, 1, 2, 3, 4}
-    parsed_periods = _parse_periods(schedule_periods or [])
+    working = working_mask(year, public_holidays, user_holidays, working_days, schedule_periods)
+    return summarize(year, working, workdays.dates_mask(year, receipt_dates), threshold, working_country_code)
 
-    all_working_days = {
-        d for d in _date_range(year_start, year_end)
-        if d.weekday() in _weekdays_for_date(d, parsed_periods, default_weekdays)
-        and d not in public_holidays
-        and d not in user_holiday_dates
-    }
 
-    past_working_days = {d for d in all_working_days if d <= today}
-    future_working_days = all_working_days - past_working_days
-
-    proved_days = receipt_dates & past_working_days
-    homeworking_so_far = len(past_working_days) - len(proved_days)
+def summarize(
+    year: int,
+    working: int,
+    receipt_days: int,
+    threshold: int,
+    working_country_code: str,
+    today: date | None = None,
+) -> dict:
+    """compute_summary from the year's working-day and receipt-day bitsets; only `today` is applied here."""
+    past = working & workdays.until_mask(year, today or date.today())
+    proved = past & receipt_days
+    total_count = working.bit_count()
+    past_count = past.bit_count()
+    future_count = total_count - past_count
+    homeworking_so_far = past_count - proved.bit_count()
 
     # Project the current home-working rate over remaining working days
-    rate = homeworking_so_far / len(past_working_days) if past_working_days else 0.0
-    projected = round(rate * len(future_working_days))
+    rate = homeworking_so_far / past_count if past_count else 0.0
+    projected = round(rate * future_count)
     forecast = homeworking_so_far + projected
 
     at_risk = forecast > threshold
@@ -78,9 +111,9 @@ def compute_summary(
         "year": year,
         "working_country_code": working_country_code,
         "homeworking_threshold": threshold,
-        "total_working_days": len(all_working_days),
-        "past_working_days": len(past_working_days),
-        "days_with_proof": len(proved_days),
+        "total_working_days": total_count,
+        "past_working_days": past_count,
+        "days_with_proof": proved.bit_count(),
         "days_without_proof": homeworking_so_far,
         "forecast_homeworking_days": forecast,
         "forecasted_days_without_proof": forecast,
@@ -88,3 +121,44 @@ def compute_summary(
         "is_at_risk": at_risk,
         "compliance_status": "at_risk" if at_risk else "compliant",
     }
+
+
+def compute_window_summary(
+    start: date,
+    end: date,
+    receipt_dates: dict[int, set[date]],
+    public_holidays: dict[int, set[date]],
+    user_holidays: dict[int, list[tuple[date, date]]],
+    threshold: int,
+    working_country_code: str,
+    working_days: list[int] | None = None,
+    schedule_periods: list[dict] | None = None,
+) -> dict:
+    """
+    Compliance over a window of days that may span years (e.g. the last 12 months),
+    with the same working-day rules as compute_summary. Date inputs are keyed by year.
+    Only days up to today count, so there is no forecast.
+    """
+    last_day = min(end, date.today())
+    working_count = proved_count = 0
+    for year in range(start.year, end.year + 1):
+        working = working_mask(
+            year, public_holidays.get(year, set()), user_holidays.get(year, []), working_days, schedule_periods,
+        ) & workdays.range_mask(year, start, last_day)
+        working_count += working.bit_count()
+        proved_count += (working & workdays.dates_mask(year, receipt_dates.get(year, set()))).bit_count()
+
+    without_proof = working_count - proved_count
+    at_risk = without_proof > threshold
+    return {
+        "start_date": start,
+        "end_date": end,
+        "working_country_code": working_country_code,
+        "homeworking_threshold": threshold,
+        "total_working_days": working_count,
+        "days_with_proof": proved_count,
+        "days_without_proof": without_proof,
+        "remaining_allowed_homeworking_days": max(0, threshold - without_proof),
+        "is_at_risk": at_risk,
+        "compliance_status": "at_risk" if at_risk else "compliant",
+    }
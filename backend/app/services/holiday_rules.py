@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+# Offline public-holiday calendars for the countries most of our users work in.
+# Entries mirror what Nager.Date returns for these countries (including the regional
+# holidays it lists: German states, Alsace-Moselle), so switching source doesn't change
+# any summary. tests/test_holiday_rules.py checks them against expected lists.
+
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian / Meeus–Jones–Butcher computus)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+_Rule = tuple[str, str, Callable[[int], Optional[date]]]
+
+
+def _fixed(month: int, day: int, since: int | None = None):
+    def rule(year: int) -> Optional[date]:
+        if since is not None and year < since:
+            return None
+        return date(year, month, day)
+    return rule
+
+
+def _easter(offset: int):
+    return lambda year: easter_sunday(year) + timedelta(days=offset)
+
+
+def _repentance_day(year: int) -> date:
+    """Buß- und Bettag — the Wednesday before 23 November."""
+    d = date(year, 11, 22)
+    return d - timedelta(days=(d.weekday() - 2) % 7)
+
+
+_RULES: dict[str, list[_Rule]] = {
+    "LU": [
+        ("New Year's Day", "Neijoerschdag", _fixed(1, 1)),
+        ("Easter Monday", "Ouschterméindeg", _easter(1)),
+        ("Labour Day", "Dag vun der Aarbecht", _fixed(5, 1)),
+        ("Europe Day", "Europadag", _fixed(5, 9, since=2019)),
+        ("Ascension Day", "Christi Himmelfaart", _easter(39)),
+        ("Whit Monday", "Péngschtméindeg", _easter(50)),
+        ("National Day", "Nationalfeierdag", _fixed(6, 23)),
+        ("Assumption Day", "Léiffrawëschdag", _fixed(8, 15)),
+        ("All Saints' Day", "Allerhellgen", _fixed(11, 1)),
+        ("Christmas Day", "Chrëschtdag", _fixed(12, 25)),
+        ("St. Stephen's Day", "Stiefesdag", _fixed(12, 26)),
+    ],
+    "BE": [
+        ("New Year's Day", "Nieuwjaar", _fixed(1, 1)),
+        ("Easter Sunday", "Pasen", _easter(0)),
+        ("Easter Monday", "Paasmaandag", _easter(1)),
+        ("Labour Day", "Dag van de arbeid", _fixed(5, 1)),
+        ("Ascension Day", "Onze Lieve Heer hemelvaart", _easter(39)),
+        ("Pentecost", "Pinksteren", _easter(49)),
+        ("Whit Monday", "Pinkstermaandag", _easter(50)),
+        ("National Day", "Nationale feestdag", _fixed(7, 21)),
+        ("Assumption Day", "Onze Lieve Vrouw hemelvaart", _fixed(8, 15)),
+        ("All Saints' Day", "Allerheiligen", _fixed(11, 1)),
+        ("Armistice Day", "Wapenstilstand", _fixed(11, 11)),
+        ("Christmas Day", "Kerstmis", _fixed(12, 25)),
+    ],
+    "FR": [
+        ("New Year's Day", "Jour de l'an", _fixed(1, 1)),
+        ("Good Friday", "Vendredi saint", _easter(-2)),
+        ("Easter Monday", "Lundi de Pâques", _easter(1)),
+        ("Labour Day", "Fête du Travail", _fixed(5, 1)),
+        ("Victory in Europe Day", "Victoire 1945", _fixed(5, 8)),
+        ("Ascension Day", "Ascension", _easter(39)),
+        ("Whit Monday", "Lundi de Pentecôte", _easter(50)),
+        ("Bastille Day", "Fête nationale", _fixed(7, 14)),
+        ("Assumption Day", "Assomption", _fixed(8, 15)),
+        ("All Saints' Day", "Toussaint", _fixed(11, 1)),
+        ("Armistice Day", "Armistice 1918", _fixed(11, 11)),
+        ("Christmas Day", "Noël", _fixed(12, 25)),
+        ("St. Stephen's Day", "Saint-Étienne", _fixed(12, 26)),
+    ],
+    "DE": [
+        ("New Year's Day", "Neujahr", _fixed(1, 1)),
+        ("Epiphany", "Heilige Drei Könige", _fixed(1, 6)),
+        ("International Women's Day", "Internationaler Frauentag", _fixed(3, 8, since=2019)),
+        ("Good Friday", "Karfreitag", _easter(-2)),
+        ("Easter Sunday", "Ostersonntag", _easter(0)),
+        ("Easter Monday", "Ostermontag", _easter(1)),
+        ("Labour Day", "Tag der Arbeit", _fixed(5, 1)),
+        ("Ascension Day", "Christi Himmelfahrt", _easter(39)),
+        ("Whit Sunday", "Pfingstsonntag", _easter(49)),
+        ("Whit Monday", "Pfingstmontag", _easter(50)),
+        ("Corpus Christi", "Fronleichnam", _easter(60)),
+        ("Assumption Day", "Mariä Himmelfahrt", _fixed(8, 15)),
+        ("World Children's Day", "Weltkindertag", _fixed(9, 20, since=2019)),
+        ("German Unity Day", "Tag der Deutschen Einheit", _fixed(10, 3)),
+        ("Reformation Day", "Reformationstag", _fixed(10, 31)),
+        ("All Saints' Day", "Allerheiligen", _fixed(11, 1)),
+        ("Repentance and Prayer Day", "Buß- und Bettag", _repentance_day),
+        ("Christmas Day", "Erster Weihnachtstag", _fixed(12, 25)),
+        ("St. Stephen's Day", "Zweiter Weihnachtstag", _fixed(12, 26)),
+    ],
+}
+
+
+def supports(country_code: str) -> bool:
+    return country_code.upper() in _RULES
+
+
+def public_holidays_detailed(year: int, country_code: str) -> list[dict]:
+    """Same shape as nager.fetch_public_holidays_detailed, computed offline."""
+    holidays = []
+    for name, local_name, rule in _RULES[country_code.upper()]:
+        d = rule(year)
+        if d is not None:
+            holidays.append({"date": d.isoformat(), "name": name, "local_name": local_name})
+    return sorted(holidays, key=lambda h: h["date"])
+
+
+def public_holidays(year: int, country_code: str) -> set[date]:
+    """Same shape as nager.fetch_public_holidays, computed offline."""
+    return {date.fromisoformat(h["date"]) for h in public_holidays_detailed(year, country_code)}
@@ -0,0 +1,78 @@
+import io
+import logging
+from typing import BinaryIO, Optional, Union
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Formats we can decode and re-encode; PDFs and anything unknown pass through untouched
+_NORMALIZABLE = {"image/jpeg", "image/png", "image/webp", None, ""}
+
+# Bytes, or a seekable file such as the spooled upload (decoded without reading it all into memory)
+ImageSource = Union[bytes, BinaryIO]
+
+
+def normalize_image(image: ImageSource, content_type: Optional[str]) -> tuple[ImageSource, Optional[str]]:
+    """
+    Make an upload OCR-friendly: apply EXIF rotation, downscale to IMAGE_MAX_DIMENSION,
+    optionally convert to grayscale and recompress as JPEG.
+    Returns (bytes, content_type); the original (as passed) is returned when it can't be
+    decoded or when normalising wouldn't make it smaller.
+    """
+    if content_type not in _NORMALIZABLE:
+        return image, content_type
+    try:
+        from PIL import ImageOps
+
+        with _open(image) as img:
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((settings.image_max_dimension, settings.image_max_dimension))
+            img = img.convert("L" if settings.image_grayscale else "RGB")
+            out = io.BytesIO()
+            img.save(out, format="JPEG", quality=settings.image_jpeg_quality, optimize=True)
+    except Exception as e:
+        logger.warning("Image normalization skipped: %s", e)
+        return image, content_type
+
+    normalized = out.getvalue()
+    if len(normalized) >= _size(image):
+        return image, content_type
+    return normalized, "image/jpeg"
+
+
+def make_thumbnail(image: ImageSource, content_type: Optional[str]) -> Optional[bytes]:
+    """
+    A THUMBNAIL_SIZE px (longest side) WebP for receipt lists, EXIF-rotated.
+    None when thumbnails are disabled or the upload can't be decoded (PDFs, no Pillow).
+    """
+    if settings.thumbnail_size <= 0 or content_type not in _NORMALIZABLE:
+        return None
+    size = (settings.thumbnail_size, settings.thumbnail_size)
+    try:
+        from PIL import ImageOps
+
+        with _open(image) as img:
+            # JPEGs decode directly at 1/2–1/8 scale, so a 12 MP photo is never fully decoded
+            img.draft("RGB", size)
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail(size)
+            out = io.BytesIO()
+            img.convert("RGB").save(out, format="WEBP", quality=settings.thumbnail_quality, method=4)
+    except Exception as e:
+        logger.warning("Thumbnail skipped: %s", e)
+        return None
+    return out.getvalue()
+
+
+def _open(image: ImageSource):
+    from PIL import Image
+
+    if isinstance(image, bytes):
+        return Image.open(io.BytesIO(image))
+    image.seek(0)
+    return Image.open(image)  # Pillow leaves files it didn't open itself open
+
+
+def _size(image: ImageSource) -> int:
+    return len(image) if isinstance(image, bytes) else image.seek(0, io.SEEK_END)
@@ -0,0 +1,426 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import date
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, status
+from supabase import AsyncClient, Client
+
+from app.config import settings as app_settings
+from app.services import dashboard as dashboard_service
+from app.services import signed_urls
+from app.services.nager import (
+    fetch_public_holidays, fetch_public_holidays_async,
+    fetch_public_holidays_detailed, fetch_public_holidays_detailed_async,
+    fetch_public_holidays_range_async,
+)
+
+logger = logging.getLogger(__name__)
+
+# Dashboard and report inputs come from independent upstream calls (Supabase tables,
+# Nager.Date, Storage). They are issued concurrently — on a shared pool for sync
+# callers, as tasks for async ones — so a request waits for its slowest dependency
+# rather than the sum of all of them.
+_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+_PAGE_SIZE = 1000  # PostgREST's default max rows per response
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=app_settings.loader_workers, thread_name_prefix="loader")
+        return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class FanOut:
+    """
+    Concurrent upstream calls for one request. Each call gets its own deadline
+    (LOADER_TIMEOUT seconds from submission) and its duration is recorded in
+    `timings` (ms, including time queued for a worker).
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout if timeout is not None else app_settings.loader_timeout
+        self.timings: dict[str, float] = {}
+        self._futures: dict[str, tuple[Future, float]] = {}
+
+    def _timed_out(self, name: str) -> HTTPException:
+        logger.warning("Upstream call %s timed out after %.1fs", name, self.timeout)
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Upstream timeout while loading {name}",
+        )
+
+    def submit(self, name: str, fn: Callable[..., Any], *args) -> None:
+        submitted = time.perf_counter()
+
+        def timed():
+            try:
+                return fn(*args)
+            finally:
+                self.timings[name] = (time.perf_counter() - submitted) * 1000
+
+        self._futures[name] = (_executor().submit(timed), submitted)
+
+    def result(self, name: str) -> Any:
+        future, submitted = self._futures[name]
+        remaining = submitted + self.timeout - time.perf_counter()
+        try:
+            return future.result(timeout=max(remaining, 0))
+        except FutureTimeout:
+            future.cancel()
+            raise self._timed_out(name)
+
+    def server_timing(self) -> str:
+        """Timings as a Server-Timing header value, slowest first."""
+        ordered = sorted(self.timings.items(), key=lambda item: -item[1])
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in ordered)
+
+
+class AsyncFanOut(FanOut):
+    """FanOut on the event loop: calls are tasks instead of pool jobs."""
+
+    def submit(self, name: str, coro: Awaitable[Any]) -> None:
+        submitted = time.perf_counter()
+
+        async def timed():
+            try:
+                return await coro
+            finally:
+                self.timings[name] = (time.perf_counter() - submitted) * 1000
+
+        self._futures[name] = (asyncio.ensure_future(timed()), submitted)
+
+    async def result(self, name: str) -> Any:
+        task, submitted = self._futures[name]
+        remaining = submitted + self.timeout - time.perf_counter()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=max(remaining, 0))
+        except asyncio.TimeoutError:
+            task.cancel()
+            raise self._timed_out(name)
+
+    def cancel_pending(self) -> None:
+        for task, _ in self._futures.values():
+            task.cancel()
+
+
+def load_summary_inputs(supabase: Client, user_id: str, year: int, defaults: dict) -> tuple[dict, FanOut]:
+    """Everything compute_summary needs, loaded concurrently."""
+    calls = FanOut()
+    calls.submit("settings", _user_settings, supabase, user_id, defaults)
+    calls.submit("receipts", _receipts, supabase, user_id, year, year, "receipt_date")
+    calls.submit("user_holidays", _user_holidays, supabase, user_id, year, year, "start_date,end_date")
+    calls.submit("schedule", _schedule_periods, supabase, user_id)
+
+    # Public holidays depend on the working country, so they start as soon as settings arrive
+    user_settings = calls.result("settings")
+    calls.submit("public_holidays", fetch_public_holidays, year, user_settings["working_country_code"])
+
+    inputs = {
+        "settings": user_settings,
+        "receipt_dates": _receipt_dates(calls.result("receipts")),
+        "user_holiday_intervals": dashboard_service.holiday_intervals(calls.result("user_holidays"), year),
+        "schedule_periods": calls.result("schedule"),
+        "public_holidays": calls.result("public_holidays"),
+    }
+    _log_timings("summary", calls)
+    return inputs, calls
+
+
+def load_report_inputs(
+    supabase: Client, user_id: str, year: int, defaults: dict, url_expiry: Optional[int]
+) -> tuple[dict, FanOut]:
+    """
+    Everything the compliance report needs, loaded concurrently. Receipts get signed
+    `image_url`s unless url_expiry is None.
+    """
+    calls = FanOut()
+    calls.submit("settings", _user_settings, supabase, user_id, defaults)
+    calls.submit("receipts", _receipts, supabase, user_id, year, year, "*")
+    calls.submit("user_holidays", _user_holidays, supabase, user_id, year, year, "*")
+    calls.submit("schedule", _schedule_periods, supabase, user_id)
+
+    user_settings = calls.result("settings")
+    calls.submit("public_holidays", fetch_public_holidays_detailed, year, user_settings["working_country_code"])
+
+    receipts = calls.result("receipts")
+    if url_expiry is not None:
+        calls.submit(
+            "signed_urls", signed_urls.signed_urls,
+            supabase, "receipts", [r["storage_path"] for r in receipts], url_expiry,
+        )
+
+    user_holidays = calls.result("user_holidays")
+    inputs = {
+        "settings": user_settings,
+        "receipts": receipts,
+        "receipt_dates": _receipt_dates(receipts),
+        "user_holidays": user_holidays,
+        "user_holiday_intervals": dashboard_service.holiday_intervals(user_holidays, year),
+        "schedule_periods": calls.result("schedule"),
+        "public_holidays": calls.result("public_holidays"),
+    }
+    if url_expiry is not None:
+        _attach_urls(receipts, calls.result("signed_urls"))
+    _log_timings("report", calls)
+    return inputs, calls
+
+
+def sign_receipt_urls(supabase: Client, receipts: list[dict], url_expiry: int, calls: FanOut) -> None:
+    """Attach signed `image_url`s to receipts loaded without them, as one more call on `calls`."""
+    calls.submit(
+        "signed_urls", signed_urls.signed_urls,
+        supabase, "receipts", [r["storage_path"] for r in receipts], url_expiry,
+    )
+    _attach_urls(receipts, calls.result("signed_urls"))
+
+
+async def load_summary_inputs_async(
+    supabase: AsyncClient, user_id: str, year: int, defaults: dict
+) -> tuple[dict, FanOut]:
+    """load_summary_inputs on the async client."""
+    calls = AsyncFanOut()
+    try:
+        calls.submit("settings", _user_settings_async(supabase, user_id, defaults))
+        calls.submit("receipts", _receipts_async(supabase, user_id, year, year, "receipt_date"))
+        calls.submit(
+            "user_holidays", _rows_async(_user_holidays_query(supabase, user_id, year, year, "start_date,end_date"))
+        )
+        calls.submit("schedule", _rows_async(_schedule_query(supabase, user_id)))
+
+        user_settings = await calls.result("settings")
+        calls.submit("public_holidays", fetch_public_holidays_async(year, user_settings["working_country_code"]))
+
+        inputs = {
+            "settings": user_settings,
+            "receipt_dates": _receipt_dates(await calls.result("receipts")),
+            "user_holiday_intervals": dashboard_service.holiday_intervals(await calls.result("user_holidays"), year),
+            "schedule_periods": await calls.result("schedule"),
+            "public_holidays": await calls.result("public_holidays"),
+        }
+    except BaseException:
+        calls.cancel_pending()
+        raise
+    _log_timings("summary", calls)
+    return inputs, calls
+
+
+async def load_report_inputs_async(
+    supabase: AsyncClient, user_id: str, year: int, defaults: dict, url_expiry: Optional[int]
+) -> tuple[dict, FanOut]:
+    """load_report_inputs on the async client."""
+    calls = AsyncFanOut()
+    try:
+        calls.submit("settings", _user_settings_async(supabase, user_id, defaults))
+        calls.submit("receipts", _receipts_async(supabase, user_id, year, year, "*"))
+        calls.submit("user_holidays", _rows_async(_user_holidays_query(supabase, user_id, year, year, "*")))
+        calls.submit("schedule", _rows_async(_schedule_query(supabase, user_id)))
+
+        user_settings = await calls.result("settings")
+        calls.submit(
+            "public_holidays",
+            fetch_public_holidays_detailed_async(year, user_settings["working_country_code"]),
+        )
+
+        receipts = await calls.result("receipts")
+        if url_expiry is not None:
+            calls.submit("signed_urls", _signed_urls_async(supabase, receipts, url_expiry))
+
+        user_holidays = await calls.result("user_holidays")
+        inputs = {
+            "settings": user_settings,
+            "receipts": receipts,
+            "receipt_dates": _receipt_dates(receipts),
+            "user_holidays": user_holidays,
+            "user_holiday_intervals": dashboard_service.holiday_intervals(user_holidays, year),
+            "schedule_periods": await calls.result("schedule"),
+            "public_holidays": await calls.result("public_holidays"),
+        }
+        if url_expiry is not None:
+            _attach_urls(receipts, await calls.result("signed_urls"))
+    except BaseException:
+        calls.cancel_pending()
+        raise
+    _log_timings("report", calls)
+    return inputs, calls
+
+
+async def sign_receipt_urls_async(
+    supabase: AsyncClient, receipts: list[dict], url_expiry: int, calls: AsyncFanOut
+) -> None:
+    """Attach signed `image_url`s to receipts loaded without them, as one more call on `calls`."""
+    calls.submit("signed_urls", _signed_urls_async(supabase, receipts, url_expiry))
+    _attach_urls(receipts, await calls.result("signed_urls"))
+
+
+async def load_range_inputs_async(
+    supabase: AsyncClient, user_id: str, first_year: int, last_year: int, defaults: dict
+) -> tuple[dict, FanOut]:
+    """
+    load_summary_inputs for a span of years. Each table is queried for the whole span
+    (receipts a 1000-row page at a time) and public holidays for every year go through one batched lookup; receipt
+    dates, public holidays and holiday intervals come back keyed by year.
+    """
+    years = range(first_year, last_year + 1)
+    calls = AsyncFanOut()
+    try:
+        calls.submit("settings", _user_settings_async(supabase, user_id, defaults))
+        calls.submit("receipts", _receipts_async(supabase, user_id, first_year, last_year, "receipt_date"))
+        calls.submit(
+            "user_holidays",
+            _rows_async(_user_holidays_query(supabase, user_id, first_year, last_year, "start_date,end_date")),
+        )
+        calls.submit("schedule", _rows_async(_schedule_query(supabase, user_id)))
+
+        user_settings = await calls.result("settings")
+        calls.submit(
+            "public_holidays",
+            fetch_public_holidays_range_async(first_year, last_year, user_settings["working_country_code"]),
+        )
+
+        user_holidays = await calls.result("user_holidays")
+        inputs = {
+            "settings": user_settings,
+            "receipt_dates": _by_year(_receipt_dates(await calls.result("receipts")), years),
+            "user_holiday_intervals": {
+                year: dashboard_service.holiday_intervals(user_holidays, year) for year in years
+            },
+            "schedule_periods": await calls.result("schedule"),
+            "public_holidays": await calls.result("public_holidays"),
+        }
+    except BaseException:
+        calls.cancel_pending()
+        raise
+    _log_timings("range", calls)
+    return inputs, calls
+
+
+# ── Upstream calls (query builders are shared by the sync and async clients) ──
+
+def _user_settings(supabase: Client, user_id: str, defaults: dict) -> dict:
+    return _settings_or_defaults(_settings_query(supabase, user_id).execute().data, user_id, defaults)
+
+
+async def _user_settings_async(supabase: AsyncClient, user_id: str, defaults: dict) -> dict:
+    return _settings_or_defaults((await _settings_query(supabase, user_id).execute()).data, user_id, defaults)
+
+
+def _receipts(supabase: Client, user_id: str, first_year: int, last_year: int, columns: str) -> list[dict]:
+    """Every receipt dated in the years, a page at a time: responses stop at _PAGE_SIZE rows."""
+    rows: list[dict] = []
+    while True:
+        after = rows[-1] if rows else None
+        page = _receipts_query(supabase, user_id, first_year, last_year, columns, after).execute().data
+        rows += page
+        if len(page) < _PAGE_SIZE:
+            return rows
+
+
+async def _receipts_async(
+    supabase: AsyncClient, user_id: str, first_year: int, last_year: int, columns: str
+) -> list[dict]:
+    rows: list[dict] = []
+    while True:
+        after = rows[-1] if rows else None
+        page = (await _receipts_query(supabase, user_id, first_year, last_year, columns, after).execute()).data
+        rows += page
+        if len(page) < _PAGE_SIZE:
+            return rows
+
+
+def _user_holidays(supabase: Client, user_id: str, first_year: int, last_year: int, columns: str) -> list[dict]:
+    return _user_holidays_query(supabase, user_id, first_year, last_year, columns).execute().data
+
+
+def _schedule_periods(supabase: Client, user_id: str) -> list[dict]:
+    return _schedule_query(supabase, user_id).execute().data
+
+
+async def _signed_urls_async(supabase: AsyncClient, receipts: list[dict], url_expiry: int) -> dict[str, str]:
+    return await signed_urls.signed_urls_async(supabase, "receipts", [r["storage_path"] for r in receipts], url_expiry)
+
+
+def _attach_urls(receipts: list[dict], urls: dict[str, str]) -> None:
+    for r in receipts:
+        r["image_url"] = urls[r["storage_path"]]
+
+
+async def _rows_async(query) -> list[dict]:
+    return (await query.execute()).data
+
+
+def _settings_query(supabase: Client | AsyncClient, user_id: str):
+    return supabase.table("user_settings").select("*").eq("user_id", user_id)
+
+
+def _settings_or_defaults(rows: list[dict], user_id: str, defaults: dict) -> dict:
+    return rows[0] if rows else {**defaults, "user_id": user_id}
+
+
+def _receipts_query(
+    supabase: Client | AsyncClient,
+    user_id: str,
+    first_year: int,
+    last_year: int,
+    columns: str,
+    after: Optional[dict] = None,
+):
+    """One page in (receipt_date, id) order, after the `after` row (keyset, like GET /receipts)."""
+    query = (
+        supabase.table("receipts")
+        .select(columns if columns == "*" else f"{columns},id")
+        .eq("user_id", user_id)
+        .gte("receipt_date", date(first_year, 1, 1).isoformat())
+        .lte("receipt_date", date(last_year, 12, 31).isoformat())
+    )
+    if after:
+        day, receipt_id = after["receipt_date"], after["id"]
+        query = query.or_(f"receipt_date.gt.{day},and(receipt_date.eq.{day},id.gt.{receipt_id})")
+    return query.order("receipt_date").order("id").limit(_PAGE_SIZE)
+
+
+def _user_holidays_query(supabase: Client | AsyncClient, user_id: str, first_year: int, last_year: int, columns: str):
+    # Periods overlapping the years (user_holidays_user_date_idx), not the whole history
+    return (
+        supabase.table("user_holidays")
+        .select(columns)
+        .eq("user_id", user_id)
+        .lte("start_date", date(last_year, 12, 31).isoformat())
+        .gte("end_date", date(first_year, 1, 1).isoformat())
+        .order("start_date")
+    )
+
+
+def _schedule_query(supabase: Client | AsyncClient, user_id: str):
+    return supabase.table("work_schedule_periods").select("*").eq("user_id", user_id).order("start_date")
+
+
+def _receipt_dates(rows: list[dict]) -> set[date]:
+    return {date.fromisoformat(r["receipt_date"]) for r in rows if r.get("receipt_date")}
+
+
+def _by_year(dates: set[date], years: range) -> dict[int, set[date]]:
+    grouped: dict[int, set[date]] = {year: set() for year in years}
+    for d in dates:
+        grouped.setdefault(d.year, set()).add(d)
+    return grouped
+
+
+def _log_timings(label: str, calls: FanOut) -> None:
+    logger.info("%s upstream timings (ms): %s", label, calls.server_timing())
@@ -1,37 +1,134 @@
+import asyncio
 from datetime import date
+from functools import lru_cache
+from typing import Optional
 
 import httpx
 from fastapi import HTTPException, status
 
+from app.config import settings
+from app.services import holiday_rules
+from app.services.cache import TieredCache
+
 NAGER_BASE = "https://date.nager.at/api/v3"
 
+# Holidays for a (year, country) practically never change — cache the raw responses
+_cache = TieredCache(
+    "nager",
+    path=settings.holiday_cache_path,
+    ttl=settings.holiday_cache_ttl,
+    stale_ttl=settings.holiday_cache_stale_ttl,
+)
+
+
+_aclient: Optional[httpx.AsyncClient] = None
+
+
+@lru_cache
+def _client() -> httpx.Client:
+    return httpx.Client(timeout=10)
+
+
+def _async_client() -> httpx.AsyncClient:
+    global _aclient
+    if _aclient is None:
+        _aclient = httpx.AsyncClient(timeout=10)
+    return _aclient
+
+
+async def aclose() -> None:
+    global _aclient
+    if _aclient is not None:
+        await _aclient.aclose()
+        _aclient = None
+
 
 def _get(url: str) -> list:
+    """GET a Nager.Date endpoint through the cache (single upstream call per key)."""
+    return _cache.get_or_fetch(url, lambda: _fetch(url))
+
+
+def _fetch(url: str) -> list:
+    try:
+        response = _client().get(url)
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        raise _upstream_error(e, url)
+
+
+async def _aget(url: str) -> list:
+    return await _cache.aget_or_fetch(url, lambda: _afetch(url))
+
+
+async def _afetch(url: str) -> list:
     try:
-        with httpx.Client(timeout=10) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            return response.json()
-    except httpx.HTTPStatusError as e:
+        response = await _async_client().get(url)
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        raise _upstream_error(e, url)
+
+
+def _upstream_error(e: httpx.HTTPError, url: str) -> HTTPException:
+    if isinstance(e, httpx.HTTPStatusError):
         if e.response.status_code == 404:
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"No data found at {url}",
             )
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Failed to fetch from public holidays service",
         )
-    except httpx.RequestError:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="Could not reach the public holidays service",
-        )
+    return HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail="Could not reach the public holidays service",
+    )
+
+
+def _offline(country_code: str) -> bool:
+    return country_code.upper() in settings.offline_holiday_countries and holiday_rules.supports(country_code)
 
 
 def fetch_public_holidays_detailed(year: int, country_code: str) -> list[dict]:
-    """Return full holiday objects (date, name, localName) from Nager.Date."""
-    data = _get(f"{NAGER_BASE}/PublicHolidays/{year}/{country_code}")
+    """Return full holiday objects (date, name, localName) — built-in rules first, then Nager.Date."""
+    if _offline(country_code):
+        return holiday_rules.public_holidays_detailed(year, country_code)
+    return _detailed(_get(_holidays_url(year, country_code)))
+
+
+def fetch_public_holidays(year: int, country_code: str) -> set[date]:
+    """Return just the holiday dates — used internally by the dashboard computation."""
+    if _offline(country_code):
+        return holiday_rules.public_holidays(year, country_code)
+    return _dates(_get(_holidays_url(year, country_code)))
+
+
+async def fetch_public_holidays_detailed_async(year: int, country_code: str) -> list[dict]:
+    if _offline(country_code):
+        return holiday_rules.public_holidays_detailed(year, country_code)
+    return _detailed(await _aget(_holidays_url(year, country_code)))
+
+
+async def fetch_public_holidays_async(year: int, country_code: str) -> set[date]:
+    if _offline(country_code):
+        return holiday_rules.public_holidays(year, country_code)
+    return _dates(await _aget(_holidays_url(year, country_code)))
+
+
+async def fetch_public_holidays_range_async(first_year: int, last_year: int, country_code: str) -> dict[int, set[date]]:
+    """Holiday dates per year for a span of years, looked up concurrently."""
+    years = range(first_year, last_year + 1)
+    results = await asyncio.gather(*(fetch_public_holidays_async(year, country_code) for year in years))
+    return dict(zip(years, results))
+
+
+def _holidays_url(year: int, country_code: str) -> str:
+    return f"{NAGER_BASE}/PublicHolidays/{year}/{country_code.upper()}"
+
+
+def _detailed(data: list) -> list[dict]:
     return [
         {
             "date": h["date"],
@@ -42,13 +139,18 @@ def fetch_public_holidays_detailed(year: int, country_code: str) -> list[dict]:
     ]
 
 
-def fetch_public_holidays(year: int, country_code: str) -> set[date]:
-    """Return just the holiday dates — used internally by the dashboard computation."""
-    data = _get(f"{NAGER_BASE}/PublicHolidays/{year}/{country_code}")
+def _dates(data: list) -> set[date]:
     return {date.fromisoformat(h["date"]) for h in data}
 
 
 def fetch_available_countries() -> list[dict]:
     """Return the list of countries supported by Nager.Date."""
-    data = _get(f"{NAGER_BASE}/AvailableCountries")
+    return _countries(_get(f"{NAGER_BASE}/AvailableCountries"))
+
+
+async def fetch_available_countries_async() -> list[dict]:
+    return _countries(await _aget(f"{NAGER_BASE}/AvailableCountries"))
+
+
+def _countries(data: list) -> list[dict]:
     return [{"country_code": c["countryCode"], "name": c["name"]} for c in data]
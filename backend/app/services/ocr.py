@@ -1,98 +1,183 @@
+import hashlib
 import re
 from datetime import date
 from typing import Optional
 
-from google.cloud import vision
-
+from app.config import settings
+from app.services.cache import TieredCache
+from app.services.ocr_engines import get_engine
+
+# OCR text keyed by engine + content hash, so identical bytes are never sent upstream twice.
+# Text (not the parsed date) is cached so date-parsing changes still apply to old entries.
+_text_cache = TieredCache(
+    "ocr",
+    path=settings.ocr_cache_path,
+    ttl=settings.ocr_cache_ttl,
+    stale_ttl=0,
+    max_entries=1024,
+)
+
+# Month names/abbreviations seen on EN, FR, DE and LB receipts (lower-case)
 MONTH_MAP = {
-    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+    # English
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+    # French
+    "janvier": 1, "janv": 1, "février": 2, "fevrier": 2, "févr": 2, "fevr": 2, "fév": 2, "fev": 2,
+    "mars": 3, "avril": 4, "avr": 4, "mai": 5, "juin": 6, "juillet": 7, "juil": 7,
+    "août": 8, "aout": 8, "septembre": 9, "octobre": 10, "novembre": 11, "décembre": 12,
+    "decembre": 12, "déc": 12,
+    # German
+    "januar": 1, "jänner": 1, "jän": 1, "februar": 2, "märz": 3, "maerz": 3, "mär": 3, "mrz": 3,
+    "juni": 6, "juli": 7, "oktober": 10, "okt": 10, "dezember": 12, "dez": 12,
+    # Luxembourgish
+    "mäerz": 3, "abrëll": 4, "abrell": 4, "mee": 5,
 }
 
-# (regex pattern, format hint)
-DATE_PATTERNS = [
-    # DD/MM/YYYY or MM/DD/YYYY — treated as DD/MM (European receipts)
-    (r"\b(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{4})\b", "dmy"),
-    # YYYY-MM-DD (ISO)
-    (r"\b(\d{4})[/\-\.](\d{1,2})[/\-\.](\d{1,2})\b", "ymd"),
-    # DD Mon YYYY  e.g. 15 Jan 2024
-    (r"\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+(\d{4})\b", "dmy_text"),
-    # Mon DD, YYYY  e.g. January 15, 2024
-    (r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+(\d{1,2}),?\s+(\d{4})\b", "mdy_text"),
-]
+_MONTHS = "|".join(sorted((re.escape(m) for m in MONTH_MAP), key=len, reverse=True))
+_MONTH_INITIALS = "".join(sorted({m[0] for m in MONTH_MAP}))
+
+# One combined pattern, scanned once over the whole text. The lookaheads keep the
+# month-name alternation from being tried at words that cannot start a date.
+_DATE_RE = re.compile(
+    rf"""
+    (?<![\d\w])(?:
+      (?=\d)(?:
+        (?P<iso_y>\d{{4}})(?P<iso_sep>[/.\-])(?P<iso_m>\d{{1,2}})(?P=iso_sep)(?P<iso_d>\d{{1,2}})
+      | (?P<num_a>\d{{1,2}})(?P<num_sep>[/.\-])(?P<num_b>\d{{1,2}})(?P=num_sep)(?P<num_y>\d{{4}}|\d{{2}})
+      | (?P<dmy_d>\d{{1,2}})(?:\.|er|st|nd|rd|th)?\s*(?P<dmy_m>{_MONTHS})(?![^\W\d_])\.?,?\s*(?P<dmy_y>\d{{4}}|\d{{2}})
+      )
+      | (?=[{_MONTH_INITIALS}])(?P<mdy_m>{_MONTHS})(?![^\W\d_])\.?\s+(?P<mdy_d>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<mdy_y>\d{{4}})
+    )(?!\d)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Context around a match (same line) that makes it more or less likely to be the receipt date
+_DATE_LABEL_RE = re.compile(r"(?:date|datum|dato|dt|le|du|vom|den|issued|émis|emis)\s*[:.]?\s*$", re.IGNORECASE)
+_OTHER_DATE_LABEL_RE = re.compile(
+    r"(?:exp|valid|gültig|gultig|valable|bis|until|due|fällig|échéance|echeance|retrait|livraison|lieferung"
+    r"|mhd|best before|naiss|geb)",
+    re.IGNORECASE,
+)
+_TIME_RE = re.compile(r"\b\d{1,2}[:h]\d{2}\b")
+_CONTEXT = 24  # characters inspected on each side of a match
+
+
+def _year(raw: str) -> int:
+    return int(raw) + 2000 if len(raw) == 2 else int(raw)
+
+
+def _parse_match(m: re.Match) -> Optional[tuple[date, float]]:
+    """(date, format score) for a match; invalid calendar dates return None."""
+    try:
+        if m["iso_y"]:
+            return date(int(m["iso_y"]), int(m["iso_m"]), int(m["iso_d"])), 1.0
+        if m["num_a"]:
+            a, b, y = int(m["num_a"]), int(m["num_b"]), _year(m["num_y"])
+            penalty = 0.5 if len(m["num_y"]) == 2 else 0.0
+            if b <= 12:
+                return date(y, b, a), 1.0 - penalty            # European day-first
+            return date(y, a, b), 0.5 - penalty                # only valid as US month-first
+        if m["dmy_d"]:
+            return date(_year(m["dmy_y"]), MONTH_MAP[m["dmy_m"].lower()], int(m["dmy_d"])), 1.0
+        return date(int(m["mdy_y"]), MONTH_MAP[m["mdy_m"].lower()], int(m["mdy_d"])), 1.0
+    except (ValueError, KeyError):
+        return None
 
 
 def extract_date_from_text(text: str) -> Optional[date]:
-    """Return the most plausible receipt date found in OCR text."""
+    """
+    Return the most plausible receipt date found in OCR text.
+
+    Candidates are scored on format, a "Date:"-style label before them, a time stamp
+    next to them, labels that mark other dates (expiry, validity…) and their position
+    on the slip (header/footer vs. item lines). Scores of repeated dates add up; ties
+    go to the most recent date.
+    """
     today = date.today()
-    candidates: list[date] = []
-
-    for pattern, fmt in DATE_PATTERNS:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            try:
-                if fmt == "dmy":
-                    d, m, y = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                elif fmt == "ymd":
-                    y, m, d = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                elif fmt == "dmy_text":
-                    d = int(match.group(1))
-                    m = MONTH_MAP[match.group(2)[:3].lower()]
-                    y = int(match.group(3))
-                elif fmt == "mdy_text":
-                    m = MONTH_MAP[match.group(1)[:3].lower()]
-                    d = int(match.group(2))
-                    y = int(match.group(3))
-                else:
-                    continue
-                candidates.append(date(y, m, d))
-            except (ValueError, KeyError):
-                continue
-
-    # Discard future dates and anything older than 10 years
-    valid = [c for c in candidates if c <= today and c.year >= today.year - 10]
-    # Most recent plausible date wins (receipt date is usually the latest on the slip)
-    return max(valid) if valid else None
-
-
-def _vision_client():
-    """Build Vision client — accepts JSON content in either GOOGLE_CREDENTIALS_JSON
-    or GOOGLE_APPLICATION_CREDENTIALS (auto-detected when value starts with '{')."""
-    import json
-    import os
-    from google.oauth2 import service_account
-    from app.config import settings
-
-    # Resolve JSON content from whichever env var the user populated
-    raw = settings.google_credentials_json
-    if not raw:
-        ga = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS", "")
-        if ga.strip().startswith("{"):
-            raw = ga
-
-    if raw:
-        info = json.loads(raw)
-        # Some env var UIs double-escape \n in the private key — normalize it
-        if "private_key" in info and "\\n" in info["private_key"]:
-            info["private_key"] = info["private_key"].replace("\\n", "\n")
-        creds = service_account.Credentials.from_service_account_info(
-            info, scopes=["https://www.googleapis.com/auth/cloud-platform"]
-        )
-        return vision.ImageAnnotatorClient(credentials=creds)
-
-    return vision.ImageAnnotatorClient()
-
-
-def extract_date_from_image(image_bytes: bytes) -> Optional[date]:
-    """Call Google Cloud Vision and extract the receipt date from the returned text."""
-    client = _vision_client()
-    image = vision.Image(content=image_bytes)
-    response = client.text_detection(image=image)
-
-    if response.error.message:
-        raise RuntimeError(f"Vision API error: {response.error.message}")
-
-    if not response.text_annotations:
+    oldest_year = today.year - 10
+    n_lines = text.count("\n") + 1
+    scores: dict[date, float] = {}
+
+    for m in _DATE_RE.finditer(text):
+        parsed = _parse_match(m)
+        if parsed is None:
+            continue
+        candidate, score = parsed
+        # Discard future dates and anything older than 10 years
+        if candidate > today or candidate.year < oldest_year:
+            continue
+
+        start, end = m.span()
+        line_start = text.rfind("\n", 0, start) + 1
+        line_end = text.find("\n", end)
+        before = text[max(line_start, start - _CONTEXT):start]
+        after = text[end:min(line_end if line_end != -1 else len(text), end + _CONTEXT)]
+
+        if _DATE_LABEL_RE.search(before):
+            score += 3.0
+        if _OTHER_DATE_LABEL_RE.search(before):
+            score -= 3.0
+        if _TIME_RE.search(after) or _TIME_RE.search(before):
+            score += 2.0
+        position = text.count("\n", 0, start) / n_lines
+        if position < 0.25 or position > 0.75:
+            score += 0.5
+
+        scores[candidate] = scores.get(candidate, 0.0) + max(score, 0.1)
+
+    if not scores:
         return None
+    return max(scores, key=lambda d: (scores[d], d))
+
+
+def content_hash(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
 
-    full_text = response.text_annotations[0].description
+def _cache_key(digest: str) -> str:
+    return f"{get_engine().name}:{digest}"
+
+
+def extract_date_from_image(image_bytes: bytes, digest: Optional[str] = None) -> Optional[date]:
+    """Run the configured OCR engine (through the text cache) and extract the receipt date."""
+    key = _cache_key(digest or content_hash(image_bytes))
+    full_text = _text_cache.get_or_fetch(key, lambda: get_engine().detect_text(image_bytes))
+    if not full_text:
+        return None
     return extract_date_from_text(full_text)
+
+
+def extract_dates_from_images(
+    images: list[bytes],
+    digests: Optional[list[str]] = None,
+) -> list[Optional[date] | Exception]:
+    """Batch variant of extract_date_from_image; per-image OCR errors are returned in place.
+    Only cache misses are sent to the engine."""
+    keys = [_cache_key(d) for d in (digests or [content_hash(b) for b in images])]
+    texts: list[Optional[str] | Exception] = [None] * len(images)
+    misses = []
+    for i, key in enumerate(keys):
+        hit, text = _text_cache.get(key)
+        if hit:
+            texts[i] = text
+        else:
+            misses.append(i)
+
+    if misses:
+        fetched = get_engine().detect_text_batch([images[i] for i in misses])
+        for i, text in zip(misses, fetched):
+            texts[i] = text
+            if not isinstance(text, Exception):
+                _text_cache.set(keys[i], text)
+
+    results: list[Optional[date] | Exception] = []
+    for text in texts:
+        if isinstance(text, Exception):
+            results.append(text)
+        else:
+            results.append(extract_date_from_text(text) if text else None)
+    return results
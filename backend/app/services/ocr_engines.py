@@ -0,0 +1,174 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Optional, Protocol
+
+from app.config import settings
+
+# Vision accepts at most 16 images per batch_annotate_images request
+VISION_BATCH_SIZE = 16
+
+
+class OcrEngine(Protocol):
+    name: str
+
+    def detect_text(self, image_bytes: bytes) -> Optional[str]:
+        """Return the full text found in the image, or None if there is none."""
+        ...
+
+    def detect_text_batch(self, images: list[bytes]) -> list[Optional[str] | Exception]:
+        """One result per image, in order; per-image failures are returned, not raised."""
+        ...
+
+
+def _one_by_one(engine: OcrEngine, images: list[bytes]) -> list[Optional[str] | Exception]:
+    results: list[Optional[str] | Exception] = []
+    for image_bytes in images:
+        try:
+            results.append(engine.detect_text(image_bytes))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+class VisionEngine:
+    """Google Cloud Vision text detection over one long-lived, thread-safe gRPC client."""
+
+    name = "vision"
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = _vision_client()
+        return self._client
+
+    def detect_text(self, image_bytes: bytes) -> Optional[str]:
+        from google.cloud import vision
+
+        response = self.client.text_detection(image=vision.Image(content=image_bytes))
+        if response.error.message:
+            raise RuntimeError(f"Vision API error: {response.error.message}")
+        if not response.text_annotations:
+            return None
+        return response.text_annotations[0].description
+
+    def detect_text_batch(self, images: list[bytes]) -> list[Optional[str] | Exception]:
+        """Annotate up to VISION_BATCH_SIZE images per `batch_annotate_images` call."""
+        from google.cloud import vision
+
+        feature = vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)
+        results: list[Optional[str] | Exception] = []
+        for start in range(0, len(images), VISION_BATCH_SIZE):
+            chunk = images[start:start + VISION_BATCH_SIZE]
+            requests = [
+                vision.AnnotateImageRequest(image=vision.Image(content=b), features=[feature])
+                for b in chunk
+            ]
+            try:
+                batch = self.client.batch_annotate_images(requests=requests)
+            except Exception as e:
+                results.extend(e for _ in chunk)
+                continue
+            for response in batch.responses:
+                if response.error.message:
+                    results.append(RuntimeError(f"Vision API error: {response.error.message}"))
+                elif not response.text_annotations:
+                    results.append(None)
+                else:
+                    results.append(response.text_annotations[0].description)
+        return results
+
+
+class FixtureEngine:
+    """
+    Deterministic offline engine for tests and benchmarks.
+    Looks up `<sha256 of image>.txt` in OCR_FIXTURE_DIR; otherwise the payload's own
+    UTF-8 text (undecodable bytes such as a JPEG magic number dropped) is the OCR result.
+    """
+
+    name = "fixture"
+
+    def __init__(self, fixture_dir: str = ""):
+        self.fixture_dir = fixture_dir
+
+    def detect_text(self, image_bytes: bytes) -> Optional[str]:
+        if self.fixture_dir:
+            path = os.path.join(self.fixture_dir, hashlib.sha256(image_bytes).hexdigest() + ".txt")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return f.read()
+        return image_bytes.decode("utf-8", errors="ignore").strip() or None
+
+    def detect_text_batch(self, images: list[bytes]) -> list[Optional[str] | Exception]:
+        return _one_by_one(self, images)
+
+
+class TesseractEngine:
+    """Local Tesseract OCR — needs the optional `pytesseract` and `Pillow` packages."""
+
+    name = "tesseract"
+
+    def __init__(self, languages: str = "eng+fra+deu"):
+        try:
+            import pytesseract
+            from PIL import Image
+        except ImportError as e:
+            raise RuntimeError("OCR_ENGINE=tesseract requires `pip install pytesseract Pillow`") from e
+        self._tesseract = pytesseract
+        self._image = Image
+        self.languages = languages
+
+    def detect_text(self, image_bytes: bytes) -> Optional[str]:
+        with self._image.open(io.BytesIO(image_bytes)) as img:
+            text = self._tesseract.image_to_string(img, lang=self.languages)
+        return text.strip() or None
+
+    def detect_text_batch(self, images: list[bytes]) -> list[Optional[str] | Exception]:
+        return _one_by_one(self, images)
+
+
+@lru_cache
+def get_engine() -> OcrEngine:
+    """Engine selected by OCR_ENGINE, built once per process."""
+    if settings.ocr_engine == "vision":
+        return VisionEngine()
+    if settings.ocr_engine == "fixture":
+        return FixtureEngine(settings.ocr_fixture_dir)
+    if settings.ocr_engine == "tesseract":
+        return TesseractEngine()
+    raise ValueError(f"Unknown OCR_ENGINE {settings.ocr_engine!r}")
+
+
+def _vision_client():
+    """Build Vision client — accepts JSON content in either GOOGLE_CREDENTIALS_JSON
+    or GOOGLE_APPLICATION_CREDENTIALS (auto-detected when value starts with '{')."""
+    from google.cloud import vision
+    from google.oauth2 import service_account
+
+    # Resolve JSON content from whichever env var the user populated
+    raw = settings.google_credentials_json
+    if not raw:
+        ga = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS", "")
+        if ga.strip().startswith("{"):
+            raw = ga
+
+    if raw:
+        info = json.loads(raw)
+        # Some env var UIs double-escape \n in the private key — normalize it
+        if "private_key" in info and "\\n" in info["private_key"]:
+            info["private_key"] = info["private_key"].replace("\\n", "\n")
+        creds = service_account.Credentials.from_service_account_info(
+            info, scopes=["https://www.googleapis.com/auth/cloud-platform"]
+        )
+        return vision.ImageAnnotatorClient(credentials=creds)
+
+    return vision.ImageAnnotatorClient()
@@ -0,0 +1,121 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.config import settings
+from app.db.supabase import get_supabase_admin
+from app.services import summaries
+from app.services.images import normalize_image
+
+logger = logging.getLogger(__name__)
+
+# Background OCR: upload_receipt_async stores the row as "pending" and queues its id here.
+# Jobs carry ids only (the image is downloaded from storage when the job runs), so a
+# long queue costs no image memory. _queued holds the ids this process has queued, so
+# the periodic recovery never queues one twice.
+_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+_queued: set[str] = set()
+
+
+def start() -> None:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.ocr_workers, thread_name_prefix="ocr")
+
+
+def shutdown() -> None:
+    """Stop accepting jobs and wait for running ones; queued jobs stay pending for recovery."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+        _queued.clear()
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def submit(receipt_id: str, storage_path: str, content_hash: Optional[str] = None) -> None:
+    """Queue OCR for a pending receipt, unless this process already has it queued."""
+    if _pool is None:
+        start()
+    with _lock:
+        if receipt_id in _queued:
+            return
+        _queued.add(receipt_id)
+    _pool.submit(_process, receipt_id, storage_path, content_hash)
+
+
+def recover_pending() -> int:
+    """
+    Re-queue receipts pending for longer than OCR_PENDING_TIMEOUT: left behind by a
+    process that crashed or was stopped. Younger ones may still be queued on another
+    live instance and are left alone. Runs at startup and then periodically.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.ocr_pending_timeout)
+    rows = (
+        get_supabase_admin()
+        .table("receipts")
+        .select("id,storage_path,content_hash")
+        .eq("ocr_status", "pending")
+        .lt("created_at", cutoff.isoformat())
+        .order("created_at")
+        .execute()
+    ).data
+    for row in rows:
+        submit(row["id"], row["storage_path"], row["content_hash"])
+    if rows:
+        logger.info("Re-queued %d pending OCR jobs", len(rows))
+    return len(rows)
+
+
+def _process(receipt_id: str, storage_path: str, content_hash: Optional[str]) -> None:
+    try:
+        _resolve(receipt_id, storage_path, content_hash)
+    finally:
+        with _lock:
+            _queued.discard(receipt_id)
+
+
+def _resolve(receipt_id: str, storage_path: str, content_hash: Optional[str]) -> None:
+    from app.services.receipts import BUCKET, _run_ocr
+
+    supabase = get_supabase_admin()
+    try:
+        pending = supabase.table("receipts").select("id").eq("id", receipt_id).eq("ocr_status", "pending").execute().data
+    except Exception as e:
+        logger.error("OCR job for receipt %s not started, left pending: %s", receipt_id, e)
+        return
+    if not pending:
+        return  # resolved meanwhile (another instance's recovery, a manual date): no Vision call
+
+    try:
+        stored = supabase.storage.from_(BUCKET).download(storage_path)
+        image_bytes, _ = normalize_image(stored, None) if settings.image_normalize else (stored, None)
+        # Keyed by the upload's hash, so a re-run is answered from the OCR text cache
+        receipt_date, ocr_status = _run_ocr(image_bytes, content_hash)
+    except Exception as e:
+        logger.exception("OCR job for receipt %s failed: %s", receipt_id, e)
+        receipt_date, ocr_status = None, "failed"
+
+    # Only resolve rows still pending — a manual date set meanwhile wins
+    try:
+        resolved = (
+            supabase.table("receipts")
+            .update({
+                "receipt_date": receipt_date.isoformat() if receipt_date else None,
+                "ocr_status": ocr_status,
+            })
+            .eq("id", receipt_id)
+            .eq("ocr_status", "pending")
+            .execute()
+        ).data
+    except Exception as e:
+        # Row stays pending and is picked up again by recover_pending()
+        logger.error("Failed to store OCR result for receipt %s: %s", receipt_id, e)
+        return
+
+    if resolved and receipt_date:
+        summaries.receipts_changed(supabase, resolved[0]["user_id"], added=[receipt_date])
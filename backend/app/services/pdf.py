@@ -1,4 +1,5 @@
 from datetime import date
+from typing import NamedTuple, Optional
 
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos
@@ -36,16 +37,49 @@ class _PDF(FPDF):
 _WEEKDAY_NAMES = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"}
 
 
-def generate_compliance_report(
-    user_email: str,
-    year: int,
-    summary: dict,
-    receipts: list[dict],
-    public_holidays: list[dict],
-    user_holidays: list[dict],
-    schedule_periods: list[dict] | None = None,
-) -> bytes:
-    pdf = _PDF(f"Fiscal Compliance Report {year} - {user_email}")
+# ── Report input records ──────────────────────────────────────────────────────
+# Only what the PDF shows, as plain tuples: reports are rendered in worker processes
+# (see renderer), so inputs are pickled per report. Dates are ISO strings.
+
+class ReceiptRecord(NamedTuple):
+    receipt_date: Optional[str]
+    ocr_status: str
+    image_url: str
+
+
+class PublicHolidayRecord(NamedTuple):
+    date: str
+    name: str
+
+
+class UserHolidayRecord(NamedTuple):
+    start_date: str
+    end_date: str
+    description: Optional[str]
+
+
+class SchedulePeriodRecord(NamedTuple):
+    start_date: str
+    end_date: Optional[str]            # None = open-ended
+    working_days: tuple[int, ...]
+    description: Optional[str]
+
+
+class ReportData(NamedTuple):
+    user_email: str
+    year: int
+    generated: date
+    summary: dict                      # as returned by dashboard.compute_summary
+    receipts: tuple[ReceiptRecord, ...]
+    public_holidays: tuple[PublicHolidayRecord, ...]
+    user_holidays: tuple[UserHolidayRecord, ...]
+    schedule_periods: tuple[SchedulePeriodRecord, ...]
+    group_receipts_by_month: bool = False  # month rows with receipt/day subtotals
+
+
+def generate_compliance_report(report: ReportData) -> bytes:
+    year, summary = report.year, report.summary
+    pdf = _PDF(f"Fiscal Compliance Report {year} - {report.user_email}")
     pdf.set_margins(20, 20, 20)
     pdf.set_auto_page_break(auto=True, margin=20)
     pdf.add_page()
@@ -61,8 +95,8 @@ def generate_compliance_report(
     pdf.ln(3)
 
     pdf.set_font("Helvetica", "", 10)
-    pdf.cell(0, 6, f"Account: {user_email}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.cell(0, 6, f"Generated: {date.today().strftime('%d %B %Y')}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 6, f"Account: {report.user_email}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 6, f"Generated: {report.generated.strftime('%d %B %Y')}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(6)
 
     # ── Compliance status badge ───────────────────────────────────────────────
@@ -89,9 +123,9 @@ def generate_compliance_report(
     pdf.ln(7)
 
     # ── Receipts ──────────────────────────────────────────────────────────────
-    _section_title(pdf, f"Receipts ({len(receipts)})")
-    if receipts:
-        _receipts_table(pdf, receipts)
+    _section_title(pdf, f"Receipts ({len(report.receipts)})")
+    if report.receipts:
+        _receipts_table(pdf, report.receipts, report.group_receipts_by_month)
     else:
         pdf.set_font("Helvetica", "I", 10)
         pdf.set_text_color(120, 120, 120)
@@ -99,21 +133,21 @@ def generate_compliance_report(
     pdf.ln(7)
 
     # ── Public holidays ───────────────────────────────────────────────────────
-    if public_holidays:
-        _section_title(pdf, f"Public Holidays Excluded ({len(public_holidays)})")
-        _holidays_table(pdf, public_holidays)
+    if report.public_holidays:
+        _section_title(pdf, f"Public Holidays Excluded ({len(report.public_holidays)})")
+        _holidays_table(pdf, report.public_holidays)
         pdf.ln(7)
 
     # ── User-defined holidays ─────────────────────────────────────────────────
-    if user_holidays:
-        _section_title(pdf, f"Personal Holiday Periods ({len(user_holidays)})")
-        _user_holidays_table(pdf, user_holidays)
+    if report.user_holidays:
+        _section_title(pdf, f"Personal Holiday Periods ({len(report.user_holidays)})")
+        _user_holidays_table(pdf, report.user_holidays)
         pdf.ln(7)
 
     # ── Work schedule periods ─────────────────────────────────────────────────
-    if schedule_periods:
-        _section_title(pdf, f"Work Schedule Periods ({len(schedule_periods)})")
-        _schedule_periods_table(pdf, schedule_periods)
+    if report.schedule_periods:
+        _section_title(pdf, f"Work Schedule Periods ({len(report.schedule_periods)})")
+        _schedule_periods_table(pdf, report.schedule_periods)
 
     return bytes(pdf.output())
 
@@ -145,29 +179,115 @@ def _table_header(pdf: FPDF, widths: list[int], labels: list[str]):
     pdf.ln()
 
 
-def _receipts_table(pdf: FPDF, receipts: list[dict]):
+def _receipts_table(pdf: FPDF, receipts: tuple[ReceiptRecord, ...], group_by_month: bool = False):
+    # Thousands of rows: cell() per column costs ~70 µs, so rows are drawn a page at a
+    # time with text()/rect()/line(): fills, then the grid, then text by style, so each
+    # color and font is set once per page. The header is repeated on every page.
     widths = [_COL_DATE, _COL_DAY, _COL_OCR, _COL_LINK]
-    _table_header(pdf, widths, ["Date", "Day of week", "OCR status", "Receipt image"])
+    labels = ["Date", "Day of week", "OCR status", "Receipt image"]
+    rows = _receipt_rows(receipts, group_by_month)
+
+    _table_header(pdf, widths, labels)
+    start = 0
+    while start < len(rows):
+        fits = int((pdf.page_break_trigger - pdf.get_y()) // _ROW_H)
+        if fits < 1:
+            pdf.add_page()
+            _table_header(pdf, widths, labels)
+            continue
+        _draw_receipt_rows(pdf, widths, rows[start:start + fits])
+        start += fits
+
+
+def _receipt_rows(receipts: tuple[ReceiptRecord, ...], group_by_month: bool) -> list[tuple]:
+    """
+    Table rows in one pass: ("receipt", (date, weekday, status), url, shaded) and, when
+    grouping, a ("month", (label, subtotal), "", True) row before each month.
+    """
+    formatted: dict[str, tuple[str, str]] = {}  # one strftime per distinct day
+    rows: list[tuple] = []
+    month_row, month_key, month_days, shade = None, None, set(), 0
+    for r in receipts:
+        if r.receipt_date not in formatted:
+            d = date.fromisoformat(r.receipt_date) if r.receipt_date else None
+            formatted[r.receipt_date] = (d.strftime("%d/%m/%Y"), d.strftime("%A")) if d else ("-", "-")
+
+        if group_by_month and (r.receipt_date or "")[:7] != month_key:
+            _close_month(rows, month_row, month_days)
+            month_key, month_days, shade = (r.receipt_date or "")[:7], set(), 0
+            label = date.fromisoformat(f"{month_key}-01").strftime("%B %Y") if month_key else "Undated"
+            month_row = len(rows)
+            rows.append(("month", [label, ""], "", True))
+        month_days.add(r.receipt_date)
+
+        rows.append(("receipt", (*formatted[r.receipt_date], r.ocr_status), r.image_url, shade % 2 == 1))
+        shade += 1
+    _close_month(rows, month_row, month_days)
+    return rows
+
+
+def _close_month(rows: list[tuple], month_row: int | None, month_days: set) -> None:
+    if month_row is not None:
+        count, days = len(rows) - month_row - 1, len(month_days)
+        rows[month_row][1][1] = f"{count} receipt{'s' if count != 1 else ''}, {days} day{'s' if days != 1 else ''}"
+
+
+def _draw_receipt_rows(pdf: FPDF, widths: list[int], rows: list[tuple]):
+    x0, y0 = pdf.l_margin, pdf.get_y()
+    total = sum(widths)
+    edges = [x0 + sum(widths[:i]) for i in range(len(widths) + 1)]
+    baseline = 0.5 * _ROW_H + 0.3 * pdf.font_size
+
+    for shade, kind in (((245, 245, 245), "receipt"), ((225, 225, 225), "month")):
+        pdf.set_fill_color(*shade)
+        for i, row in enumerate(rows):
+            if row[0] == kind and row[3]:
+                pdf.rect(x0, y0 + i * _ROW_H, total, _ROW_H, style="F")
+
+    for i in range(len(rows) + 1):
+        pdf.line(x0, y0 + i * _ROW_H, x0 + total, y0 + i * _ROW_H)
+    for x in (edges[0], edges[-1]):
+        pdf.line(x, y0, x, y0 + len(rows) * _ROW_H)
+    # Inner column lines, broken at month rows
+    run_start = None
+    for i, row in enumerate(rows + [("month",)]):
+        if row[0] == "receipt" and run_start is None:
+            run_start = i
+        elif row[0] != "receipt" and run_start is not None:
+            for x in edges[1:-1]:
+                pdf.line(x, y0 + run_start * _ROW_H, x, y0 + i * _ROW_H)
+            run_start = None
 
     pdf.set_font("Helvetica", "", 9)
-    for idx, r in enumerate(receipts):
-        receipt_date = date.fromisoformat(r["receipt_date"]) if r.get("receipt_date") else None
-        date_str = receipt_date.strftime("%d/%m/%Y") if receipt_date else "-"
-        day_str = receipt_date.strftime("%A") if receipt_date else "-"
-        ocr_str = r.get("ocr_status", "-")
-
-        fill = idx % 2 == 1
-        pdf.set_fill_color(245, 245, 245)
+    pdf.set_text_color(30, 30, 30)
+    for i, row in enumerate(rows):
+        if row[0] == "receipt":
+            for x, text in zip(edges, row[1]):
+                pdf.text(x + pdf.c_margin, y0 + i * _ROW_H + baseline, text)
+
+    pdf.set_text_color(0, 80, 180)
+    for i, row in enumerate(rows):
+        if row[0] == "receipt":
+            y = y0 + i * _ROW_H
+            pdf.text(edges[3] + pdf.c_margin, y + baseline, "View receipt")
+            if row[2]:
+                pdf.link(edges[3], y, widths[3], _ROW_H, row[2])
+
+    if any(row[0] == "month" for row in rows):
+        pdf.set_font("Helvetica", "B", 9)
         pdf.set_text_color(30, 30, 30)
-        pdf.cell(_COL_DATE, _ROW_H, date_str, border=1, fill=fill)
-        pdf.cell(_COL_DAY, _ROW_H, day_str, border=1, fill=fill)
-        pdf.cell(_COL_OCR, _ROW_H, ocr_str, border=1, fill=fill)
-        pdf.set_text_color(0, 80, 180)
-        pdf.cell(_COL_LINK, _ROW_H, "View receipt", border=1, fill=fill, link=r.get("image_url", ""))
-        pdf.ln()
+        for i, row in enumerate(rows):
+            if row[0] == "month":
+                label, subtotal = row[1]
+                y = y0 + i * _ROW_H + baseline
+                pdf.text(x0 + pdf.c_margin, y, label)
+                pdf.text(x0 + total - pdf.c_margin - pdf.get_string_width(subtotal), y, subtotal)
+        pdf.set_font("Helvetica", "", 9)
+
+    pdf.set_xy(x0, y0 + len(rows) * _ROW_H)
 
 
-def _holidays_table(pdf: FPDF, holidays: list[dict]):
+def _holidays_table(pdf: FPDF, holidays: tuple[PublicHolidayRecord, ...]):
     widths = [32, 138]
     _table_header(pdf, widths, ["Date", "Holiday"])
 
@@ -176,12 +296,12 @@ def _holidays_table(pdf: FPDF, holidays: list[dict]):
         fill = idx % 2 == 1
         pdf.set_fill_color(245, 245, 245)
         pdf.set_text_color(30, 30, 30)
-        pdf.cell(widths[0], _ROW_H, h.get("date", ""), border=1, fill=fill)
-        pdf.cell(widths[1], _ROW_H, h.get("name", ""), border=1, fill=fill)
+        pdf.cell(widths[0], _ROW_H, h.date, border=1, fill=fill)
+        pdf.cell(widths[1], _ROW_H, h.name, border=1, fill=fill)
         pdf.ln()
 
 
-def _schedule_periods_table(pdf: FPDF, periods: list[dict]):
+def _schedule_periods_table(pdf: FPDF, periods: tuple[SchedulePeriodRecord, ...]):
     widths = [32, 32, 40, 66]
     _table_header(pdf, widths, ["From", "To", "Working days", "Description"])
 
@@ -190,15 +310,15 @@ def _schedule_periods_table(pdf: FPDF, periods: list[dict]):
         fill = idx % 2 == 1
         pdf.set_fill_color(245, 245, 245)
         pdf.set_text_color(30, 30, 30)
-        pdf.cell(widths[0], _ROW_H, p.get("start_date", ""), border=1, fill=fill)
-        pdf.cell(widths[1], _ROW_H, p.get("end_date") or "ongoing", border=1, fill=fill)
-        days_str = ", ".join(_WEEKDAY_NAMES[d] for d in sorted(p.get("working_days", []))) or "None (leave)"
+        pdf.cell(widths[0], _ROW_H, p.start_date, border=1, fill=fill)
+        pdf.cell(widths[1], _ROW_H, p.end_date or "ongoing", border=1, fill=fill)
+        days_str = ", ".join(_WEEKDAY_NAMES[d] for d in sorted(p.working_days)) or "None (leave)"
         pdf.cell(widths[2], _ROW_H, days_str, border=1, fill=fill)
-        pdf.cell(widths[3], _ROW_H, p.get("description") or "-", border=1, fill=fill)
+        pdf.cell(widths[3], _ROW_H, p.description or "-", border=1, fill=fill)
         pdf.ln()
 
 
-def _user_holidays_table(pdf: FPDF, holidays: list[dict]):
+def _user_holidays_table(pdf: FPDF, holidays: tuple[UserHolidayRecord, ...]):
     widths = [32, 32, 106]
     _table_header(pdf, widths, ["From", "To", "Description"])
 
@@ -207,7 +327,7 @@ def _user_holidays_table(pdf: FPDF, holidays: list[dict]):
         fill = idx % 2 == 1
         pdf.set_fill_color(245, 245, 245)
         pdf.set_text_color(30, 30, 30)
-        pdf.cell(widths[0], _ROW_H, h.get("start_date", ""), border=1, fill=fill)
-        pdf.cell(widths[1], _ROW_H, h.get("end_date", ""), border=1, fill=fill)
-        pdf.cell(widths[2], _ROW_H, h.get("description") or "-", border=1, fill=fill)
+        pdf.cell(widths[0], _ROW_H, h.start_date, border=1, fill=fill)
+        pdf.cell(widths[1], _ROW_H, h.end_date, border=1, fill=fill)
+        pdf.cell(widths[2], _ROW_H, h.description or "-", border=1, fill=fill)
         pdf.ln()
@@ -1,139 +1,698 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
 import logging
+import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
 
 from fastapi import HTTPException, UploadFile, status
-from supabase import Client
+from fastapi.concurrency import run_in_threadpool
+from supabase import AsyncClient, Client
 
-from app.services.ocr import extract_date_from_image
+from app.config import settings
+from app.services import ocr_jobs, signed_urls, summaries
+from app.services.images import ImageSource, make_thumbnail, normalize_image
+from app.services.ocr import extract_date_from_image, extract_dates_from_images
 
 logger = logging.getLogger(__name__)
 
 BUCKET = "receipts"
 SIGNED_URL_EXPIRY = 3600  # seconds
+THUMBNAIL_CONTENT_TYPE = "image/webp"
+RECEIPT_FIELDS = (
+    "id", "user_id", "receipt_date", "ocr_status", "storage_path",
+    "image_url", "thumbnail_path", "thumbnail_url", "notes", "content_hash", "created_at",
+)
+_READ_CHUNK_SIZE = 64 * 1024
+_MAGIC_NUMBERS = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"%PDF-", "application/pdf"),
+]
 
+# Endpoints run on the async Supabase client; image normalization and OCR (CPU work and
+# the blocking Vision SDK) go to the threadpool. The multi-file upload is a plain `def`
+# endpoint on the sync client, with its storage uploads on a thread pool.
 
-def upload_receipt(
-    supabase: Client,
-    user_id: str,
-    file: UploadFile,
-) -> dict:
-    image_bytes = file.file.read()
-    receipt_date, ocr_status = _run_ocr(image_bytes)
 
-    receipt_id = str(uuid.uuid4())
-    ext = _extension(file.content_type)
-    storage_path = f"{user_id}/{receipt_id}{ext}"
+async def upload_receipt_async(supabase: AsyncClient, user_id: str, file: UploadFile) -> dict:
+    image, digest, content_type = await _read_upload_async(file)
+
+    existing = await _find_by_hashes_async(supabase, user_id, [digest])
+    if digest in existing:
+        record = existing[digest]
+        await _attach_signed_urls_async(supabase, [record])
+        return record
 
-    supabase.storage.from_(BUCKET).upload(
-        path=storage_path,
-        file=image_bytes,
-        file_options={"content-type": file.content_type or "application/octet-stream"},
+    background = settings.ocr_mode == "background"
+    ocr_bytes, stored, stored_type, thumbnail = await run_in_threadpool(
+        _prepare_image, image, content_type, not background
     )
+    if background:
+        receipt_date, ocr_status = None, "pending"
+    else:
+        receipt_date, ocr_status = await run_in_threadpool(_run_ocr, ocr_bytes, digest)
 
-    row = {
-        "id": receipt_id,
-        "user_id": user_id,
-        "receipt_date": receipt_date.isoformat() if receipt_date else None,
-        "ocr_status": ocr_status,
-        "storage_path": storage_path,
-        "notes": None,
-    }
-    result = supabase.table("receipts").insert(row).execute()
+    row = _new_row(user_id, stored_type, receipt_date, ocr_status, digest, thumbnail is not None)
+    await _store_image_async(supabase, row["storage_path"], stored, stored_type)
+    await _store_thumbnail_async(supabase, row, thumbnail)
+
+    result = await _insert_query(supabase, [row]).execute()
+    if not result.data:
+        # A concurrent upload of the same bytes (e.g. a client retry) inserted first
+        await _remove_objects_async(supabase, _object_paths(row))
+        existing = await _find_by_hashes_async(supabase, user_id, [digest])
+        if digest not in existing:  # ... and was deleted since
+            raise _upload_conflict()
+        await _attach_signed_urls_async(supabase, [existing[digest]])
+        return existing[digest]
+    if background:
+        ocr_jobs.submit(row["id"], row["storage_path"], digest)
+    else:
+        await summaries.receipts_changed_async(supabase, user_id, added=[receipt_date])
     record = result.data[0]
-    record["image_url"] = _signed_url(supabase, storage_path)
+    await _attach_signed_urls_async(supabase, [record])
     record["ocr_status"] = ocr_status
     return record
 
 
-def list_receipts(
+def upload_receipts_batch(
     supabase: Client,
     user_id: str,
+    files: list[UploadFile],
+) -> dict:
+    """
+    Multi-file variant of upload_receipt_async: OCR in Vision batches, concurrent storage
+    uploads and one bulk insert per OCR_BATCH_SIZE files. Never fails as a whole — each
+    file gets its own result.
+    Files already uploaded (same content hash, in an earlier request or earlier in the
+    batch) are reported as "existing".
+    """
+    if len(files) > settings.upload_batch_max_files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.upload_batch_max_files} files per batch",
+        )
+
+    # Oversized / non-image files fail individually, before any upstream call
+    images: list[Optional[BinaryIO]] = [None] * len(files)
+    digests: list[Optional[str]] = [None] * len(files)
+    content_types: list[Optional[str]] = [None] * len(files)
+    errors: dict[int, str] = {}
+    for i, f in enumerate(files):
+        try:
+            images[i], digests[i], content_types[i] = _read_upload(f)
+        except HTTPException as e:
+            errors[i] = e.detail
+
+    existing = _find_by_hashes(supabase, user_id, [d for d in digests if d])
+
+    # Only the first occurrence of each unseen hash is created
+    first_index: dict[str, int] = {}
+    new = []
+    for i, digest in enumerate(digests):
+        if digest and digest not in existing and digest not in first_index:
+            first_index[digest] = i
+            new.append(i)
+
+    background = settings.ocr_mode == "background"
+    rows: dict[int, dict] = {}
+
+    def _store(i: int, prepared: tuple) -> None:
+        try:
+            _store_image(supabase, rows[i]["storage_path"], prepared[1], prepared[2])
+            _store_thumbnail(supabase, rows[i], prepared[3])
+        except Exception as e:
+            logger.error("Batch upload: storing %s failed: %s", files[i].filename, e)
+            errors[i] = "Storage upload failed"
+
+    def _create(chunk: list[int]) -> dict[str, dict]:
+        # (ocr bytes, stored image, stored content type, thumbnail) per file of the chunk
+        prepared = {i: _prepare_image(images[i], content_types[i], not background) for i in chunk}
+        if background:
+            ocr_results = [(None, "pending")] * len(chunk)
+        else:
+            ocr_results = _run_ocr_batch([prepared[i][0] for i in chunk], [digests[i] for i in chunk])
+        for i, (receipt_date, ocr_status) in zip(chunk, ocr_results):
+            rows[i] = _new_row(user_id, prepared[i][2], receipt_date, ocr_status, digests[i], prepared[i][3] is not None)
+
+        list(pool.map(_store, chunk, [prepared[i] for i in chunk]))
+        stored = [i for i in chunk if i not in errors]
+        if not stored:
+            return {}
+        try:
+            result = _insert_query(supabase, [rows[i] for i in stored]).execute()
+        except Exception as e:
+            logger.error("Batch upload: bulk insert failed: %s", e)
+            _remove_objects(supabase, [path for i in stored for path in _object_paths(rows[i])])
+            for i in stored:
+                errors[i] = "Database insert failed"
+            return {}
+        inserted = {r["content_hash"]: r for r in result.data}
+
+        # Files a concurrent upload inserted first are reported as existing
+        raced = [i for i in stored if digests[i] not in inserted]
+        if raced:
+            _remove_objects(supabase, [path for i in raced for path in _object_paths(rows[i])])
+            existing.update(_find_by_hashes(supabase, user_id, [digests[i] for i in raced]))
+            for i in raced:
+                if digests[i] not in existing:
+                    errors[i] = _upload_conflict().detail
+        if background:
+            for i in stored:
+                if digests[i] in inserted:
+                    ocr_jobs.submit(rows[i]["id"], rows[i]["storage_path"], digests[i])
+        return inserted
+
+    # One OCR_BATCH_SIZE chunk at a time (one Vision call, one insert each), so a request
+    # only ever holds a chunk's normalized images and thumbnails; the uploads themselves
+    # stay in their spooled files
+    created: dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=settings.storage_upload_concurrency) as pool:
+        for start in range(0, len(new), settings.ocr_batch_size):
+            created.update(_create(new[start:start + settings.ocr_batch_size]))
+
+    if created and not background:
+        summaries.receipts_changed(supabase, user_id, added=[r["receipt_date"] for r in created.values()])
+    _attach_signed_urls(supabase, [*existing.values(), *created.values()])
+
+    results = []
+    for i, f in enumerate(files):
+        digest = digests[i]
+        if digest in existing:
+            outcome, record = "existing", existing[digest]
+        elif digest in created:
+            outcome, record = ("created" if first_index[digest] == i else "existing"), created[digest]
+        else:
+            outcome, record = "failed", None
+        results.append({
+            "filename": f.filename,
+            "status": outcome,
+            "receipt": record,
+            "error": errors.get(i) or errors.get(first_index.get(digest)) if outcome == "failed" else None,
+        })
+
+    counts = {k: sum(1 for r in results if r["status"] == k) for k in ("created", "existing", "failed")}
+    return {"results": results, **counts}
+
+
+async def list_receipts_async(
+    supabase: AsyncClient,
+    user_id: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[list[str]] = None,
 ) -> dict:
-    query = (
+    """
+    Receipts, newest first (undated receipts first, as they need attention).
+
+    Keyset-paginated on (receipt_date, id) so every page is an index range scan on
+    receipts_user_date_idx, however long the user's history. Pagination is opt-in:
+    with a `limit` or `cursor` one page is returned and `next_cursor` is null on the
+    last one; with neither, every matching receipt is returned (read in pages of
+    RECEIPTS_MAX_PAGE_SIZE) as clients that predate pagination expect. `total` counts
+    all receipts matching the date filters.
+    """
+    paginated = limit is not None or cursor is not None
+    if not paginated:
+        limit = settings.receipts_max_page_size
+    rows: list[dict] = []
+    total = None
+    while True:
+        page_query, count_query, page_size, wanted = _list_queries(
+            supabase, user_id, start_date, end_date, limit, cursor, fields
+        )
+        if count_query is not None and total is None:
+            result, counted = await asyncio.gather(page_query.execute(), count_query.execute())
+            total = counted.count
+        else:
+            result = await page_query.execute()
+            if total is None:
+                total = result.count
+        page, cursor = _page(result.data, page_size)
+        rows.extend(page)
+        if paginated or cursor is None:
+            break
+    if wanted & {"image_url", "thumbnail_url"}:
+        await _attach_signed_urls_async(supabase, rows, "image_url" in wanted, "thumbnail_url" in wanted)
+    return {"receipts": _project(rows, wanted), "total": total, "next_cursor": cursor}
+
+
+async def get_receipt_async(supabase: AsyncClient, user_id: str, receipt_id: str) -> dict:
+    result = await (
         supabase.table("receipts")
         .select("*")
+        .eq("id", receipt_id)
         .eq("user_id", user_id)
-        .order("receipt_date", desc=True)
+        .execute()
     )
-    if start_date:
-        query = query.gte("receipt_date", start_date.isoformat())
-    if end_date:
-        query = query.lte("receipt_date", end_date.isoformat())
-
-    result = query.execute()
-    rows = result.data
-    for row in rows:
-        row["image_url"] = _signed_url(supabase, row["storage_path"])
-
-    return {"receipts": rows, "total": len(rows)}
+    row = _first_or_404(result.data)
+    await _attach_signed_urls_async(supabase, [row])
+    return row
 
 
-def get_receipt(supabase: Client, user_id: str, receipt_id: str) -> dict:
-    result = (
+async def get_ocr_status_async(supabase: AsyncClient, user_id: str, receipt_id: str) -> dict:
+    result = await (
         supabase.table("receipts")
-        .select("*")
+        .select("id,ocr_status,receipt_date")
         .eq("id", receipt_id)
         .eq("user_id", user_id)
         .execute()
     )
-    if not result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Receipt not found")
-    row = result.data[0]
-    row["image_url"] = _signed_url(supabase, row["storage_path"])
-    return row
+    return _first_or_404(result.data)
 
 
-def update_receipt_date(supabase: Client, user_id: str, receipt_id: str, receipt_date: date) -> dict:
-    result = (
+async def update_receipt_date_async(
+    supabase: AsyncClient, user_id: str, receipt_id: str, receipt_date: date
+) -> dict:
+    previous = _first_or_404((await _date_query(supabase, user_id, receipt_id).execute()).data)["receipt_date"]
+    result = await (
         supabase.table("receipts")
         .update({"receipt_date": receipt_date.isoformat(), "ocr_status": "manual"})
         .eq("id", receipt_id)
         .eq("user_id", user_id)
         .execute()
     )
-    if not result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Receipt not found")
-    row = result.data[0]
-    row["image_url"] = _signed_url(supabase, row["storage_path"])
+    row = _first_or_404(result.data)
+    await summaries.receipts_changed_async(supabase, user_id, added=[receipt_date], removed=[previous])
+    await _attach_signed_urls_async(supabase, [row])
     return row
 
 
-def delete_receipt(supabase: Client, user_id: str, receipt_id: str) -> None:
-    result = (
+async def delete_receipt_async(supabase: AsyncClient, user_id: str, receipt_id: str) -> None:
+    result = await (
         supabase.table("receipts")
-        .select("storage_path")
+        .select("storage_path,thumbnail_path,receipt_date")
         .eq("id", receipt_id)
         .eq("user_id", user_id)
         .execute()
     )
-    if not result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Receipt not found")
-
-    storage_path = result.data[0]["storage_path"]
+    record = _first_or_404(result.data)
+    paths = _object_paths(record)
     # Delete storage first — if this fails the DB row is still intact
+    await _remove_objects_async(supabase, paths)
+    signed_urls.invalidate(BUCKET, paths)
+    await supabase.table("receipts").delete().eq("id", receipt_id).eq("user_id", user_id).execute()
+    await summaries.receipts_changed_async(supabase, user_id, removed=[record["receipt_date"]])
+
+
+def _read_upload(file: UploadFile) -> tuple[BinaryIO, str, str]:
+    """
+    Stream the upload in chunks. Oversized or non-image payloads are rejected as soon as
+    that's known (before any upstream call); the content is hashed (SHA-256) and its type
+    sniffed incrementally. Returns (the upload's spooled file, rewound; hex digest; sniffed
+    content type). Nothing is copied: Storage streams the file, Pillow decodes from it, and
+    only OCR of an image that wasn't normalized reads it into memory.
+    """
+    reader = _UploadReader(file)
+    while chunk := file.file.read(_READ_CHUNK_SIZE):
+        reader.feed(chunk)
+    return reader.finish()
+
+
+async def _read_upload_async(file: UploadFile) -> tuple[BinaryIO, str, str]:
+    reader = _UploadReader(file)
+    while chunk := await file.read(_READ_CHUNK_SIZE):
+        reader.feed(chunk)
+    return reader.finish()
+
+
+class _UploadReader:
+    """Incremental size check, type sniffing and hashing for _read_upload(_async)."""
+
+    def __init__(self, file: UploadFile):
+        self.limit = settings.upload_max_bytes
+        if file.size is not None and file.size > self.limit:
+            raise _too_large(self.limit)
+        self.file = file.file
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.content_type: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> None:
+        if self.content_type is None:
+            self.content_type = _sniff_content_type(chunk)
+            if self.content_type is None:
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail="Unsupported file type — upload a JPEG, PNG, WebP or PDF",
+                )
+        self.size += len(chunk)
+        if self.size > self.limit:
+            raise _too_large(self.limit)
+        self.digest.update(chunk)
+
+    def finish(self) -> tuple[BinaryIO, str, str]:
+        if self.content_type is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file")
+        self.file.seek(0)
+        return self.file, self.digest.hexdigest(), self.content_type
+
+
+def _sniff_content_type(head: bytes) -> Optional[str]:
+    for magic, content_type in _MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _upload_conflict() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="The same file was uploaded and deleted concurrently — retry the upload",
+    )
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the {limit // (1024 * 1024)} MB upload limit",
+    )
+
+
+def _prepare_image(
+    image: BinaryIO, content_type: Optional[str], ocr: bool = True
+) -> tuple[Optional[bytes], ImageSource, Optional[str], Optional[bytes]]:
+    """
+    Return (bytes for OCR or None without `ocr`, bytes or file to store, stored content
+    type, thumbnail or None) per the IMAGE_* and THUMBNAIL_* settings. The upload is only
+    read into memory when OCR needs it as is (normalization off, or not smaller when
+    normalized). Background OCR jobs download the stored image instead.
+    """
+    thumbnail = make_thumbnail(image, content_type)
+    normalize = settings.image_normalize and (ocr or settings.image_store_normalized)
+    normalized, normalized_type = normalize_image(image, content_type) if normalize else (image, content_type)
+    ocr_bytes = None
+    if ocr:
+        ocr_bytes = normalized if isinstance(normalized, bytes) else _read_all(image)
+    if settings.image_store_normalized:
+        return ocr_bytes, normalized, normalized_type, thumbnail
+    return ocr_bytes, image, content_type, thumbnail
+
+
+def _read_all(image: BinaryIO) -> bytes:
+    image.seek(0)
+    return image.read()
+
+
+def _find_by_hashes(supabase: Client, user_id: str, digests: list[str]) -> dict[str, dict]:
+    if not digests:
+        return {}
+    result = _hashes_query(supabase, user_id, digests).execute()
+    return {r["content_hash"]: r for r in result.data}
+
+
+async def _find_by_hashes_async(supabase: AsyncClient, user_id: str, digests: list[str]) -> dict[str, dict]:
+    if not digests:
+        return {}
+    result = await _hashes_query(supabase, user_id, digests).execute()
+    return {r["content_hash"]: r for r in result.data}
+
+
+def _date_query(supabase: Client | AsyncClient, user_id: str, receipt_id: str):
+    return supabase.table("receipts").select("receipt_date").eq("id", receipt_id).eq("user_id", user_id)
+
+
+def _hashes_query(supabase: Client | AsyncClient, user_id: str, digests: list[str]):
+    return (
+        supabase.table("receipts")
+        .select("*")
+        .eq("user_id", user_id)
+        .in_("content_hash", list(set(digests)))
+    )
+
+
+def _insert_query(supabase: Client | AsyncClient, rows: list[dict]):
+    """
+    Insert new receipt rows, skipping any whose (user_id, content_hash) already exists
+    (unique index, migration 013): only the rows actually inserted are returned.
+    """
+    return supabase.table("receipts").upsert(rows, on_conflict="user_id,content_hash", ignore_duplicates=True)
+
+
+def _new_row(
+    user_id: str,
+    content_type: Optional[str],
+    receipt_date: Optional[date],
+    ocr_status: str,
+    digest: Optional[str] = None,
+    thumbnail: bool = False,
+) -> dict:
+    receipt_id = str(uuid.uuid4())
+    return {
+        "id": receipt_id,
+        "user_id": user_id,
+        "receipt_date": receipt_date.isoformat() if receipt_date else None,
+        "ocr_status": ocr_status,
+        "storage_path": _storage_path(user_id, receipt_id, content_type),
+        "thumbnail_path": _thumbnail_path(user_id, receipt_id) if thumbnail else None,
+        "notes": None,
+        "content_hash": digest,
+    }
+
+
+# Storage layout in BUCKET: originals at {user_id}/{receipt_id}.{ext}, thumbnails at
+# {user_id}/thumbs/{receipt_id}.webp (generated reports live under {user_id}/reports/)
+
+def _storage_path(user_id: str, receipt_id: str, content_type: Optional[str]) -> str:
+    return f"{user_id}/{receipt_id}{_extension(content_type)}"
+
+
+def _thumbnail_path(user_id: str, receipt_id: str) -> str:
+    return f"{user_id}/thumbs/{receipt_id}{_extension(THUMBNAIL_CONTENT_TYPE)}"
+
+
+def _object_paths(row: dict) -> list[str]:
+    """Every Storage object of a receipt row: the original and its thumbnail, if any."""
+    return [row["storage_path"], *([row["thumbnail_path"]] if row.get("thumbnail_path") else [])]
+
+
+def _store_image(supabase: Client, storage_path: str, image: ImageSource, content_type: Optional[str]) -> None:
+    with _upload_body(image) as body:
+        supabase.storage.from_(BUCKET).upload(
+            path=storage_path,
+            file=body,
+            file_options={"content-type": content_type or "application/octet-stream"},
+        )
+
+
+def _store_thumbnail(supabase: Client, row: dict, thumbnail: Optional[bytes]) -> None:
+    """Upload a new row's thumbnail. Failure only costs the thumbnail: thumbnail_path is cleared."""
+    if thumbnail is None:
+        return
+    try:
+        _store_image(supabase, row["thumbnail_path"], thumbnail, THUMBNAIL_CONTENT_TYPE)
+    except Exception as e:
+        logger.error("Failed to store thumbnail %s: %s", row["thumbnail_path"], e)
+        row["thumbnail_path"] = None
+
+
+async def _store_image_async(
+    supabase: AsyncClient, storage_path: str, image: ImageSource, content_type: Optional[str]
+) -> None:
+    with _upload_body(image) as body:
+        await supabase.storage.from_(BUCKET).upload(
+            path=storage_path,
+            file=body,
+            file_options={"content-type": content_type or "application/octet-stream"},
+        )
+
+
+@contextmanager
+def _upload_body(image: ImageSource) -> Iterator[bytes | io.FileIO]:
+    """
+    The image as storage3 accepts it: bytes as they are, a spooled upload as a FileIO on
+    its temporary file (a small in-memory spool is moved to disk first), which httpx
+    streams in chunks instead of holding the whole file.
+    """
+    if isinstance(image, bytes):
+        yield image
+        return
+    try:
+        fd = os.dup(image.fileno())
+    except (AttributeError, io.UnsupportedOperation):
+        fd = None  # not backed by a file (e.g. BytesIO)
+    if fd is None:
+        yield _read_all(image)
+        return
+    with io.FileIO(fd, "rb") as body:
+        body.seek(0)
+        yield body
+
+
+async def _store_thumbnail_async(supabase: AsyncClient, row: dict, thumbnail: Optional[bytes]) -> None:
+    if thumbnail is None:
+        return
+    try:
+        await _store_image_async(supabase, row["thumbnail_path"], thumbnail, THUMBNAIL_CONTENT_TYPE)
+    except Exception as e:
+        logger.error("Failed to store thumbnail %s: %s", row["thumbnail_path"], e)
+        row["thumbnail_path"] = None
+
+
+def _remove_objects(supabase: Client, storage_paths: list[str]) -> None:
     try:
-        supabase.storage.from_(BUCKET).remove([storage_path])
+        supabase.storage.from_(BUCKET).remove(storage_paths)
     except Exception as e:
-        logger.error("Failed to delete storage file %s: %s", storage_path, e)
-    supabase.table("receipts").delete().eq("id", receipt_id).eq("user_id", user_id).execute()
+        logger.error("Failed to delete storage files %s: %s", storage_paths, e)
 
 
-def _signed_url(supabase: Client, storage_path: str) -> str:
-    response = supabase.storage.from_(BUCKET).create_signed_url(storage_path, SIGNED_URL_EXPIRY)
-    return response["signedUrl"]
+async def _remove_objects_async(supabase: AsyncClient, storage_paths: list[str]) -> None:
+    try:
+        await supabase.storage.from_(BUCKET).remove(storage_paths)
+    except Exception as e:
+        logger.error("Failed to delete storage files %s: %s", storage_paths, e)
 
 
-def _run_ocr(image_bytes: bytes) -> tuple[Optional[date], str]:
+def _attach_signed_urls(supabase: Client, rows: list[dict], image: bool = True, thumbnail: bool = True) -> None:
+    """
+    Set image_url and thumbnail_url (null without a thumbnail) on every row, with one
+    batched signing call for uncached paths.
+    """
+    paths = _url_paths(rows, image, thumbnail)
+    _set_urls(rows, signed_urls.signed_urls(supabase, BUCKET, paths, SIGNED_URL_EXPIRY), image, thumbnail)
+
+
+async def _attach_signed_urls_async(
+    supabase: AsyncClient, rows: list[dict], image: bool = True, thumbnail: bool = True
+) -> None:
+    paths = _url_paths(rows, image, thumbnail)
+    urls = await signed_urls.signed_urls_async(supabase, BUCKET, paths, SIGNED_URL_EXPIRY)
+    _set_urls(rows, urls, image, thumbnail)
+
+
+def _url_paths(rows: list[dict], image: bool, thumbnail: bool) -> list[str]:
+    paths = [r["storage_path"] for r in rows] if image else []
+    if thumbnail:
+        paths += [r["thumbnail_path"] for r in rows if r.get("thumbnail_path")]
+    return paths
+
+
+def _set_urls(rows: list[dict], urls: dict[str, str], image: bool, thumbnail: bool) -> None:
+    for row in rows:
+        if image:
+            row["image_url"] = urls[row["storage_path"]]
+        if thumbnail:
+            row["thumbnail_url"] = urls[row["thumbnail_path"]] if row.get("thumbnail_path") else None
+
+
+def _list_fields(fields: Optional[list[str]]) -> set[str]:
+    if not fields:
+        return set(RECEIPT_FIELDS)
+    unknown = set(fields) - set(RECEIPT_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return set(fields)
+
+
+def _list_queries(
+    supabase: Client | AsyncClient,
+    user_id: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[list[str]],
+):
+    """(page query, separate count query or None, page size, wanted fields) — not yet executed."""
+    limit = min(limit or settings.receipts_page_size, settings.receipts_max_page_size)
+    wanted = _list_fields(fields)
+    columns = wanted - {"image_url", "thumbnail_url"} | {"id", "receipt_date"}
+    if "image_url" in wanted:
+        columns.add("storage_path")
+    if "thumbnail_url" in wanted:
+        columns.add("thumbnail_path")
+
+    after = _after_cursor(*_decode_cursor(cursor)) if cursor else None
+
+    def _filtered(query):
+        query = query.eq("user_id", user_id)
+        if start_date:
+            query = query.gte("receipt_date", start_date.isoformat())
+        if end_date:
+            query = query.lte("receipt_date", end_date.isoformat())
+        return query
+
+    # The first page counts in the same round trip; later pages need a separate
+    # count because the cursor filter would otherwise shrink it
+    page_query = _filtered(
+        supabase.table("receipts").select(",".join(sorted(columns)), count=None if after else "exact")
+    )
+    count_query = None
+    if after:
+        page_query = page_query.or_(after)
+        count_query = _filtered(supabase.table("receipts").select("id", count="exact", head=True))
+
+    # One extra row tells whether another page exists
+    page_query = (
+        page_query.order("receipt_date", desc=True, nullsfirst=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+    )
+    return page_query, count_query, limit, wanted
+
+
+def _page(data: list[dict], limit: int) -> tuple[list[dict], Optional[str]]:
+    rows = data[:limit]
+    return rows, _encode_cursor(rows[-1]) if len(data) > limit else None
+
+
+def _project(rows: list[dict], wanted: set[str]) -> list[dict]:
+    for row in rows:
+        for extra in row.keys() - wanted:
+            del row[extra]
+    return rows
+
+
+def _first_or_404(data: list[dict]) -> dict:
+    if not data:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Receipt not found")
+    return data[0]
+
+
+def _encode_cursor(row: dict) -> str:
+    raw = json.dumps([row["receipt_date"], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[Optional[str], str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        receipt_date, receipt_id = json.loads(raw)
+        if receipt_date is not None:
+            receipt_date = date.fromisoformat(receipt_date).isoformat()
+        return receipt_date, str(uuid.UUID(receipt_id))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after_cursor(receipt_date: Optional[str], receipt_id: str) -> str:
+    """PostgREST filter for rows after (receipt_date, id) in (date desc nulls first, id desc) order."""
+    if receipt_date is None:
+        return f"receipt_date.not.is.null,and(receipt_date.is.null,id.lt.{receipt_id})"
+    return f"receipt_date.lt.{receipt_date},and(receipt_date.eq.{receipt_date},id.lt.{receipt_id})"
+
+
+def _run_ocr(image_bytes: bytes, digest: Optional[str] = None) -> tuple[Optional[date], str]:
     """
     Attempt OCR date extraction. Always succeeds — returns (date, status).
     Status values: "success" | "no_date_found" | "failed"
     """
     try:
-        extracted = extract_date_from_image(image_bytes)
+        extracted = extract_date_from_image(image_bytes, digest)
         if extracted:
             return extracted, "success"
         return None, "no_date_found"
@@ -142,6 +701,27 @@ def _run_ocr(image_bytes: bytes) -> tuple[Optional[date], str]:
         return None, "failed"
 
 
+def _run_ocr_batch(images: list[bytes], digests: list[str]) -> list[tuple[Optional[date], str]]:
+    """Batch variant of _run_ocr, chunked by OCR_BATCH_SIZE. Same status values, one per image."""
+    results: list[tuple[Optional[date], str]] = []
+    for start in range(0, len(images), settings.ocr_batch_size):
+        chunk = images[start:start + settings.ocr_batch_size]
+        try:
+            extracted = extract_dates_from_images(chunk, digests[start:start + settings.ocr_batch_size])
+        except Exception as e:
+            logger.exception("Batch OCR failed: %s", e)
+            extracted = [e] * len(chunk)
+        for item in extracted:
+            if isinstance(item, Exception):
+                logger.error("OCR failed: %s", item)
+                results.append((None, "failed"))
+            elif item:
+                results.append((item, "success"))
+            else:
+                results.append((None, "no_date_found"))
+    return results
+
+
 def _extension(content_type: Optional[str]) -> str:
     return {
         "image/jpeg": ".jpg",
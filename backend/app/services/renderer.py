@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services import dashboard as dashboard_service
+from app.services.pdf import (
+    PublicHolidayRecord,
+    ReceiptRecord,
+    ReportData,
+    SchedulePeriodRecord,
+    UserHolidayRecord,
+    generate_compliance_report,
+)
+
+logger = logging.getLogger(__name__)
+
+# PDF rendering is pure-Python and CPU-bound, so in the API process it holds the GIL
+# away from every other request. Reports are rendered on a pool of REPORT_RENDERERS
+# worker processes instead; only the compact ReportData records travel to them.
+# Workers are spawned (not forked) so they never inherit the API's threads and locks,
+# and only import app.services.pdf. REPORT_RENDERERS=0 renders in-process.
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start() -> None:
+    global _pool
+    with _lock:
+        if _pool is None and settings.report_renderers > 0:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.report_renderers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+
+def shutdown() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def report_data(user_email: str, year: int, inputs: dict) -> ReportData:
+    """Compliance summary and PDF records for inputs from loaders.load_report_inputs, with signed receipt URLs."""
+    user_settings = inputs["settings"]
+    summary = dashboard_service.compute_summary(
+        year=year,
+        receipt_dates=inputs["receipt_dates"],
+        public_holidays={date.fromisoformat(h["date"]) for h in inputs["public_holidays"]},
+        user_holidays=inputs["user_holiday_intervals"],
+        threshold=user_settings["homeworking_threshold"],
+        working_country_code=user_settings["working_country_code"],
+        working_days=user_settings.get("working_days"),
+        schedule_periods=inputs["schedule_periods"],
+    )
+    return ReportData(
+        user_email=user_email,
+        year=year,
+        generated=date.today(),
+        summary=summary,
+        receipts=tuple(
+            ReceiptRecord(r.get("receipt_date"), r.get("ocr_status") or "-", r.get("image_url") or "")
+            for r in inputs["receipts"]
+        ),
+        public_holidays=tuple(PublicHolidayRecord(h["date"], h["name"]) for h in inputs["public_holidays"]),
+        user_holidays=tuple(
+            UserHolidayRecord(h["start_date"], h["end_date"], h.get("description")) for h in inputs["user_holidays"]
+        ),
+        schedule_periods=tuple(
+            SchedulePeriodRecord(p["start_date"], p.get("end_date"), tuple(p["working_days"]), p.get("description"))
+            for p in inputs["schedule_periods"]
+        ),
+        group_receipts_by_month=settings.report_group_receipts_by_month,
+    )
+
+
+def render(report: ReportData) -> bytes:
+    """The report PDF, rendered on the process pool; 504 after REPORT_RENDER_TIMEOUT seconds."""
+    if settings.report_renderers <= 0:
+        return generate_compliance_report(report)
+    future = _submit(report)
+    try:
+        return future.result(timeout=settings.report_render_timeout)
+    except FutureTimeout:
+        future.cancel()
+        raise _timed_out(report)
+    except BrokenProcessPool:
+        raise _broken()
+
+
+async def render_async(report: ReportData) -> bytes:
+    """render without blocking the event loop."""
+    if settings.report_renderers <= 0:
+        return await run_in_threadpool(generate_compliance_report, report)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(_submit(report)), settings.report_render_timeout)
+    except asyncio.TimeoutError:
+        raise _timed_out(report)
+    except BrokenProcessPool:
+        raise _broken()
+
+
+def _submit(report: ReportData) -> Future:
+    if _pool is None:
+        start()
+    try:
+        return _pool.submit(generate_compliance_report, report)
+    except BrokenProcessPool:
+        # A renderer died (e.g. killed for memory); replace the pool once and retry
+        _discard_pool()
+        start()
+        return _pool.submit(generate_compliance_report, report)
+
+
+def _discard_pool() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed_out(report: ReportData) -> HTTPException:
+    # A render already running keeps its worker until it finishes; queued ones are dropped
+    logger.error("Rendering the %s report (%d receipts) timed out", report.year, len(report.receipts))
+    return HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Report rendering timed out")
+
+
+def _broken() -> HTTPException:
+    logger.error("A report renderer process died; the pool is replaced on the next report")
+    _discard_pool()
+    return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Report rendering failed")
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+from datetime import date
+from typing import Optional
+
+from storage3.exceptions import StorageException
+from supabase import AsyncClient, Client
+
+from app.config import settings
+from app.services import signed_urls
+
+logger = logging.getLogger(__name__)
+
+BUCKET = "receipts"
+
+# Bump whenever the PDF layout or contents change, so cached reports are not reused
+FORMAT_VERSION = 2
+
+# Generated compliance reports are stored in Storage under a fingerprint of everything
+# that goes into them, at {user_id}/reports/{year}/{fingerprint}.pdf. Any change to an
+# input gives a new fingerprint, so a changed report is regenerated and replaces the
+# year's previous artifact; an unchanged one is served as stored, without re-signing
+# receipt URLs or rendering. Background report jobs (report_jobs) store their PDFs here
+# too, whether or not REPORT_CACHE is on, and hand out signed links to them.
+#
+# Generation date policy: a report shows its generation date, and for the current year
+# its forecast depends on today, so it is reused for the day it was generated. Reports
+# for past years only change when their data does; they are reused for the rest of the
+# calendar year in which they were generated, which also keeps their 5-year receipt
+# links at least 4 years from expiry.
+
+
+def generation_key(year: int, today: date) -> str:
+    return today.isoformat() if year >= today.year else f"{today.year}"
+
+
+def fingerprint(user_email: str, year: int, inputs: dict, today: date) -> str:
+    """SHA-256 over the report's inputs (as loaded by loaders.load_report_inputs)."""
+    user_settings = inputs["settings"]
+    payload = {
+        "format": [FORMAT_VERSION, settings.report_group_receipts_by_month],
+        "generated": generation_key(year, today),
+        "user_email": user_email,
+        "year": year,
+        "settings": [
+            user_settings.get("working_country_code"),
+            user_settings.get("homeworking_threshold"),
+            user_settings.get("working_days"),
+        ],
+        "receipts": sorted(
+            (r["id"], r.get("receipt_date"), r.get("ocr_status"), r["storage_path"]) for r in inputs["receipts"]
+        ),
+        "public_holidays": [(h["date"], h["name"], h["local_name"]) for h in inputs["public_holidays"]],
+        "user_holidays": sorted(
+            (h["start_date"], h["end_date"], h.get("description")) for h in inputs["user_holidays"]
+        ),
+        "schedule_periods": sorted(
+            (p["start_date"], p.get("end_date") or "", p["working_days"], p.get("description"))
+            for p in inputs["schedule_periods"]
+        ),
+    }
+    encoded = json.dumps(payload, separators=(",", ":"), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def report_folder(user_id: str, year: int) -> str:
+    return f"{user_id}/reports/{year}"
+
+
+def report_path(user_id: str, year: int, fingerprint: str) -> str:
+    return f"{report_folder(user_id, year)}/{fingerprint}.pdf"
+
+
+def get(supabase: Client, user_id: str, year: int, fingerprint: str) -> Optional[bytes]:
+    """The stored report for this fingerprint, or None (not generated yet, caching off or unreadable)."""
+    if not settings.report_cache:
+        return None
+    try:
+        return supabase.storage.from_(BUCKET).download(report_path(user_id, year, fingerprint))
+    except StorageException:
+        return None
+
+
+async def get_async(supabase: AsyncClient, user_id: str, year: int, fingerprint: str) -> Optional[bytes]:
+    if not settings.report_cache:
+        return None
+    try:
+        return await supabase.storage.from_(BUCKET).download(report_path(user_id, year, fingerprint))
+    except StorageException:
+        return None
+
+
+def put(supabase: Client, user_id: str, year: int, fingerprint: str, pdf_bytes: bytes) -> str:
+    """
+    Store a report, remove the year's previous ones and return its path. Upload errors
+    raise (a report job needs the file); cleanup errors are only logged.
+    """
+    bucket = supabase.storage.from_(BUCKET)
+    path = report_path(user_id, year, fingerprint)
+    bucket.upload(path=path, file=pdf_bytes, file_options={"content-type": "application/pdf", "upsert": "true"})
+    try:
+        folder = report_folder(user_id, year)
+        outdated = [f"{folder}/{f['name']}" for f in bucket.list(folder) if f"{folder}/{f['name']}" != path]
+        if outdated:
+            bucket.remove(outdated)
+            signed_urls.invalidate(BUCKET, outdated)
+    except Exception as e:
+        logger.error("Failed to remove outdated reports in %s: %s", folder, e)
+    return path
+
+
+async def put_async(supabase: AsyncClient, user_id: str, year: int, fingerprint: str, pdf_bytes: bytes) -> None:
+    """Store a report and remove the year's previous ones. Failures only cost a future cache miss."""
+    bucket = supabase.storage.from_(BUCKET)
+    path = report_path(user_id, year, fingerprint)
+    try:
+        await bucket.upload(
+            path=path,
+            file=pdf_bytes,
+            file_options={"content-type": "application/pdf", "upsert": "true"},
+        )
+        folder = report_folder(user_id, year)
+        outdated = [f"{folder}/{f['name']}" for f in await bucket.list(folder) if f"{folder}/{f['name']}" != path]
+        if outdated:
+            await bucket.remove(outdated)
+            signed_urls.invalidate(BUCKET, outdated)
+    except Exception as e:
+        logger.error("Failed to store report %s: %s", path, e)
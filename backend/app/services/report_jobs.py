@@ -0,0 +1,193 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from storage3.exceptions import StorageException
+from supabase import AsyncClient, Client
+
+from app.config import settings
+from app.db.supabase import get_supabase_admin
+from app.services import loaders, renderer, report_cache, signed_urls
+from app.services.dashboard import DEFAULT_SETTINGS
+from app.services.pdf import REPORT_SIGNED_URL_EXPIRY
+
+logger = logging.getLogger(__name__)
+
+TABLE = "report_jobs"
+
+# Background report generation: POST /report/jobs stores a "queued" report_jobs row and
+# hands its id here. A worker claims it ("running"), records its stage and progress as
+# it goes, and stores the PDF through report_cache, so an unchanged report is neither
+# rendered twice nor stored twice. GET /report/jobs/{id} then hands out a signed link.
+_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+# Progress (percent) once a stage starts
+_STAGES = {"loading": 5, "signing": 30, "rendering": 50, "storing": 90}
+
+
+def start() -> None:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.report_workers, thread_name_prefix="report")
+
+
+def shutdown() -> None:
+    """Stop accepting jobs and wait for running ones; queued jobs stay queued for recovery."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def submit(job_id: str) -> None:
+    if _pool is None:
+        start()
+    _pool.submit(_process, job_id)
+
+
+async def create_async(supabase: AsyncClient, user_id: str, user_email: str, year: int) -> dict:
+    """
+    Queue a report for the year, or return the user's queued/running job for it.
+    Users get at most REPORT_MAX_ACTIVE_JOBS queued or running jobs (429 beyond that).
+    """
+    active = (await _active_query(supabase, user_id).execute()).data
+    for job in active:
+        if job["year"] == year:
+            return {**job, "download_url": None}
+    if len(active) >= settings.report_max_active_jobs:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"At most {settings.report_max_active_jobs} report jobs can be queued at once",
+        )
+
+    job = (
+        await supabase.table(TABLE)
+        .insert({"user_id": user_id, "user_email": user_email, "year": year, "status": "queued", "progress": 0})
+        .execute()
+    ).data[0]
+    submit(job["id"])
+    return {**job, "download_url": None}
+
+
+async def get_async(supabase: AsyncClient, user_id: str, job_id: str) -> dict:
+    """
+    The user's job; finished jobs get a signed `download_url` to the PDF. A finished job
+    whose PDF was since replaced by a newer report for the year returns 410.
+    """
+    rows = (await supabase.table(TABLE).select("*").eq("id", job_id).eq("user_id", user_id).execute()).data
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
+    job = rows[0]
+    job["download_url"] = None
+    if job["status"] == "done":
+        try:
+            # Signed URLs are cached per process, and another instance may have replaced
+            # the PDF meanwhile: only sign (or reuse a URL) for an object still stored
+            if await supabase.storage.from_(report_cache.BUCKET).exists(job["storage_path"]):
+                job["download_url"] = await signed_urls.signed_url_async(
+                    supabase, report_cache.BUCKET, job["storage_path"], REPORT_SIGNED_URL_EXPIRY
+                )
+        except StorageException:
+            pass
+        if job["download_url"] is None:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="The report was replaced by a newer one; create a new job",
+            )
+    return job
+
+
+def recover_pending() -> int:
+    """
+    Re-queue jobs left queued or running by a process that crashed or was stopped: those
+    without progress for REPORT_JOB_LEASE seconds. Running jobs record every stage, so a
+    younger one is still being worked on, possibly by another instance, and is left
+    alone. Runs at startup and then periodically; a job re-queued twice is still only
+    claimed once.
+    """
+    supabase = get_supabase_admin()
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=settings.report_job_lease)).isoformat()
+    reset = (
+        supabase.table(TABLE)
+        .update({"status": "queued", **_touched()})
+        .eq("status", "running")
+        .lt("updated_at", cutoff)
+        .execute()
+    ).data
+    queued = (
+        supabase.table(TABLE)
+        .select("id")
+        .eq("status", "queued")
+        .lt("updated_at", cutoff)
+        .order("created_at")
+        .execute()
+    ).data
+    rows = [*reset, *queued]
+    for row in rows:
+        submit(row["id"])
+    if rows:
+        logger.info("Re-queued %d report jobs", len(rows))
+    return len(rows)
+
+
+def _process(job_id: str) -> None:
+    supabase = get_supabase_admin()
+    # Claim the job; another worker (or a duplicate submit after recovery) may have it
+    claimed = (
+        supabase.table(TABLE)
+        .update({"status": "running", "stage": "loading", "progress": _STAGES["loading"], **_touched()})
+        .eq("id", job_id)
+        .eq("status", "queued")
+        .execute()
+    ).data
+    if not claimed:
+        return
+    job = claimed[0]
+
+    try:
+        storage_path = _generate(supabase, job, DEFAULT_SETTINGS)
+    except Exception as e:
+        logger.exception("Report job %s failed: %s", job_id, e)
+        error = e.detail if isinstance(e, HTTPException) else "Report generation failed"
+        _update(supabase, job_id, status="failed", error=error)
+        return
+    _update(supabase, job_id, status="done", stage=None, progress=100, storage_path=storage_path)
+
+
+def _generate(supabase: Client, job: dict, defaults: dict) -> str:
+    """GET /report's work for a job: returns the Storage path of the (possibly cached) PDF."""
+    user_id, user_email, year = job["user_id"], job["user_email"], job["year"]
+    inputs, calls = loaders.load_report_inputs(supabase, user_id, year, defaults, None)
+
+    fingerprint = report_cache.fingerprint(user_email, year, inputs, date.today())
+    if report_cache.get(supabase, user_id, year, fingerprint) is not None:
+        return report_cache.report_path(user_id, year, fingerprint)
+
+    _stage(supabase, job["id"], "signing")
+    loaders.sign_receipt_urls(supabase, inputs["receipts"], REPORT_SIGNED_URL_EXPIRY, calls)
+    _stage(supabase, job["id"], "rendering")
+    pdf_bytes = renderer.render(renderer.report_data(user_email, year, inputs))
+    _stage(supabase, job["id"], "storing")
+    return report_cache.put(supabase, user_id, year, fingerprint, pdf_bytes)
+
+
+def _active_query(supabase: AsyncClient, user_id: str):
+    return supabase.table(TABLE).select("*").eq("user_id", user_id).in_("status", ["queued", "running"])
+
+
+def _stage(supabase: Client, job_id: str, stage: str) -> None:
+    _update(supabase, job_id, stage=stage, progress=_STAGES[stage])
+
+
+def _update(supabase: Client, job_id: str, **values) -> None:
+    supabase.table(TABLE).update({**values, **_touched()}).eq("id", job_id).execute()
+
+
+def _touched() -> dict:
+    return {"updated_at": datetime.now(timezone.utc).isoformat()}
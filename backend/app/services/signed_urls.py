@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+
+from supabase import AsyncClient, Client
+
+from app.config import settings
+
+# Signed URLs are pure functions of (bucket, path, expiry) until they expire, so a URL
+# signed for one request can be handed out again as long as enough of its lifetime is
+# left. Entries are keyed per expiry: report links (years) never stand in for list
+# links (an hour) or vice versa.
+
+_cache: OrderedDict[tuple[str, str, int], tuple[str, float]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def signed_url(supabase: Client, bucket: str, storage_path: str, expires_in: int) -> str:
+    return signed_urls(supabase, bucket, [storage_path], expires_in)[storage_path]
+
+
+def signed_urls(supabase: Client, bucket: str, storage_paths: list[str], expires_in: int) -> dict[str, str]:
+    """
+    Signed URL per storage path. Cached URLs with at least
+    SIGNED_URL_REUSE_FRACTION of their lifetime left are reused; the rest are signed
+    with a single create_signed_urls call.
+    """
+    urls, missing, expires_at = _cached(bucket, storage_paths, expires_in)
+    if not missing:
+        return urls
+
+    bucket_api = supabase.storage.from_(bucket)
+    signed: dict[str, str] = {}
+    if len(missing) > 1:
+        signed = _batch_results(bucket_api.create_signed_urls(missing, expires_in))
+    # Single paths, and any the batch endpoint rejected, go through the per-object
+    # endpoint so errors surface exactly as they did before batching
+    for path in missing:
+        if path not in signed:
+            signed[path] = bucket_api.create_signed_url(path, expires_in)["signedUrl"]
+
+    _remember(bucket, signed, expires_in, expires_at)
+    urls.update(signed)
+    return urls
+
+
+async def signed_url_async(supabase: AsyncClient, bucket: str, storage_path: str, expires_in: int) -> str:
+    return (await signed_urls_async(supabase, bucket, [storage_path], expires_in))[storage_path]
+
+
+async def signed_urls_async(
+    supabase: AsyncClient, bucket: str, storage_paths: list[str], expires_in: int
+) -> dict[str, str]:
+    """signed_urls for the async client; shares the same URL cache."""
+    urls, missing, expires_at = _cached(bucket, storage_paths, expires_in)
+    if not missing:
+        return urls
+
+    bucket_api = supabase.storage.from_(bucket)
+    signed: dict[str, str] = {}
+    if len(missing) > 1:
+        signed = _batch_results(await bucket_api.create_signed_urls(missing, expires_in))
+    for path in missing:
+        if path not in signed:
+            signed[path] = (await bucket_api.create_signed_url(path, expires_in))["signedUrl"]
+
+    _remember(bucket, signed, expires_in, expires_at)
+    urls.update(signed)
+    return urls
+
+
+def invalidate(bucket: str, storage_paths: list[str]) -> None:
+    """Forget URLs for deleted objects."""
+    paths = set(storage_paths)
+    with _lock:
+        for key in [k for k in _cache if k[0] == bucket and k[1] in paths]:
+            del _cache[key]
+
+
+def _cached(bucket: str, storage_paths: list[str], expires_in: int) -> tuple[dict[str, str], list[str], float]:
+    """(reusable URLs, paths still to sign, expiry timestamp for URLs signed now)."""
+    now = time.time()
+    min_remaining = expires_in * settings.signed_url_reuse_fraction
+    urls: dict[str, str] = {}
+    missing: list[str] = []
+    with _lock:
+        for path in dict.fromkeys(storage_paths):
+            key = (bucket, path, expires_in)
+            entry = _cache.get(key)
+            if entry is not None and entry[1] - now >= min_remaining:
+                _cache.move_to_end(key)
+                urls[path] = entry[0]
+            else:
+                missing.append(path)
+    return urls, missing, now + expires_in
+
+
+def _batch_results(items: list[dict]) -> dict[str, str]:
+    return {item["path"]: item["signedURL"] for item in items if not item.get("error") and item.get("signedURL")}
+
+
+def _remember(bucket: str, signed: dict[str, str], expires_in: int, expires_at: float) -> None:
+    with _lock:
+        for path, url in signed.items():
+            _cache[(bucket, path, expires_in)] = (url, expires_at)
+        while len(_cache) > settings.signed_url_cache_size:
+            _cache.popitem(last=False)
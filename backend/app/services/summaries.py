@@ -0,0 +1,284 @@
+import logging
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+
+from supabase import AsyncClient, Client
+
+from app.services import dashboard as dashboard_service
+from app.services import loaders, workdays
+
+logger = logging.getLogger(__name__)
+
+TABLE = "dashboard_summaries"
+
+# Materialized dashboard summaries. One dashboard_summaries row per (user, year) holds
+# the year's working-day and receipt-day bitsets (see workdays) and the settings they
+# were built with, so GET /dashboard reads one row and only applies "today". Writes keep
+# rows current: receipt changes flip single bits, holiday/schedule/settings edits mark
+# the affected years stale and the next read rebuilds them from the source tables.
+#
+# Every row write sets a new `revision` and is conditional on the revision the writer
+# read (compare-and-set). A rebuild that raced with an edit therefore never stores
+# pre-edit data: the edit changed the revision, the rebuild's write matches nothing and
+# the row stays stale. First builds insert a stale placeholder before loading for the
+# same reason.
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+
+def get_summary(supabase: Client, user_id: str, year: int, defaults: dict) -> tuple[dict, str]:
+    """The year's summary and a Server-Timing value. Missing or stale rows are rebuilt first."""
+    started = time.perf_counter()
+    rows = _row_query(supabase, user_id, year).execute().data
+    if rows and not rows[0]["stale"]:
+        return _summary(rows[0], year), _row_timing(started)
+
+    revision = rows[0]["revision"] if rows else _claim(supabase, user_id, year)
+    inputs, calls = loaders.load_summary_inputs(supabase, user_id, year, defaults)
+    built = _built(year, inputs)
+    if not _update_query(supabase, user_id, year, revision, {**built, "stale": False}).execute().data:
+        logger.info("Summary %s/%s changed while rebuilding; left stale", user_id, year)
+    return _summary(built, year), calls.server_timing()
+
+
+async def get_summary_async(supabase: AsyncClient, user_id: str, year: int, defaults: dict) -> tuple[dict, str]:
+    """get_summary on the async client."""
+    started = time.perf_counter()
+    rows = (await _row_query(supabase, user_id, year).execute()).data
+    if rows and not rows[0]["stale"]:
+        return _summary(rows[0], year), _row_timing(started)
+
+    revision = rows[0]["revision"] if rows else await _claim_async(supabase, user_id, year)
+    inputs, calls = await loaders.load_summary_inputs_async(supabase, user_id, year, defaults)
+    built = _built(year, inputs)
+    if not (await _update_query(supabase, user_id, year, revision, {**built, "stale": False}).execute()).data:
+        logger.info("Summary %s/%s changed while rebuilding; left stale", user_id, year)
+    return _summary(built, year), calls.server_timing()
+
+
+def rebuild(supabase: Client, user_id: str, year: int, defaults: dict) -> dict:
+    """Recompute a stored summary from the source tables, whatever its state."""
+    invalidate(supabase, user_id, year, year)
+    return get_summary(supabase, user_id, year, defaults)[0]
+
+
+# ── Writes that affect summaries (call after the source table write) ─────────
+#
+# These never raise: the source write has already happened, so failing the request
+# would only invite a retry of it. A failed bit flip marks the affected years stale
+# instead; if marking stale fails too, the error names the repair command.
+
+def receipts_changed(
+    supabase: Client,
+    user_id: str,
+    added: Iterable[Optional[date]] = (),
+    removed: Iterable[Optional[date]] = (),
+) -> None:
+    """
+    Flip receipt-day bits after receipts were created, deleted or re-dated: a day gains
+    its bit with its first receipt and loses it with its last one.
+    """
+    added, removed = _dates(added), _dates(removed)
+    try:
+        if removed:
+            removed -= _dates_of(_remaining_query(supabase, user_id, removed).execute().data)
+        for year, (gained, lost) in _by_year(added, removed).items():
+            rows = _row_query(supabase, user_id, year).execute().data
+            if not rows:
+                continue  # built from the receipts table on first read
+            if rows[0]["stale"] or not _flip_query(supabase, user_id, year, rows[0], gained, lost).execute().data:
+                invalidate(supabase, user_id, year, year)
+    except Exception as e:
+        logger.error("Failed to update dashboard summaries for %s: %s", user_id, e)
+        first, last = _year_span(added | removed)
+        try:
+            invalidate(supabase, user_id, first, last)
+        except Exception as e:
+            _log_repair(user_id, e)
+
+
+async def receipts_changed_async(
+    supabase: AsyncClient,
+    user_id: str,
+    added: Iterable[Optional[date]] = (),
+    removed: Iterable[Optional[date]] = (),
+) -> None:
+    added, removed = _dates(added), _dates(removed)
+    try:
+        if removed:
+            removed -= _dates_of((await _remaining_query(supabase, user_id, removed).execute()).data)
+        for year, (gained, lost) in _by_year(added, removed).items():
+            rows = (await _row_query(supabase, user_id, year).execute()).data
+            if not rows:
+                continue
+            if rows[0]["stale"] or not (await _flip_query(supabase, user_id, year, rows[0], gained, lost).execute()).data:
+                await invalidate_async(supabase, user_id, year, year)
+    except Exception as e:
+        logger.error("Failed to update dashboard summaries for %s: %s", user_id, e)
+        first, last = _year_span(added | removed)
+        try:
+            await invalidate_async(supabase, user_id, first, last)
+        except Exception as e:
+            _log_repair(user_id, e)
+
+
+def invalidate(
+    supabase: Client, user_id: str, first_year: Optional[int] = None, last_year: Optional[int] = None
+) -> None:
+    """Mark the user's summaries for first_year..last_year stale (None = unbounded on that side)."""
+    _invalidate_query(supabase, user_id, first_year, last_year).execute()
+
+
+async def invalidate_async(
+    supabase: AsyncClient, user_id: str, first_year: Optional[int] = None, last_year: Optional[int] = None
+) -> None:
+    await _invalidate_query(supabase, user_id, first_year, last_year).execute()
+
+
+async def period_changed_async(supabase: AsyncClient, user_id: str, *periods: Optional[dict]) -> None:
+    """Invalidate the years covered by holiday or schedule periods (as rows: start_date, end_date)."""
+    try:
+        for period in periods:
+            if period:
+                start, end = period["start_date"], period.get("end_date")
+                await invalidate_async(supabase, user_id, int(start[:4]), int(end[:4]) if end else None)
+    except Exception as e:
+        _log_repair(user_id, e)
+
+
+async def settings_changed_async(supabase: AsyncClient, user_id: str) -> None:
+    """Invalidate every year: country, threshold and working days apply to all of them."""
+    try:
+        await invalidate_async(supabase, user_id)
+    except Exception as e:
+        _log_repair(user_id, e)
+
+
+# ── Helpers (query builders are shared by the sync and async clients) ─────────
+
+def _row_query(supabase: Client | AsyncClient, user_id: str, year: int):
+    return supabase.table(TABLE).select("*").eq("user_id", user_id).eq("year", year)
+
+
+def _update_query(supabase: Client | AsyncClient, user_id: str, year: int, revision: str, values: dict):
+    """Write `values` only if the row still has `revision`; the write gets a new one."""
+    return (
+        supabase.table(TABLE)
+        .update({**values, **_new_revision()})
+        .eq("user_id", user_id)
+        .eq("year", year)
+        .eq("revision", revision)
+    )
+
+
+def _invalidate_query(
+    supabase: Client | AsyncClient, user_id: str, first_year: Optional[int], last_year: Optional[int]
+):
+    query = supabase.table(TABLE).update({"stale": True, **_new_revision()}).eq("user_id", user_id)
+    if first_year is not None:
+        query = query.gte("year", first_year)
+    if last_year is not None:
+        query = query.lte("year", last_year)
+    return query
+
+
+def _claim_query(supabase: Client | AsyncClient, user_id: str, year: int, revision: str):
+    placeholder = {"user_id": user_id, "year": year, "stale": True, "revision": revision}
+    return supabase.table(TABLE).upsert(placeholder, on_conflict="user_id,year", ignore_duplicates=True)
+
+
+def _claim(supabase: Client, user_id: str, year: int) -> str:
+    """Insert a stale placeholder for a first build; returns the revision to build against."""
+    revision = str(uuid.uuid4())
+    if _claim_query(supabase, user_id, year, revision).execute().data:
+        return revision
+    # Another request created the row first
+    return _row_query(supabase, user_id, year).execute().data[0]["revision"]
+
+
+async def _claim_async(supabase: AsyncClient, user_id: str, year: int) -> str:
+    revision = str(uuid.uuid4())
+    if (await _claim_query(supabase, user_id, year, revision).execute()).data:
+        return revision
+    return (await _row_query(supabase, user_id, year).execute()).data[0]["revision"]
+
+
+def _remaining_query(supabase: Client | AsyncClient, user_id: str, days: set[date]):
+    return (
+        supabase.table("receipts")
+        .select("receipt_date")
+        .eq("user_id", user_id)
+        .in_("receipt_date", sorted(d.isoformat() for d in days))
+    )
+
+
+def _flip_query(
+    supabase: Client | AsyncClient, user_id: str, year: int, row: dict, gained: set[date], lost: set[date]
+):
+    mask = (int(row["receipt_mask"], 16) | workdays.dates_mask(year, gained)) & ~workdays.dates_mask(year, lost)
+    return _update_query(supabase, user_id, year, row["revision"], {"receipt_mask": f"{mask:x}"})
+
+
+def _new_revision() -> dict:
+    return {"revision": str(uuid.uuid4()), "updated_at": datetime.now(timezone.utc).isoformat()}
+
+
+def _built(year: int, inputs: dict) -> dict:
+    settings = inputs["settings"]
+    working = dashboard_service.working_mask(
+        year,
+        inputs["public_holidays"],
+        inputs["user_holiday_intervals"],
+        settings.get("working_days"),
+        inputs["schedule_periods"],
+    )
+    return {
+        "working_mask": f"{working:x}",
+        "receipt_mask": f"{workdays.dates_mask(year, inputs['receipt_dates']):x}",
+        "homeworking_threshold": settings["homeworking_threshold"],
+        "working_country_code": settings["working_country_code"],
+    }
+
+
+def _summary(row: dict, year: int) -> dict:
+    return dashboard_service.summarize(
+        year,
+        int(row["working_mask"], 16),
+        int(row["receipt_mask"], 16),
+        row["homeworking_threshold"],
+        row["working_country_code"],
+    )
+
+
+def _row_timing(started: float) -> str:
+    return f"summary_row;dur={(time.perf_counter() - started) * 1000:.1f}"
+
+
+def _log_repair(user_id: str, error: Exception) -> None:
+    logger.error(
+        "Dashboard summaries for %s may be out of date; repair with "
+        "python -m app.commands.rebuild_summaries --user %s: %s", user_id, user_id, error,
+    )
+
+
+def _year_span(days: set[date]) -> tuple[Optional[int], Optional[int]]:
+    return (min(d.year for d in days), max(d.year for d in days)) if days else (None, None)
+
+
+def _dates(values: Iterable) -> set[date]:
+    return {date.fromisoformat(v) if isinstance(v, str) else v for v in values if v}
+
+
+def _dates_of(rows: list[dict]) -> set[date]:
+    return _dates(r["receipt_date"] for r in rows)
+
+
+def _by_year(added: set[date], removed: set[date]) -> dict[int, tuple[set[date], set[date]]]:
+    changes: dict[int, tuple[set[date], set[date]]] = {}
+    for d in added:
+        changes.setdefault(d.year, (set(), set()))[0].add(d)
+    for d in removed:
+        changes.setdefault(d.year, (set(), set()))[1].add(d)
+    return changes
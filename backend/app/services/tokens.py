@@ -0,0 +1,70 @@
+from functools import lru_cache
+from typing import Optional
+
+import jwt
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.models.auth import AuthenticatedUser
+
+# Supabase signs with HS256 (legacy shared secret) or asymmetric keys published as a JWKS
+_ASYMMETRIC_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+
+
+@lru_cache
+def _jwks_client() -> jwt.PyJWKClient:
+    """Process-wide JWKS client. Keys are cached and re-fetched when an unknown `kid` shows up."""
+    return jwt.PyJWKClient(
+        f"{_auth_url()}/.well-known/jwks.json",
+        cache_keys=True,
+        lifespan=settings.jwks_cache_ttl,
+        timeout=5,
+    )
+
+
+def _auth_url() -> str:
+    """Supabase Auth's base URL, which is also the tokens' `iss` (SUPABASE_URL may end in a slash)."""
+    return f"{settings.supabase_url.rstrip('/')}/auth/v1"
+
+
+def _signing_key(token: str, algorithm: str):
+    if algorithm == "HS256":
+        if not settings.supabase_jwt_secret:
+            raise jwt.InvalidTokenError("HS256 token but no SUPABASE_JWT_SECRET configured")
+        return settings.supabase_jwt_secret
+    if algorithm in _ASYMMETRIC_ALGORITHMS:
+        return _jwks_client().get_signing_key_from_jwt(token).key
+    raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm {algorithm}")
+
+
+def verify_access_token(token: str) -> Optional[AuthenticatedUser]:
+    """
+    Validate a Supabase access token in-process (signature, exp, aud, iss).
+    Returns None when the token can't be verified locally so the caller can fall
+    back to Supabase Auth; raises 401 for tokens that are definitively expired.
+    """
+    try:
+        algorithm = jwt.get_unverified_header(token).get("alg", "")
+        claims = jwt.decode(
+            token,
+            _signing_key(token, algorithm),
+            algorithms=[algorithm],
+            audience=settings.supabase_jwt_audience,
+            issuer=_auth_url(),
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except (jwt.PyJWTError, ValueError):
+        return None
+
+    return AuthenticatedUser(
+        id=claims["sub"],
+        email=claims.get("email"),
+        role=claims.get("role"),
+        aud=claims.get("aud") if isinstance(claims.get("aud"), str) else None,
+    )
@@ -0,0 +1,79 @@
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Optional
+
+# Whole-year calendars as bitsets: bit i of a Python int is day i of the year
+# (bit 0 = 1 January). Set operations on a year become a handful of integer
+# and/or/not operations and counting is int.bit_count(), instead of a Python
+# loop and a set per day.
+
+
+def days_in_year(year: int) -> int:
+    return (date(year + 1, 1, 1) - date(year, 1, 1)).days
+
+
+def day_index(year: int, d: date) -> int:
+    return (d - date(year, 1, 1)).days
+
+
+def full_mask(year: int) -> int:
+    return (1 << days_in_year(year)) - 1
+
+
+@lru_cache(maxsize=64)
+def _weekday_bits(year: int) -> tuple[int, ...]:
+    """One mask per weekday (0 = Monday) with the bits of every such day in the year."""
+    n = days_in_year(year)
+    first = date(year, 1, 1).weekday()
+    return tuple(sum(1 << i for i in range((w - first) % 7, n, 7)) for w in range(7))
+
+
+def weekday_mask(year: int, weekdays: Iterable[int]) -> int:
+    bits = _weekday_bits(year)
+    mask = 0
+    for w in set(weekdays):
+        if 0 <= w <= 6:
+            mask |= bits[w]
+    return mask
+
+
+def range_mask(year: int, start: Optional[date], end: Optional[date]) -> int:
+    """Days from start to end inclusive (None = open-ended), clipped to the year."""
+    first = max(day_index(year, start), 0) if start else 0
+    last = min(day_index(year, end), days_in_year(year) - 1) if end else days_in_year(year) - 1
+    if last < first:
+        return 0
+    return ((1 << (last - first + 1)) - 1) << first
+
+
+def dates_mask(year: int, dates: Iterable[date]) -> int:
+    """Bits for the given dates that fall inside the year; others are ignored."""
+    mask = 0
+    for d in dates:
+        if d.year == year:
+            mask |= 1 << day_index(year, d)
+    return mask
+
+
+def until_mask(year: int, last_day: date) -> int:
+    """Days of the year up to and including last_day."""
+    return range_mask(year, None, last_day) if last_day >= date(year, 1, 1) else 0
+
+
+def schedule_mask(
+    year: int,
+    default_weekdays: Iterable[int],
+    periods: list[tuple[date, Optional[date], set[int]]],
+) -> int:
+    """
+    Scheduled working weekdays over the year. `periods` are (start, end, weekdays)
+    sorted most recent first, where the first period covering a day wins; applying
+    them oldest first as range overwrites gives the same result.
+    """
+    mask = weekday_mask(year, default_weekdays)
+    for start, end, weekdays in reversed(periods):
+        span = range_mask(year, start, end)
+        if span:
+            mask = (mask & ~span) | (weekday_mask(year, weekdays) & span)
+    return mask
+
@@ -0,0 +1,7 @@
+"""Micro-benchmarks for the API hot paths. Run from backend/: python -m benchmarks.<name>"""
+import os
+
+# Settings() requires these; benchmarks never talk to a real project
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
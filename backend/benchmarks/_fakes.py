@@ -0,0 +1,285 @@
+"""Minimal in-memory stand-ins for the Supabase client, enough to drive the services offline."""
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from storage3.exceptions import StorageException
+
+
+class _Query:
+    def __init__(self, store: "FakeSupabase", table: str):
+        self._store = store
+        self._table = table
+        self._filters = []
+        self._op = ("select", None)
+        self._order = []
+        self._limit = None
+        self._offset = 0
+        self._head = False
+
+    # ── builders ──
+    def select(self, columns="*", count=None, head=None):
+        self._op = ("select", columns)
+        self._head = head
+        return self
+
+    def insert(self, rows):
+        self._op = ("insert", rows if isinstance(rows, list) else [rows])
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        keys = on_conflict.split(",") if on_conflict else []
+        self._op = ("upsert", (rows if isinstance(rows, list) else [rows], keys, ignore_duplicates))
+        return self
+
+    def update(self, values):
+        self._op = ("update", values)
+        return self
+
+    def delete(self):
+        self._op = ("delete", None)
+        return self
+
+    def eq(self, col, value):
+        self._filters.append(lambda r: str(r.get(col)) == str(value))
+        return self
+
+    def in_(self, col, values):
+        values = {str(v) for v in values}
+        self._filters.append(lambda r: str(r.get(col)) in values)
+        return self
+
+    def gte(self, col, value):
+        self._filters.append(lambda r: r.get(col) is not None and r.get(col) >= value)
+        return self
+
+    def lte(self, col, value):
+        self._filters.append(lambda r: r.get(col) is not None and r.get(col) <= value)
+        return self
+
+    def lt(self, col, value):
+        self._filters.append(lambda r: r.get(col) is not None and r.get(col) < value)
+        return self
+
+    def gt(self, col, value):
+        self._filters.append(lambda r: r.get(col) is not None and r.get(col) > value)
+        return self
+
+    def is_(self, col, value):
+        self._filters.append(lambda r: r.get(col) is None)
+        return self
+
+    def or_(self, expr):
+        self._filters.append(_parse_or(expr))
+        return self
+
+    def order(self, col, desc=False, nullsfirst=None):
+        self._order.append((col, desc, desc if nullsfirst is None else nullsfirst))
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def range(self, start, end):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    # ── execution ──
+    def execute(self):
+        self._store.latency()
+        rows = self._store.tables.setdefault(self._table, [])
+        op, arg = self._op
+        with self._store.lock:
+            if op == "insert":
+                stamped = [{"id": str(uuid.uuid4()), "created_at": datetime.now(timezone.utc).isoformat(), **r} for r in arg]
+                rows.extend(stamped)
+                return SimpleNamespace(data=[dict(r) for r in stamped], count=None)
+            if op == "upsert":
+                new, keys, ignore_duplicates = arg
+                written = []
+                for r in new:
+                    existing = [x for x in rows if keys and all(str(x.get(k)) == str(r.get(k)) for k in keys)]
+                    if existing and ignore_duplicates:
+                        continue
+                    if existing:
+                        existing[0].update(r)
+                        written.append(dict(existing[0]))
+                    else:
+                        stamped = {"id": str(uuid.uuid4()), "created_at": datetime.now(timezone.utc).isoformat(), **r}
+                        rows.append(stamped)
+                        written.append(dict(stamped))
+                return SimpleNamespace(data=written, count=None)
+            matched = [r for r in rows if all(f(r) for f in self._filters)]
+            if op == "update":
+                for r in matched:
+                    r.update(arg)
+            elif op == "delete":
+                for r in matched:
+                    rows.remove(r)
+            for col, desc, nullsfirst in reversed(self._order):
+                present = sorted((r for r in matched if r.get(col) is not None), key=lambda r: r[col], reverse=desc)
+                nulls = [r for r in matched if r.get(col) is None]
+                matched = nulls + present if nullsfirst else present + nulls
+            count = len(matched)
+            if self._head:
+                return SimpleNamespace(data=[], count=count)
+            if self._limit is not None:
+                matched = matched[self._offset: self._offset + self._limit]
+            if op == "select" and self._store.max_rows is not None:
+                matched = matched[:self._store.max_rows]
+            if op == "select" and arg not in (None, "*"):
+                columns = arg.split(",")
+                return SimpleNamespace(data=[{c: r.get(c) for c in columns} for r in matched], count=count)
+            return SimpleNamespace(data=[dict(r) for r in matched], count=count)
+
+
+def _split_top_level(expr: str) -> list[str]:
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(expr):
+        depth += ch == "("
+        depth -= ch == ")"
+        if ch == "," and depth == 0:
+            parts.append(expr[start:i])
+            start = i + 1
+    parts.append(expr[start:])
+    return parts
+
+
+def _parse_condition(expr: str):
+    """The small PostgREST subset the services use: and(...), eq/lt/gt/lte/gte, is.null, not.is.null."""
+    if expr.startswith("and("):
+        conditions = [_parse_condition(p) for p in _split_top_level(expr[4:-1])]
+        return lambda r: all(c(r) for c in conditions)
+    col, op, value = expr.split(".", 2)
+    if op == "not":
+        return lambda r: r.get(col) is not None
+    if op == "is":
+        return lambda r: r.get(col) is None
+    compare = {
+        "eq": lambda a, b: a == b, "lt": lambda a, b: a < b, "gt": lambda a, b: a > b,
+        "lte": lambda a, b: a <= b, "gte": lambda a, b: a >= b,
+    }[op]
+    return lambda r: r.get(col) is not None and compare(str(r[col]), value)
+
+
+def _parse_or(expr: str):
+    conditions = [_parse_condition(p) for p in _split_top_level(expr)]
+    return lambda r: any(c(r) for c in conditions)
+
+
+class _Bucket:
+    def __init__(self, store: "FakeSupabase", name: str):
+        self._store = store
+        self._name = name
+
+    def upload(self, path, file, file_options=None):
+        self._store.latency()
+        self._store.objects[path] = file if isinstance(file, bytes) else file.read()
+
+    def download(self, path):
+        self._store.latency()
+        if path not in self._store.objects:
+            raise StorageException({"statusCode": 404, "error": "not_found", "message": "Object not found"})
+        return self._store.objects[path]
+
+    def exists(self, path):
+        self._store.latency()
+        return path in self._store.objects
+
+    def list(self, path=None, options=None):
+        self._store.latency()
+        prefix = f"{path.rstrip('/')}/" if path else ""
+        names = [p[len(prefix):] for p in self._store.objects if p.startswith(prefix)]
+        return [{"name": name} for name in names if "/" not in name]
+
+    def remove(self, paths):
+        self._store.latency()
+        for p in paths:
+            self._store.objects.pop(p, None)
+
+    def create_signed_url(self, path, expires_in):
+        self._store.latency()
+        return {"signedUrl": f"https://fake/{self._name}/{path}?exp={expires_in}"}
+
+    def create_signed_urls(self, paths, expires_in):
+        self._store.latency()
+        return [
+            {"path": p, "error": None, "signedURL": url, "signedUrl": url}
+            for p in paths
+            for url in [f"https://fake/{self._name}/{p}?exp={expires_in}"]
+        ]
+
+
+class FakeSupabase:
+    """
+    Thread-safe enough for benchmarks; `latency_ms` simulates one upstream round trip per
+    call and `max_rows` PostgREST's cap on the rows one response returns.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, max_rows: int | None = None):
+        self.tables: dict[str, list[dict]] = {}
+        self.objects: dict[str, bytes] = {}
+        self.lock = threading.RLock()
+        self.latency_ms = latency_ms
+        self.max_rows = max_rows
+        self.calls = 0
+        self.storage = SimpleNamespace(from_=lambda name: _Bucket(self, name))
+
+    def latency(self):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+
+class AsyncFakeSupabase:
+    """Async facade over a FakeSupabase: same data, upstream latency awaited instead of slept."""
+
+    def __init__(self, store: FakeSupabase):
+        self._store = store
+        self._view = _AwaitedLatency(store)
+        self.storage = SimpleNamespace(from_=lambda name: _AsyncProxy(store, _Bucket(self._view, name)))
+
+    def table(self, name: str) -> "_AsyncProxy":
+        return _AsyncProxy(self._store, _Query(self._view, name))
+
+
+class _AwaitedLatency:
+    """The store as seen by async calls: counts round trips, leaves the waiting to _AsyncProxy."""
+
+    def __init__(self, store: FakeSupabase):
+        self._store = store
+
+    def __getattr__(self, name):
+        return getattr(self._store, name)
+
+    def latency(self):
+        self._store.calls += 1
+
+
+class _AsyncProxy:
+    _TERMINAL = {"execute", "upload", "download", "exists", "list", "remove", "create_signed_url", "create_signed_urls"}
+
+    def __init__(self, store: FakeSupabase, target):
+        self._store = store
+        self._target = target
+
+    def __getattr__(self, name):
+        method = getattr(self._target, name)
+        if name not in self._TERMINAL:
+            def build(*args, **kwargs):
+                method(*args, **kwargs)
+                return self
+            return build
+
+        async def call(*args, **kwargs):
+            if self._store.latency_ms:
+                await asyncio.sleep(self._store.latency_ms / 1000)
+            return method(*args, **kwargs)
+        return call
@@ -0,0 +1,81 @@
+"""
+Concurrent GET /receipts and dashboard summaries: `def` endpoints (service calls run on
+Starlette's threadpool, 40 threads by default) vs `async def` endpoints on the async
+client. Each upstream call takes the simulated latency; with more requests in flight
+than threads, the sync path queues while the async path overlaps every wait.
+
+    python -m benchmarks.async_endpoints [concurrent requests] [simulated upstream latency ms]
+"""
+import asyncio
+import sys
+import time
+import uuid
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services import loaders, receipts
+from app.services.dashboard import DEFAULT_SETTINGS
+from benchmarks._fakes import AsyncFakeSupabase, FakeSupabase
+
+YEAR = 2025
+USER_ID = str(uuid.uuid4())
+
+
+def _seed(supabase: FakeSupabase) -> None:
+    supabase.tables["user_settings"] = [{**DEFAULT_SETTINGS, "user_id": USER_ID}]
+    supabase.tables["receipts"] = [
+        {"id": str(uuid.uuid4()), "user_id": USER_ID, "storage_path": f"{USER_ID}/{i}.jpg",
+         "receipt_date": f"{YEAR}-{i % 12 + 1:02d}-{i % 28 + 1:02d}", "ocr_status": "success"}
+        for i in range(300)
+    ]
+    supabase.tables["user_holidays"] = []
+    supabase.tables["work_schedule_periods"] = []
+
+
+# ── Previous implementation (baseline) ────────────────────────────────────────
+
+def legacy_list_receipts(supabase: FakeSupabase, user_id: str) -> dict:
+    # The former sync list_receipts: first page, all fields, on the sync client
+    page_query, _, limit, wanted = receipts._list_queries(supabase, user_id, None, None, None, None, None)
+    result = page_query.execute()
+    rows, next_cursor = receipts._page(result.data, limit)
+    receipts._attach_signed_urls(supabase, rows)
+    return {"receipts": receipts._project(rows, wanted), "total": result.count, "next_cursor": next_cursor}
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+async def _sync_request(supabase: FakeSupabase) -> None:
+    await run_in_threadpool(legacy_list_receipts, supabase, USER_ID)
+    await run_in_threadpool(loaders.load_summary_inputs, supabase, USER_ID, YEAR, DEFAULT_SETTINGS)
+
+
+async def _async_request(supabase: AsyncFakeSupabase) -> None:
+    await receipts.list_receipts_async(supabase, USER_ID, limit=settings.receipts_page_size)
+    await loaders.load_summary_inputs_async(supabase, USER_ID, YEAR, DEFAULT_SETTINGS)
+
+
+async def _run(request, client, concurrency: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(request(client) for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    store = FakeSupabase(latency_ms=latency)
+    _seed(store)
+
+    before = asyncio.run(_run(_sync_request, store, concurrency))
+    after = asyncio.run(_run(_async_request, AsyncFakeSupabase(store), concurrency))
+    print(f"{concurrency} concurrent requests, {latency:.0f} ms per upstream call")
+    print(f"def endpoints (threadpool) : {before * 1e3:8.1f} ms  ({concurrency / before:7.1f} req/s)")
+    print(f"async def endpoints        : {after * 1e3:8.1f} ms  ({concurrency / after:7.1f} req/s)")
+    loaders.shutdown()
+
+
+if __name__ == "__main__":
+    main()
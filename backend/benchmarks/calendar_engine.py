@@ -0,0 +1,43 @@
+"""
+compute_summary on whole-year bitsets vs the previous per-day Python loop.
+
+Times both across users with many schedule periods and a long holiday history; that
+they agree is tests/test_calendar_engine.py's job. The previous path flattened every
+holiday period into dates; the current one clips and merges them into intervals for
+the year.
+
+    python -m benchmarks.calendar_engine [schedule periods per user] [holiday periods per user]
+"""
+import random
+import sys
+import time
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services.dashboard import compute_summary, holiday_intervals
+from tests.calendar_reference import legacy, random_case
+
+
+def current(case: dict) -> dict:
+    return compute_summary(**{**case, "user_holidays": holiday_intervals(case["user_holidays"], case["year"])})
+
+
+def main() -> None:
+    n_periods = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    n_holidays = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(20250101)
+
+    users = [random_case(rng, n_periods, n_holidays) for _ in range(100)]
+    for label, fn in (("per-day loop", legacy), ("bitsets", current)):
+        start = time.perf_counter()
+        for case in users:
+            fn(case)
+        elapsed = (time.perf_counter() - start) / len(users)
+        print(
+            f"{label:<13}: {elapsed * 1e3:7.3f} ms per summary "
+            f"({n_periods} schedule periods, {n_holidays} holiday periods over 10 years)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Latency of loading dashboard/report inputs: the previous sequential upstream calls
+vs the concurrent fan-out loader, with a simulated per-call upstream latency.
+Public holidays come from the offline LU calendar, so they cost no round trip.
+
+    python -m benchmarks.dashboard_fanout [simulated upstream latency ms] [requests]
+"""
+import sys
+import time
+import uuid
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services import dashboard as dashboard_service
+from app.services import loaders
+from app.services.dashboard import DEFAULT_SETTINGS
+from app.services.nager import fetch_public_holidays
+from benchmarks._fakes import FakeSupabase
+
+YEAR = 2025
+USER_ID = str(uuid.uuid4())
+
+
+def _seed(supabase: FakeSupabase) -> None:
+    supabase.tables["user_settings"] = [{**DEFAULT_SETTINGS, "user_id": USER_ID}]
+    supabase.tables["receipts"] = [
+        {"id": str(uuid.uuid4()), "user_id": USER_ID, "storage_path": f"{USER_ID}/{i}.jpg",
+         "receipt_date": f"{YEAR}-{i % 12 + 1:02d}-{i % 28 + 1:02d}"}
+        for i in range(120)
+    ]
+    supabase.tables["user_holidays"] = [
+        {"user_id": USER_ID, "start_date": f"{YEAR}-08-01", "end_date": f"{YEAR}-08-15"},
+    ]
+    supabase.tables["work_schedule_periods"] = []
+
+
+def sequential(supabase: FakeSupabase) -> None:
+    user_settings = supabase.table("user_settings").select("*").eq("user_id", USER_ID).execute().data[0]
+    supabase.table("receipts").select("receipt_date").eq("user_id", USER_ID).execute()
+    fetch_public_holidays(YEAR, user_settings["working_country_code"])
+    holidays = supabase.table("user_holidays").select("start_date,end_date").eq("user_id", USER_ID).execute()
+    dashboard_service.holiday_intervals(holidays.data, YEAR)
+    supabase.table("work_schedule_periods").select("*").eq("user_id", USER_ID).execute()
+
+
+def main() -> None:
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    supabase = FakeSupabase(latency_ms=latency)
+    _seed(supabase)
+
+    def timed(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(requests):
+            fn()
+        return (time.perf_counter() - start) / requests * 1000
+
+    before = timed(lambda: sequential(supabase))
+    after = timed(lambda: loaders.load_summary_inputs(supabase, USER_ID, YEAR, DEFAULT_SETTINGS))
+    _, calls = loaders.load_report_inputs(supabase, USER_ID, YEAR, DEFAULT_SETTINGS, 3600)
+    report = timed(lambda: loaders.load_report_inputs(supabase, USER_ID, YEAR, DEFAULT_SETTINGS, 3600))
+    print(f"summary, sequential : {before:7.1f} ms")
+    print(f"summary, fan-out    : {after:7.1f} ms")
+    print(f"report,  fan-out    : {report:7.1f} ms   ({calls.server_timing()})")
+    loaders.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Year-over-year dashboards: one GET /dashboard per year (what the apps did) vs a single
+GET /dashboard/range load. Checks that both give identical per-year summaries, then
+compares upstream calls and wall time against a fake client with simulated latency.
+
+    python -m benchmarks.dashboard_range [years] [simulated upstream latency ms]
+"""
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services import dashboard as dashboard_service
+from app.services import loaders
+from app.services.dashboard import DEFAULT_SETTINGS
+from benchmarks._fakes import AsyncFakeSupabase, FakeSupabase
+
+USER_ID = str(uuid.uuid4())
+
+
+def _seed(supabase: FakeSupabase, first_year: int, last_year: int) -> None:
+    rng = random.Random(7)
+    span = (date(last_year, 12, 31) - date(first_year, 1, 1)).days
+    day = lambda: date(first_year, 1, 1) + timedelta(days=rng.randrange(span))  # noqa: E731
+    supabase.tables["user_settings"] = [{**DEFAULT_SETTINGS, "user_id": USER_ID}]
+    n_years = last_year - first_year + 1
+    supabase.tables["receipts"] = [
+        {"id": str(uuid.uuid4()), "user_id": USER_ID, "receipt_date": day().isoformat()}
+        for _ in range(200 * n_years)
+    ]
+    supabase.tables["user_holidays"] = [
+        {"user_id": USER_ID, "start_date": start.isoformat(),
+         "end_date": (start + timedelta(days=rng.randrange(1, 15))).isoformat()}
+        for start in (day() for _ in range(6 * n_years))
+    ]
+    supabase.tables["work_schedule_periods"] = [
+        {"user_id": USER_ID, "start_date": f"{last_year - 1}-03-01", "end_date": None, "working_days": [0, 1, 2, 3]},
+    ]
+
+
+def _summary(inputs: dict, year: int, pick=lambda value, year: value) -> dict:
+    settings = inputs["settings"]
+    return dashboard_service.compute_summary(
+        year=year,
+        receipt_dates=pick(inputs["receipt_dates"], year),
+        public_holidays=pick(inputs["public_holidays"], year),
+        user_holidays=pick(inputs["user_holiday_intervals"], year),
+        threshold=settings["homeworking_threshold"],
+        working_country_code=settings["working_country_code"],
+        working_days=settings.get("working_days"),
+        schedule_periods=inputs["schedule_periods"],
+    )
+
+
+async def per_year(supabase: AsyncFakeSupabase, years: range) -> list[dict]:
+    summaries = []
+    for year in years:
+        inputs, _ = await loaders.load_summary_inputs_async(supabase, USER_ID, year, DEFAULT_SETTINGS)
+        summaries.append(_summary(inputs, year))
+    return summaries
+
+
+async def ranged(supabase: AsyncFakeSupabase, years: range) -> list[dict]:
+    inputs, _ = await loaders.load_range_inputs_async(supabase, USER_ID, years[0], years[-1], DEFAULT_SETTINGS)
+    return [_summary(inputs, year, pick=lambda value, year: value[year]) for year in years]
+
+
+def main() -> None:
+    n_years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    last_year = date.today().year
+    years = range(last_year - n_years + 1, last_year + 1)
+    store = FakeSupabase(latency_ms=latency)
+    _seed(store, years[0], years[-1])
+    client = AsyncFakeSupabase(store)
+
+    results = {}
+    print(f"{n_years} years, {latency:.0f} ms per upstream call")
+    for label, fn in (("GET /dashboard per year", per_year), ("GET /dashboard/range", ranged)):
+        store.calls = 0
+        start = time.perf_counter()
+        results[label] = asyncio.run(fn(client, years))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<24}: {elapsed * 1e3:7.1f} ms, {store.calls:3d} Supabase calls")
+    assert len(set(map(str, results.values()))) == 1, "range summaries differ from per-year summaries"
+    print("per-year summaries identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+GET /dashboard: recomputing from the source tables on every read vs reading the stored
+(user, year) summary row. The recompute path transfers every receipt date of the year
+and all holiday/schedule rows; the stored path reads one row whatever the history size.
+
+    python -m benchmarks.dashboard_summaries [receipts per year] [simulated upstream latency ms]
+"""
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services import dashboard as dashboard_service
+from app.services import loaders, summaries
+from app.services.dashboard import DEFAULT_SETTINGS
+from benchmarks._fakes import AsyncFakeSupabase, FakeSupabase
+
+USER_ID = str(uuid.uuid4())
+YEAR = date.today().year
+READS = 50
+
+
+def _seed(supabase: FakeSupabase, per_year: int) -> None:
+    rng = random.Random(3)
+    first = date(YEAR - 4, 1, 1)
+    supabase.tables["user_settings"] = [{**DEFAULT_SETTINGS, "user_id": USER_ID}]
+    supabase.tables["receipts"] = [
+        {"id": str(uuid.uuid4()), "user_id": USER_ID,
+         "receipt_date": (first + timedelta(days=rng.randrange(5 * 365))).isoformat()}
+        for _ in range(5 * per_year)
+    ]
+    supabase.tables["user_holidays"] = [
+        {"user_id": USER_ID, "start_date": f"{year}-{month:02d}-01", "end_date": f"{year}-{month:02d}-10"}
+        for year in range(YEAR - 4, YEAR + 1) for month in (2, 7, 12)
+    ]
+    supabase.tables["work_schedule_periods"] = [
+        {"user_id": USER_ID, "start_date": f"{year}-01-01", "end_date": f"{year}-06-30", "working_days": [0, 1, 2, 3]}
+        for year in range(YEAR - 4, YEAR + 1)
+    ]
+    supabase.tables["dashboard_summaries"] = []
+
+
+async def recompute(supabase: AsyncFakeSupabase) -> dict:
+    inputs, _ = await loaders.load_summary_inputs_async(supabase, USER_ID, YEAR, DEFAULT_SETTINGS)
+    settings = inputs["settings"]
+    return dashboard_service.compute_summary(
+        year=YEAR,
+        receipt_dates=inputs["receipt_dates"],
+        public_holidays=inputs["public_holidays"],
+        user_holidays=inputs["user_holiday_intervals"],
+        threshold=settings["homeworking_threshold"],
+        working_country_code=settings["working_country_code"],
+        working_days=settings.get("working_days"),
+        schedule_periods=inputs["schedule_periods"],
+    )
+
+
+async def stored(supabase: AsyncFakeSupabase) -> dict:
+    return (await summaries.get_summary_async(supabase, USER_ID, YEAR, DEFAULT_SETTINGS))[0]
+
+
+async def _timed(fn, supabase: AsyncFakeSupabase) -> tuple[float, dict]:
+    result = await fn(supabase)  # warm-up; builds the stored row on first call
+    start = time.perf_counter()
+    for _ in range(READS):
+        await fn(supabase)
+    return (time.perf_counter() - start) / READS * 1000, result
+
+
+def main() -> None:
+    per_year = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    store = FakeSupabase(latency_ms=latency)
+    _seed(store, per_year)
+    client = AsyncFakeSupabase(store)
+
+    print(f"~{per_year} receipts per year over 5 years, {latency:.0f} ms per upstream call")
+    results = []
+    for label, fn in (("recompute per read", recompute), ("stored summary row", stored)):
+        store.calls = 0
+        ms, result = asyncio.run(_timed(fn, client))
+        results.append(result)
+        print(f"{label:<19}: {ms:6.2f} ms per read, {store.calls / (READS + 1):.1f} upstream calls per read")
+    assert results[0] == results[1], "stored summary differs from recomputed summary"
+    print("summaries identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Accuracy and throughput of receipt-date extraction on a corpus of realistic OCR texts
+(LU/BE/FR/DE shops, card slips, invoices), compared with the previous four-regex parser.
+
+    python -m benchmarks.date_extraction [repeats]
+"""
+import re
+import sys
+import time
+from datetime import date
+from typing import Optional
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services.ocr import extract_date_from_text
+from tests.date_corpus import CORPUS
+
+# ── Previous implementation, kept verbatim for comparison ─────────────────────
+
+_LEGACY_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_LEGACY_PATTERNS = [
+    (r"\b(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{4})\b", "dmy"),
+    (r"\b(\d{4})[/\-\.](\d{1,2})[/\-\.](\d{1,2})\b", "ymd"),
+    (r"\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+(\d{4})\b", "dmy_text"),
+    (r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+(\d{1,2}),?\s+(\d{4})\b", "mdy_text"),
+]
+
+
+def legacy_extract(text: str) -> Optional[date]:
+    today = date.today()
+    candidates: list[date] = []
+    for pattern, fmt in _LEGACY_PATTERNS:
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            try:
+                if fmt == "dmy":
+                    d, m, y = int(match.group(1)), int(match.group(2)), int(match.group(3))
+                elif fmt == "ymd":
+                    y, m, d = int(match.group(1)), int(match.group(2)), int(match.group(3))
+                elif fmt == "dmy_text":
+                    d, m, y = int(match.group(1)), _LEGACY_MONTHS[match.group(2)[:3].lower()], int(match.group(3))
+                else:
+                    m, d, y = _LEGACY_MONTHS[match.group(1)[:3].lower()], int(match.group(2)), int(match.group(3))
+                candidates.append(date(y, m, d))
+            except (ValueError, KeyError):
+                continue
+    valid = [c for c in candidates if c <= today and c.year >= today.year - 10]
+    return max(valid) if valid else None
+
+
+def _run(name: str, fn, repeats: int) -> None:
+    correct = sum(1 for text, expected in CORPUS if fn(text) == expected)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text, _ in CORPUS:
+            fn(text)
+    elapsed = time.perf_counter() - start
+    parsed = repeats * len(CORPUS)
+    print(f"{name:<10} accuracy {correct:>2}/{len(CORPUS)}   {parsed / elapsed:10.0f} receipts/s")
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    _run("previous", legacy_extract, repeats)
+    _run("scanner", extract_date_from_text, repeats)
+
+    misses = [(t, e, extract_date_from_text(t)) for t, e in CORPUS if extract_date_from_text(t) != e]
+    for text, expected, got in misses:
+        print(f"  miss: expected {expected}, got {got} — {text.splitlines()[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Bytes and latency saved per image by the normalization stage (EXIF rotate, downscale,
+recompress) on a synthetic 12 MP iPhone-sized JPEG.
+
+    python -m benchmarks.image_normalization [images] [uplink Mbit/s]
+
+Transfer time is modelled from the payload size at the given bandwidth; it applies to
+the Vision request, the storage upload and every later signed-URL download.
+"""
+import io
+import sys
+import time
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from PIL import Image, ImageDraw
+
+from app.config import settings
+from app.services.images import normalize_image
+
+
+def _synthetic_photo(seed: int) -> bytes:
+    # Sensor-like noise compresses roughly like a real photo; text lines mimic a receipt
+    img = Image.effect_noise((4032, 3024), 40 + seed % 10).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for line in range(40):
+        draw.text((800, 300 + line * 60), f"ITEM {line:02d} .......... {line * 1.37:6.2f} EUR", fill=(0, 0, 0))
+    draw.text((800, 2800), "14/03/2025 12:31", fill=(0, 0, 0))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=92)
+    return out.getvalue()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    mbit = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    photos = [_synthetic_photo(i) for i in range(count)]
+
+    original = normalized = 0
+    elapsed = 0.0
+    for photo in photos:
+        start = time.perf_counter()
+        out, _ = normalize_image(photo, "image/jpeg")
+        elapsed += time.perf_counter() - start
+        original += len(photo)
+        normalized += len(out)
+
+    def transfer_ms(size: float) -> float:
+        return size * 8 / (mbit * 1e6) * 1e3
+
+    avg_in, avg_out = original / count, normalized / count
+    print(f"settings          : max {settings.image_max_dimension}px, quality {settings.image_jpeg_quality}, "
+          f"grayscale={settings.image_grayscale}")
+    print(f"original          : {avg_in / 1e6:6.2f} MB/image")
+    print(f"normalized        : {avg_out / 1e6:6.2f} MB/image ({avg_out / avg_in:.0%} of original)")
+    print(f"normalize cost    : {elapsed / count * 1e3:6.1f} ms/image")
+    print(f"transfer @{mbit:g}Mbit/s: {transfer_ms(avg_in):6.0f} ms -> {transfer_ms(avg_out):6.0f} ms per hop")
+
+
+if __name__ == "__main__":
+    main()
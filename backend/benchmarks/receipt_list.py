@@ -0,0 +1,88 @@
+"""
+GET /receipts for a user with a long history: the whole list in one query (old
+behaviour), the whole list read in keyset pages (no limit, as older clients call it)
+and single keyset pages, with and without a trimmed field list. Also walks every page
+once to check the cursor visits each receipt exactly once.
+
+    python -m benchmarks.receipt_list [receipts] [simulated upstream latency ms]
+"""
+import asyncio
+import json
+import sys
+import time
+import uuid
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.config import settings
+from app.services import receipts
+from benchmarks._fakes import AsyncFakeSupabase, FakeSupabase
+
+USER_ID = str(uuid.uuid4())
+
+
+def _seed(supabase: FakeSupabase, count: int) -> None:
+    supabase.tables["receipts"] = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": USER_ID,
+            "storage_path": f"{USER_ID}/{i}.jpg",
+            # Several receipts per day and a few undated ones, to exercise the id tiebreak
+            "receipt_date": None if i % 97 == 0 else f"{2020 + i % 6}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "ocr_status": "success",
+            "notes": "Client meeting in Kirchberg, parking and lunch",
+            "content_hash": uuid.uuid4().hex * 2,
+            "created_at": "2025-01-01T00:00:00+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def _timed(fn) -> tuple[dict, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def whole_history(supabase: FakeSupabase) -> dict:
+    rows = supabase.table("receipts").select("*").eq("user_id", USER_ID).order("receipt_date", desc=True).execute().data
+    for row in rows:
+        row["image_url"] = supabase.storage.from_("receipts").create_signed_url(row["storage_path"], 3600)["signedUrl"]
+    return {"receipts": rows, "total": len(rows)}
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    supabase = FakeSupabase(latency_ms=latency)
+    _seed(supabase, count)
+    client = AsyncFakeSupabase(supabase)
+
+    def list_page(**kwargs) -> dict:
+        return asyncio.run(receipts.list_receipts_async(client, USER_ID, **kwargs))
+
+    list_fields = ["id", "receipt_date", "ocr_status", "image_url"]
+    for label, run in (
+        ("whole history", lambda: whole_history(supabase)),
+        ("full list, keyset", lambda: list_page()),
+        ("first page", lambda: list_page(limit=settings.receipts_page_size)),
+        ("first page, 4 fields", lambda: list_page(limit=settings.receipts_page_size, fields=list_fields)),
+    ):
+        result, elapsed = _timed(run)
+        size = len(json.dumps(result, default=str))
+        print(f"{label:<22}: {len(result['receipts']):5d} rows  {size / 1024:8.1f} KiB  {elapsed * 1e3:8.1f} ms")
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = list_page(limit=settings.receipts_page_size, cursor=cursor, fields=["id"])
+        seen.extend(r["id"] for r in page["receipts"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == count == page["total"], (len(seen), len(set(seen)), page["total"])
+    print(f"walked {pages} pages, {len(seen)} receipts, no duplicates or gaps")
+
+
+if __name__ == "__main__":
+    main()
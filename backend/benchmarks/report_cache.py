@@ -0,0 +1,81 @@
+"""
+GET /report for an unchanged year: regenerating the PDF (signing every receipt URL and
+rendering) vs serving the stored artifact for the same input fingerprint. Also checks
+that a changed input produces a new report.
+
+    python -m benchmarks.report_cache [receipts] [simulated upstream latency ms]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.config import settings
+from app.routers.report import get_compliance_report
+from app.services import signed_urls
+from app.services.dashboard import DEFAULT_SETTINGS
+from benchmarks._fakes import AsyncFakeSupabase, FakeSupabase
+
+USER = SimpleNamespace(id=uuid.uuid4(), email="bench@example.com")
+YEAR = date.today().year
+DOWNLOADS = 5
+
+
+def _seed(supabase: FakeSupabase, n_receipts: int) -> None:
+    user_id = str(USER.id)
+    supabase.tables["user_settings"] = [{**DEFAULT_SETTINGS, "user_id": user_id}]
+    supabase.tables["receipts"] = [
+        {"id": str(uuid.uuid4()), "user_id": user_id, "storage_path": f"{user_id}/{i}.jpg", "ocr_status": "success",
+         "receipt_date": (date(YEAR, 1, 1) + timedelta(days=i % 300)).isoformat()}
+        for i in range(n_receipts)
+    ]
+    supabase.tables["user_holidays"] = []
+    supabase.tables["work_schedule_periods"] = []
+
+
+async def _download(client: AsyncFakeSupabase) -> bytes:
+    signed_urls._cache.clear()  # a fresh process or a URL-cache miss, as across workers
+    return (await get_compliance_report(year=YEAR, current_user=USER, supabase=client)).body
+
+
+def _timed(client: AsyncFakeSupabase, clear_reports: FakeSupabase | None) -> tuple[float, bytes]:
+    total, body = 0.0, b""
+    for _ in range(DOWNLOADS):
+        if clear_reports is not None:
+            for path in [p for p in clear_reports.objects if "/reports/" in p]:
+                del clear_reports.objects[path]
+        start = time.perf_counter()
+        body = asyncio.run(_download(client))
+        total += time.perf_counter() - start
+    return total / DOWNLOADS * 1000, body
+
+
+def main() -> None:
+    n_receipts = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    store = FakeSupabase(latency_ms=latency)
+    _seed(store, n_receipts)
+    client = AsyncFakeSupabase(store)
+
+    settings.report_cache = True
+    regenerated, first = _timed(client, clear_reports=store)
+    asyncio.run(_download(client))  # store the artifact
+    cached, second = _timed(client, clear_reports=None)
+    assert first == second, "cached report differs from a regenerated one"
+
+    store.tables["receipts"][0]["receipt_date"] = f"{YEAR}-12-31"
+    changed = asyncio.run(_download(client))
+    assert changed != second, "changed inputs served a stale report"
+
+    print(f"{n_receipts} receipts, {latency:.0f} ms per upstream call")
+    print(f"regenerate : {regenerated:8.1f} ms per download")
+    print(f"cached     : {cached:8.1f} ms per download")
+    print("cached report identical; changed inputs regenerate")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Report rendering in the API process (threadpool, as before) vs on renderer processes.
+For each report size, renders REPORTS reports concurrently while a probe issues small
+dashboard-style requests (compute a summary on the threadpool) every few ms, and
+reports render wall time plus probe latency: with in-process rendering the probes
+queue behind the GIL.
+
+    python -m benchmarks.report_rendering [receipt counts, comma-separated] [renderers]
+"""
+import asyncio
+import re
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services import dashboard as dashboard_service
+from app.services import renderer
+from app.services.holiday_rules import public_holidays_detailed
+from app.services.loaders import _receipt_dates
+from app.services.pdf import ReportData
+
+YEAR = date.today().year
+REPORTS = 2
+PROBE_INTERVAL = 0.005
+
+
+def _inputs(n_receipts: int) -> dict:
+    user_id = str(uuid.uuid4())
+    receipts = [
+        {"id": str(uuid.uuid4()), "storage_path": f"{user_id}/{i}.jpg", "ocr_status": "success",
+         "receipt_date": (date(YEAR, 1, 1) + timedelta(days=i % 360)).isoformat(),
+         "image_url": f"https://example.supabase.co/storage/v1/object/sign/receipts/{user_id}/{i}.jpg?token={'x' * 180}"}
+        for i in range(n_receipts)
+    ]
+    user_holidays = [{"start_date": f"{YEAR}-08-01", "end_date": f"{YEAR}-08-15", "description": "Summer"}]
+    return {
+        "settings": {"working_country_code": "LU", "homeworking_threshold": 34, "working_days": [0, 1, 2, 3, 4]},
+        "receipts": receipts,
+        "receipt_dates": _receipt_dates(receipts),
+        "user_holidays": user_holidays,
+        "user_holiday_intervals": dashboard_service.holiday_intervals(user_holidays, YEAR),
+        "schedule_periods": [],
+        "public_holidays": public_holidays_detailed(YEAR, "LU"),
+    }
+
+
+def _probe_request(inputs: dict) -> None:
+    dashboard_service.compute_summary(
+        year=YEAR,
+        receipt_dates=inputs["receipt_dates"],
+        public_holidays={date.fromisoformat(h["date"]) for h in inputs["public_holidays"]},
+        user_holidays=inputs["user_holiday_intervals"],
+        threshold=34,
+        working_country_code="LU",
+    )
+
+
+async def _run(report: ReportData, probe_inputs: dict) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await run_in_threadpool(_probe_request, probe_inputs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    probing = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(renderer.render_async(report) for _ in range(REPORTS)))
+    elapsed = (time.perf_counter() - start) * 1000
+    done.set()
+    await probing
+    return elapsed, latencies
+
+
+def _p(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] if len(values) > 1 else values[0]
+
+
+def _content(pdf_bytes: bytes) -> bytes:
+    # Creation time and the file ID derived from it differ between renders
+    return re.sub(rb"/CreationDate \(D:[^)]*\)|/ID \[<[0-9A-F]+><[0-9A-F]+>\]", b"", pdf_bytes)
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10, 500, 5000]
+    renderers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    probe_inputs = _inputs(200)
+    idle = asyncio.run(_run_probe_only(probe_inputs))
+    print(f"{REPORTS} concurrent reports per run, {renderers} renderer processes")
+    print(f"probe latency idle: p50 {_p(idle, 50):6.2f} ms, p95 {_p(idle, 95):6.2f} ms\n")
+    print(f"{'receipts':>8}  {'mode':<10} {'render wall':>11}  {'probe p50':>9}  {'probe p95':>9}  {'probe max':>9}")
+
+    for n in sizes:
+        report = renderer.report_data("bench@example.com", YEAR, _inputs(n))
+        outputs = {}
+        for mode, count in (("in-process", 0), ("processes", renderers)):
+            settings.report_renderers = count
+            renderer.start()
+            if count:  # spawn every renderer before timing
+                asyncio.run(_warm_up(count))
+            elapsed, latencies = asyncio.run(_run(report, probe_inputs))
+            outputs[mode] = _content(asyncio.run(renderer.render_async(report)))
+            renderer.shutdown()
+            print(f"{n:>8}  {mode:<10} {elapsed:9.0f} ms  {_p(latencies, 50):6.2f} ms  "
+                  f"{_p(latencies, 95):6.2f} ms  {max(latencies):6.2f} ms")
+        assert len(set(outputs.values())) == 1, "process-rendered PDF differs from in-process PDF"
+    print("\nPDFs identical in both modes")
+
+
+async def _warm_up(renderers: int) -> None:
+    warm = renderer.report_data("warm@example.com", YEAR, _inputs(1))
+    await asyncio.gather(*(renderer.render_async(warm) for _ in range(renderers)))
+
+
+async def _run_probe_only(probe_inputs: dict) -> list[float]:
+    latencies = []
+    for _ in range(100):
+        start = time.perf_counter()
+        await run_in_threadpool(_probe_request, probe_inputs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(PROBE_INTERVAL)
+    return latencies
+
+
+if __name__ == "__main__":
+    main()
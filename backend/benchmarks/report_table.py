@@ -0,0 +1,78 @@
+"""
+Receipts table in the PDF report: the previous renderer (four cell() calls per row,
+colors set per row) vs the page-batched one, plain and grouped by month. Reports
+render time and PDF size for the whole report and checks page counts stay close.
+
+    python -m benchmarks.report_table [receipts] [repeats]
+"""
+import re
+import sys
+import time
+from datetime import date
+from unittest import mock
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services import pdf, renderer
+from benchmarks.report_rendering import YEAR, _inputs
+
+
+# ── Previous implementation (baseline) ────────────────────────────────────────
+
+def legacy_receipts_table(report_pdf, receipts, group_by_month=False):
+    widths = [pdf._COL_DATE, pdf._COL_DAY, pdf._COL_OCR, pdf._COL_LINK]
+    pdf._table_header(report_pdf, widths, ["Date", "Day of week", "OCR status", "Receipt image"])
+
+    report_pdf.set_font("Helvetica", "", 9)
+    for idx, r in enumerate(receipts):
+        receipt_date = date.fromisoformat(r.receipt_date) if r.receipt_date else None
+        date_str = receipt_date.strftime("%d/%m/%Y") if receipt_date else "-"
+        day_str = receipt_date.strftime("%A") if receipt_date else "-"
+
+        fill = idx % 2 == 1
+        report_pdf.set_fill_color(245, 245, 245)
+        report_pdf.set_text_color(30, 30, 30)
+        report_pdf.cell(pdf._COL_DATE, pdf._ROW_H, date_str, border=1, fill=fill)
+        report_pdf.cell(pdf._COL_DAY, pdf._ROW_H, day_str, border=1, fill=fill)
+        report_pdf.cell(pdf._COL_OCR, pdf._ROW_H, r.ocr_status, border=1, fill=fill)
+        report_pdf.set_text_color(0, 80, 180)
+        report_pdf.cell(pdf._COL_LINK, pdf._ROW_H, "View receipt", border=1, fill=fill, link=r.image_url)
+        report_pdf.ln()
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def _timed(report: pdf.ReportData, repeats: int) -> tuple[float, bytes]:
+    best, output = float("inf"), b""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = pdf.generate_compliance_report(report)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, output
+
+
+def _pages(pdf_bytes: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b", pdf_bytes))
+
+
+def main() -> None:
+    n_receipts = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    report = renderer.report_data("bench@example.com", YEAR, _inputs(n_receipts))
+
+    print(f"{n_receipts} receipts, best of {repeats}")
+    results = {}
+    with mock.patch.object(pdf, "_receipts_table", legacy_receipts_table):
+        results["previous (cell per column)"] = _timed(report, repeats)
+    results["batched"] = _timed(report, repeats)
+    results["batched, grouped by month"] = _timed(report._replace(group_receipts_by_month=True), repeats)
+
+    for label, (ms, output) in results.items():
+        print(f"{label:<27}: {ms:8.1f} ms, {len(output) / 1024:7.1f} KiB, {_pages(output):4d} pages")
+    links = {label: output.count(b"/Subtype /Link") for label, (_, output) in results.items()}
+    assert len(set(links.values())) == 1, f"receipt links differ: {links}"
+    print(f"{next(iter(links.values()))} receipt links in every variant")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Storage round trips and latency of signing image URLs for a user's receipts:
+one create_signed_url call per row (old behaviour) vs batched signing plus the
+in-process URL cache.
+
+    python -m benchmarks.signed_urls [receipts] [simulated upstream latency ms]
+"""
+import sys
+import time
+import uuid
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services import receipts
+from benchmarks._fakes import FakeSupabase
+
+USER_ID = str(uuid.uuid4())
+
+
+def _seed(supabase: FakeSupabase, count: int) -> None:
+    supabase.tables["receipts"] = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": USER_ID,
+            "storage_path": f"{USER_ID}/{i}.jpg",
+            "receipt_date": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "ocr_status": "success",
+        }
+        for i in range(count)
+    ]
+
+
+def _list(supabase: FakeSupabase) -> tuple[int, float]:
+    calls = supabase.calls
+    start = time.perf_counter()
+    rows = supabase.table("receipts").select("*").eq("user_id", USER_ID).execute().data
+    receipts._attach_signed_urls(supabase, rows)
+    return supabase.calls - calls, time.perf_counter() - start
+
+
+def per_row(supabase: FakeSupabase) -> tuple[int, float]:
+    calls = supabase.calls
+    start = time.perf_counter()
+    rows = supabase.table("receipts").select("*").eq("user_id", USER_ID).execute().data
+    for row in rows:
+        row["image_url"] = supabase.storage.from_("receipts").create_signed_url(row["storage_path"], 3600)
+    return supabase.calls - calls, time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    supabase = FakeSupabase(latency_ms=latency)
+    _seed(supabase, count)
+
+    for label, run in (
+        ("per-row signing", lambda: per_row(supabase)),
+        ("batched, cold cache", lambda: _list(supabase)),
+        ("batched, warm cache", lambda: _list(supabase)),
+    ):
+        calls, elapsed = run()
+        print(f"{label:<20}: {calls:4d} upstream calls  {elapsed * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
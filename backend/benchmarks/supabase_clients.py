@@ -0,0 +1,66 @@
+"""
+Per-request Supabase client overhead: create_client() per dependency resolution
+(old behaviour) vs the shared pooled client from app.db.supabase.
+
+Requests go to an in-process mock transport, so the numbers only cover client
+construction and request plumbing — the TLS handshakes saved by keep-alive
+come on top of this in production.
+
+    python -m benchmarks.supabase_clients [iterations]
+"""
+import sys
+import time
+
+import benchmarks  # noqa: F401  (sets env defaults)
+import httpx
+from supabase import ClientOptions, create_client
+
+from app.config import settings
+from app.db import supabase as db
+
+
+def _mock_transport() -> httpx.MockTransport:
+    return httpx.MockTransport(lambda request: httpx.Response(200, json=[{"user_id": "x"}]))
+
+
+def _query(client) -> None:
+    client.table("user_settings").select("*").eq("user_id", "x").execute()
+
+
+def per_request_client(iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        http = httpx.Client(transport=_mock_transport())
+        client = create_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=ClientOptions(httpx_client=http),
+        )
+        _query(client)
+        http.close()
+    return (time.perf_counter() - start) / iterations
+
+
+def shared_client(iterations: int) -> float:
+    db._http_client = httpx.Client(transport=_mock_transport())
+    db._admin_client = None
+    db.init_clients()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        _query(db.get_supabase_admin())
+    elapsed = (time.perf_counter() - start) / iterations
+    db.close_clients()
+    return elapsed
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    before = per_request_client(iterations)
+    after = shared_client(iterations)
+    print(f"create_client per request : {before * 1e3:8.3f} ms/request")
+    print(f"shared pooled client      : {after * 1e3:8.3f} ms/request")
+    print(f"saved                     : {(before - after) * 1e3:8.3f} ms/request ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Receipt list payload: what a client downloads to render one page of receipts from
+image_url (full-size originals) vs thumbnail_url, plus the upload-time cost of making
+a thumbnail (JPEG draft decoding vs a full decode).
+
+    python -m benchmarks.thumbnails [page size] [photo width px]
+"""
+import io
+import sys
+import time
+from unittest import mock
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from PIL import Image, ImageDraw, ImageFilter, JpegImagePlugin
+
+from app.services.images import make_thumbnail
+
+RUNS = 5
+
+
+def _photo(width: int, seed: int) -> bytes:
+    """A phone-photo-like JPEG: receipt-ish text lines on a noisy, blurred background."""
+    height = width * 3 // 4
+    img = Image.merge("RGB", [Image.effect_noise((width, height), 30 + seed).filter(ImageFilter.GaussianBlur(2))] * 3)
+    draw = ImageDraw.Draw(img)
+    for y in range(height // 10, height - height // 10, max(height // 60, 12)):
+        draw.rectangle([width // 4, y, width // 4 + (y * 7919 % (width // 2)), y + height // 120], fill=(20, 20, 20))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=88)
+    return out.getvalue()
+
+
+def _timed(fn, *args) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main() -> None:
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 4032
+    photos = [_photo(width, i) for i in range(3)]
+    thumbnails = [make_thumbnail(p, "image/jpeg") for p in photos]
+
+    original_kib = sum(map(len, photos)) / len(photos) / 1024
+    thumbnail_kib = sum(map(len, thumbnails)) / len(thumbnails) / 1024
+    print(f"{width}px JPEG photos, list page of {page_size}")
+    print(f"image_url     : {original_kib:8.1f} KiB per row, {original_kib * page_size / 1024:7.2f} MiB per page")
+    print(f"thumbnail_url : {thumbnail_kib:8.1f} KiB per row, {thumbnail_kib * page_size / 1024:7.2f} MiB per page")
+
+    draft_ms, _ = _timed(make_thumbnail, photos[0], "image/jpeg")
+    with mock.patch.object(JpegImagePlugin.JpegImageFile, "draft", lambda self, mode, size: None):
+        full_ms, _ = _timed(make_thumbnail, photos[0], "image/jpeg")
+    print(f"make_thumbnail: {draft_ms:6.1f} ms with draft decoding, {full_ms:6.1f} ms with a full decode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Peak memory per in-flight upload while reading (hashing, sniffing) a request file and
+sending it to Storage, and how early an oversized upload is rejected.
+
+    python -m benchmarks.upload_memory [size MB]
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.config import settings
+from app.services.receipts import _read_upload, _store_image
+
+
+def _spooled_upload(size: int) -> UploadFile:
+    # Same container Starlette uses for multipart parts (spills to disk above 1 MB)
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(b"\xff\xd8\xff" + os.urandom(size - 3))
+    spool.seek(0)
+    return UploadFile(file=spool, headers=Headers({"content-type": "image/jpeg"}))
+
+
+class _StreamingBucket:
+    """Reads an upload body the way httpx's multipart encoder does: 64 KiB at a time."""
+
+    def upload(self, path, file, file_options=None):
+        if isinstance(file, bytes):
+            return
+        while file.read(64 * 1024):
+            pass
+
+
+_supabase = SimpleNamespace(storage=SimpleNamespace(from_=lambda name: _StreamingBucket()))
+
+
+def _previous_read(file: UploadFile) -> None:
+    # Behaviour before streaming: read() everything, hash the full copy and upload the bytes
+    image_bytes = file.file.read()
+    hashlib.sha256(image_bytes).hexdigest()
+    _store_image(_supabase, "bench/previous.jpg", image_bytes, "image/jpeg")
+
+
+def _streaming_read(file: UploadFile) -> None:
+    image, _, content_type = _read_upload(file)
+    _store_image(_supabase, "bench/streamed.jpg", image, content_type)
+
+
+def _peak(fn, file: UploadFile) -> int:
+    tracemalloc.start()
+    fn(file)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 10 * 1024 * 1024
+    print(f"upload size        : {size / 1e6:6.1f} MB (limit {settings.upload_max_bytes / 1e6:.1f} MB)")
+    print(f"previous read peak : {_peak(_previous_read, _spooled_upload(size)) / 1e6:6.1f} MB")
+    print(f"streaming read peak: {_peak(_streaming_read, _spooled_upload(size)) / 1e6:6.1f} MB")
+
+    oversized = _spooled_upload(settings.upload_max_bytes * 2)
+    oversized.size = None  # force the streaming check rather than the size shortcut
+    start = time.perf_counter()
+    try:
+        _read_upload(oversized)
+    except HTTPException as e:
+        print(f"oversized rejected : {e.status_code} after {(time.perf_counter() - start) * 1e3:.1f} ms, "
+              f"{oversized.file.tell() / 1e6:.1f} MB read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+-- Run this in Supabase → SQL Editor
+
+-- Background OCR (OCR_MODE=background) adds a new ocr_status value:
+--   'pending'       — receipt stored, OCR queued on the worker pool
+-- Pending rows are re-queued on startup, so keep that lookup cheap.
+
+create index receipts_pending_ocr_idx
+    on public.receipts(created_at)
+    where ocr_status = 'pending';
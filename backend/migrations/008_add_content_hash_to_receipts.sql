@@ -0,0 +1,9 @@
+-- Run this in Supabase → SQL Editor
+
+-- SHA-256 of the uploaded image bytes. Re-uploads of the same photo (mobile retries,
+-- users re-sending a picture) return the existing receipt instead of a new one.
+-- Null for receipts uploaded before this migration.
+alter table public.receipts
+    add column content_hash text;
+
+create index receipts_user_hash_idx on public.receipts(user_id, content_hash);
@@ -0,0 +1,8 @@
+-- Run this in Supabase → SQL Editor
+
+-- GET /receipts pages through receipts ordered by (receipt_date desc nulls first, id desc).
+-- A backward scan of (user_id, receipt_date, id) returns rows in exactly that order, so
+-- each page is a bounded index range scan instead of a sort over the user's history.
+
+drop index if exists public.receipts_user_date_idx;
+create index receipts_user_date_idx on public.receipts(user_id, receipt_date, id);
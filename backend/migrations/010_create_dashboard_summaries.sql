@@ -0,0 +1,24 @@
+-- Run this in Supabase → SQL Editor
+
+-- Materialized GET /dashboard inputs, one row per user and year (see app/services/summaries.py).
+-- Masks are hex-encoded bitsets, bit i = day i of the year (bit 0 = 1 January).
+create table public.dashboard_summaries (
+    user_id               uuid not null references auth.users(id) on delete cascade,
+    year                  integer not null,
+    working_mask          text,          -- working days: schedule minus public and user holidays
+    receipt_mask          text,          -- days with at least one dated receipt
+    homeworking_threshold integer,
+    working_country_code  text,
+    stale                 boolean not null default true,  -- rebuilt on next read
+    revision              uuid not null default gen_random_uuid(),  -- replaced on every write
+    updated_at            timestamptz not null default now(),
+    primary key (user_id, year)
+);
+
+alter table public.dashboard_summaries enable row level security;
+
+-- Written only by the backend (service role)
+create policy "Users can read their own dashboard summaries"
+    on public.dashboard_summaries
+    for select
+    using (auth.uid() = user_id);
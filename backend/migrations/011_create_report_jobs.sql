@@ -0,0 +1,30 @@
+-- Run this in Supabase → SQL Editor
+
+-- Background report generation (POST /report/jobs, see app/services/report_jobs.py).
+-- Finished PDFs live in the receipts bucket under {user_id}/reports/{year}/.
+create table public.report_jobs (
+    id           uuid primary key default gen_random_uuid(),
+    user_id      uuid not null references auth.users(id) on delete cascade,
+    user_email   text not null,                  -- shown in the report
+    year         integer not null,
+    status       text not null default 'queued', -- queued | running | done | failed
+    stage        text,                           -- loading | signing | rendering | storing
+    progress     integer not null default 0,     -- percent
+    storage_path text,                           -- set when done
+    error        text,                           -- set when failed
+    created_at   timestamptz not null default now(),
+    updated_at   timestamptz not null default now()
+);
+
+-- Active jobs are looked up per user on every POST and re-queued on startup
+create index report_jobs_active_idx
+    on public.report_jobs(user_id, created_at)
+    where status in ('queued', 'running');
+
+alter table public.report_jobs enable row level security;
+
+-- Written only by the backend (service role)
+create policy "Users can read their own report jobs"
+    on public.report_jobs
+    for select
+    using (auth.uid() = user_id);
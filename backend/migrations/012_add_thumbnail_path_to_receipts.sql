@@ -0,0 +1,9 @@
+-- Run this in Supabase → SQL Editor
+
+-- Receipt list thumbnails: a small WebP stored next to the original, in the receipts
+-- bucket at {user_id}/thumbs/{receipt_id}.webp. Null for PDFs and for receipts
+-- uploaded before thumbnails existed, until backfilled with
+--   python -m app.commands.backfill_thumbnails
+
+alter table public.receipts
+    add column thumbnail_path text;
@@ -0,0 +1,21 @@
+-- Run this in Supabase → SQL Editor
+
+-- One receipt per (user, content hash). Two concurrent retries of the same upload could
+-- both miss the hash lookup and insert a receipt each; with a unique index the second
+-- insert is skipped and the API returns the first receipt instead. Null hashes (receipts
+-- uploaded before migration 008) never conflict.
+
+-- Duplicates created before this migration keep their rows; only the oldest keeps its hash
+update public.receipts r
+set content_hash = null
+where r.content_hash is not null
+  and exists (
+      select 1
+      from public.receipts o
+      where o.user_id = r.user_id
+        and o.content_hash = r.content_hash
+        and (o.created_at, o.id) < (r.created_at, r.id)
+  );
+
+drop index if exists public.receipts_user_hash_idx;
+create unique index receipts_user_hash_idx on public.receipts(user_id, content_hash);
@@ -0,0 +1,127 @@
+"""
+The per-day dashboard calculation that compute_summary replaced, kept verbatim as the
+reference it must agree with, and random users to compare the two on. Shared by
+tests/test_calendar_engine.py and benchmarks/calendar_engine.py.
+"""
+import random
+from datetime import date, timedelta
+
+from app.services import holiday_rules
+from app.services.dashboard import _parse_periods
+
+
+# ── Previous implementation, kept verbatim for comparison ─────────────────────
+
+def _date_range(start: date, end: date):
+    d = start
+    while d <= end:
+        yield d
+        d += timedelta(days=1)
+
+
+def expand_holiday_periods(periods: list[dict]) -> set[date]:
+    """Flatten a list of {start_date, end_date} dicts into a set of individual dates."""
+    dates: set[date] = set()
+    for p in periods:
+        start = date.fromisoformat(p["start_date"]) if isinstance(p["start_date"], str) else p["start_date"]
+        end = date.fromisoformat(p["end_date"]) if isinstance(p["end_date"], str) else p["end_date"]
+        for d in _date_range(start, end):
+            dates.add(d)
+    return dates
+
+
+def _weekdays_for_date(d: date, periods: list[tuple], default: set[int]) -> set[int]:
+    for start, end, weekdays in periods:
+        if d >= start and (end is None or d <= end):
+            return weekdays
+    return default
+
+
+def legacy_compute_summary(
+    year, receipt_dates, public_holidays, user_holiday_dates, threshold,
+    working_country_code, working_days=None, schedule_periods=None,
+) -> dict:
+    today = date.today()
+    default_weekdays = set(working_days) if working_days else {0, 1, 2, 3, 4}
+    parsed_periods = _parse_periods(schedule_periods or [])
+    all_working_days = {
+        d for d in _date_range(date(year, 1, 1), date(year, 12, 31))
+        if d.weekday() in _weekdays_for_date(d, parsed_periods, default_weekdays)
+        and d not in public_holidays
+        and d not in user_holiday_dates
+    }
+    past_working_days = {d for d in all_working_days if d <= today}
+    future_working_days = all_working_days - past_working_days
+    proved_days = receipt_dates & past_working_days
+    homeworking_so_far = len(past_working_days) - len(proved_days)
+    rate = homeworking_so_far / len(past_working_days) if past_working_days else 0.0
+    forecast = homeworking_so_far + round(rate * len(future_working_days))
+    at_risk = forecast > threshold
+    return {
+        "year": year,
+        "working_country_code": working_country_code,
+        "homeworking_threshold": threshold,
+        "total_working_days": len(all_working_days),
+        "past_working_days": len(past_working_days),
+        "days_with_proof": len(proved_days),
+        "days_without_proof": homeworking_so_far,
+        "forecast_homeworking_days": forecast,
+        "forecasted_days_without_proof": forecast,
+        "remaining_allowed_homeworking_days": max(0, threshold - homeworking_so_far),
+        "is_at_risk": at_risk,
+        "compliance_status": "at_risk" if at_risk else "compliant",
+    }
+
+
+# ── Random users ──────────────────────────────────────────────────────────────
+
+def _random_day(rng: random.Random, year: int) -> date:
+    return date(year - 1, 11, 1) + timedelta(days=rng.randrange(0, 430))
+
+
+def _random_weekdays(rng: random.Random) -> list[int]:
+    return sorted(rng.sample(range(7), rng.randrange(0, 8)))
+
+
+def _random_holidays(rng: random.Random, year: int, n: int, years_back: int = 0) -> list[dict]:
+    holidays = []
+    for _ in range(n):
+        start = _random_day(rng, year) - timedelta(days=365 * rng.randrange(0, years_back + 1))
+        end = start + timedelta(days=rng.randrange(0, 20))
+        holidays.append({"start_date": start.isoformat(), "end_date": end.isoformat()})
+    return holidays
+
+
+def random_case(rng: random.Random, n_periods: int | None = None, n_holidays: int | None = None) -> dict:
+    year = date.today().year + rng.choice([-2, -1, 0, 0, 0, 1])
+    periods = []
+    for _ in range(rng.randrange(0, 12) if n_periods is None else n_periods):
+        start = _random_day(rng, year)
+        end = None if rng.random() < 0.3 else start + timedelta(days=rng.randrange(0, 200))
+        if periods and rng.random() < 0.1:
+            start = date.fromisoformat(periods[-1]["start_date"])  # same start, order decides
+        periods.append({
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat() if end else None,
+            "working_days": _random_weekdays(rng),
+        })
+    if n_holidays is None:
+        holidays = _random_holidays(rng, year, rng.randrange(0, 6))
+    else:
+        holidays = _random_holidays(rng, year, n_holidays, years_back=10)
+    country = rng.choice(["LU", "BE", "FR", "DE"])
+    return {
+        "year": year,
+        "receipt_dates": {_random_day(rng, year) for _ in range(rng.randrange(0, 250))},
+        "public_holidays": holiday_rules.public_holidays(year, country),
+        "user_holidays": holidays,
+        "threshold": rng.randrange(0, 120),
+        "working_country_code": country,
+        "working_days": _random_weekdays(rng) if rng.random() < 0.5 else None,
+        "schedule_periods": periods,
+    }
+
+
+def legacy(case: dict) -> dict:
+    args = {k: v for k, v in case.items() if k != "user_holidays"}
+    return legacy_compute_summary(**args, user_holiday_dates=expand_holiday_periods(case["user_holidays"]))
@@ -0,0 +1,58 @@
+"""
+Realistic receipt OCR texts (LU/BE/FR/DE shops, card slips, invoices) labelled with
+their receipt date. Shared by tests/test_date_extraction.py and
+benchmarks/date_extraction.py.
+"""
+from datetime import date
+
+# (OCR text, expected receipt date)
+CORPUS: list[tuple[str, date]] = [
+    ("CACTUS BERELDANGE\nTVA LU 12345678\nBaguette 1,20\nLait 0,99\nTOTAL 2,19 EUR\nVISA ****1234\n"
+     "14/03/2025 12:31\nMerci de votre visite", date(2025, 3, 14)),
+    ("DELHAIZE ARLON\nDate: 02.04.2025 Heure: 08:12\nCafé 2,50\nCroissant 1,40\nTOTAL 3,90\n"
+     "Carte valable jusqu'au 31/12/2025", date(2025, 4, 2)),
+    ("ALDI SÜD\nFiliale 123\nBananen 1,29\nSumme EUR 1,29\nBAR 2,00\nRückgeld 0,71\n"
+     "05.02.25 17:45 1234/001/02", date(2025, 2, 5)),
+    ("Boulangerie Paul\nGare de Luxembourg\nle 7 mars 2025 à 07h52\nExpresso 2,20\nTotal TTC 2,20",
+     date(2025, 3, 7)),
+    ("Restaurant Am Duerf\nRechnung Nr. 4711\nDatum: 11. März 2025\n2x Gromperekichelcher 13,00\n"
+     "Gesamt 13,00 EUR", date(2025, 3, 11)),
+    ("Shell Station Gasperich\nPUMP 04 DIESEL\n38,21 L 62,30 EUR\n2025-01-20 06:58:11\n"
+     "Mastercard ****9876 exp 09/27", date(2025, 1, 20)),
+    ("SNCF\nBillet Thionville - Luxembourg\nValable le 03/02/2025\nEmis le 01/02/2025 19:03\n"
+     "Prix 6,90 EUR", date(2025, 2, 1)),
+    ("CFL Mobilitéit\nKuerzzäitbilljee\nDen 12. Abrëll 2025 um 07:41\nGratis Transport",
+     date(2025, 4, 12)),
+    ("Pharmacie du Centre\nDoliprane 1000 2,18\nTotal 2,18\nDate 18-06-2024 10:22\n"
+     "A consommer avant 06/2027", date(2024, 6, 18)),
+    ("AUCHAN KIRCHBERG\nCARTE FIDELITE valable jusqu au 30/09/2025\nEAU 6X1.5L 2,99\n"
+     "TOTAL 2,99\n24/09/2024 18:03:45 CAISSE 12", date(2024, 9, 24)),
+    ("Starbucks Cloche d'Or\nGrande Latte 4.95\nVisa 4.95\nSept 5, 2024 3:14 PM\nThank you",
+     date(2024, 9, 5)),
+    ("Interspar\nRechnungsdatum 28.11.2024\nÄpfel 2,49\nSumme 2,49\nVielen Dank\nGültig bis 28.12.2024",
+     date(2024, 11, 28)),
+    ("Brasserie Guillaume\nTable 7 Couverts 2\n1er oct. 2024 13h05\nPlat du jour 2x 15,50\n"
+     "Total 31,00", date(2024, 10, 1)),
+    ("MEDIA MARKT\nKassenbon 0815\nUSB-C Kabel 9,99\n16.12.24 11:11\nGarantie bis 16.12.26",
+     date(2024, 12, 16)),
+    ("Q8 EASY\nSANS PLOMB 95\nMONTANT 40,00 EUR\nTICKET CLIENT\n08/01/2025\n14:22:09",
+     date(2025, 1, 8)),
+    ("Luxembourg Parking\nEntrée 10/03/2025 07:58\nSortie 10/03/2025 17:32\nMontant 9,60 EUR",
+     date(2025, 3, 10)),
+    ("Invoice #2025-0042\nIssued: March 18, 2025\nConsulting 1 day 800.00\nDue date: April 17, 2025",
+     date(2025, 3, 18)),
+    ("Proxy Delhaize\n21 janv. 2025 19:40\nPain 1,10\nTotal 1,10", date(2025, 1, 21)),
+    ("Rewe\nBon-Nr. 1234\nDatum 03.07.2024 Uhrzeit 12:01\nMineralwasser 0,59\nSUMME 0,59",
+     date(2024, 7, 3)),
+    ("Café Um Bock\n31/05/2024\nKaffi 2,80\nTotal 2,80\nMIR SOEN MERCI", date(2024, 5, 31)),
+    ("LIDL\n2,95 Brot\nSumme 2,95\nKartenzahlung\n13.08.2024 08:05 Terminal 55443322\n"
+     "Gültig bis 13.11.2024", date(2024, 8, 13)),
+    ("Boucherie Kirsch\nCommande du 04/10/2024\nRetrait le 05/10/2024\nTotal 23,50",
+     date(2024, 10, 4)),
+    ("Hotel Parc Belle-Vue\nArrival 12 Feb 2025\nDeparture 14 Feb 2025\nInvoice date 14 Feb 2025 10:15",
+     date(2025, 2, 14)),
+    ("Kinepolis Kirchberg\nSeance 19/03/2025 20:30\nAchat le 19/03/2025 18:12\nTotal 12,50",
+     date(2025, 3, 19)),
+    ("FNAC\nTicket 5566\nLivre 18,00\nTOTAL 18,00\nVendu le 22.02.2025 à 16:40\n"
+     "Echange possible jusqu'au 22.03.2025", date(2025, 2, 22)),
+]
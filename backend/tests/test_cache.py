@@ -0,0 +1,48 @@
+"""The SQLite tier of TieredCache is an optimisation: its failures must not fail lookups."""
+import asyncio
+import sqlite3
+import time
+
+from app.services.cache import TieredCache
+
+
+class _BrokenDb:
+    """Stands in for a connection whose every statement fails (locked, full or read-only disk)."""
+
+    def execute(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+    def commit(self):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def _cache(tmp_path, **kwargs) -> TieredCache:
+    return TieredCache("test", path=str(tmp_path / "cache.sqlite3"), ttl=60, stale_ttl=60, **kwargs)
+
+
+def test_disk_errors_fall_back_to_memory(tmp_path):
+    cache = _cache(tmp_path)
+    cache._db = _BrokenDb()
+    assert cache.get_or_fetch("k", lambda: {"v": 1}) == {"v": 1}
+    assert cache.get_or_fetch("k", lambda: {"v": 2}) == {"v": 1}  # served from memory
+
+    async def fetch():
+        return [1, 2]
+
+    assert asyncio.run(cache.aget_or_fetch("a", fetch)) == [1, 2]
+    cache.invalidate("k")
+    assert cache.get("k") == (False, None)
+
+
+def test_expired_rows_are_pruned_on_open(tmp_path):
+    cache = _cache(tmp_path)
+    cache.set("fresh", 1)
+    cache._db.execute(
+        "insert into cache (key, value, fetched_at) values (?, ?, ?)", ("old", "2", time.time() - 121)
+    )
+    cache._db.commit()
+
+    reopened = _cache(tmp_path)
+    keys = {row[0] for row in reopened._db.execute("select key from cache")}
+    assert keys == {"fresh"}
+    assert reopened.get("fresh") == (True, 1)
@@ -0,0 +1,29 @@
+"""
+compute_summary on whole-year bitsets must agree with the per-day loop it replaced on
+any user: overlapping / open-ended / same-day schedule periods, empty weekday sets,
+holidays and receipts spilling into neighbouring years, past/current/future years.
+"""
+import random
+
+from app.services.dashboard import compute_summary, holiday_intervals
+from tests.calendar_reference import legacy, random_case
+
+CASES = 2000
+
+
+def _current(case: dict) -> dict:
+    return compute_summary(**{**case, "user_holidays": holiday_intervals(case["user_holidays"], case["year"])})
+
+
+def test_matches_per_day_loop_on_random_users():
+    rng = random.Random(20250101)
+    for i in range(CASES):
+        case = random_case(rng)
+        assert _current(case) == legacy(case), (i, case)
+
+
+def test_matches_per_day_loop_with_long_histories():
+    rng = random.Random(20250102)
+    for i in range(50):
+        case = random_case(rng, n_periods=50, n_holidays=100)
+        assert _current(case) == legacy(case), (i, case)
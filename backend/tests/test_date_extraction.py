@@ -0,0 +1,47 @@
+"""Receipt-date extraction from OCR text (app/services/ocr.py), on the labelled corpus and edge cases."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.ocr import extract_date_from_text
+from tests.date_corpus import CORPUS
+
+
+@pytest.mark.parametrize("text, expected", CORPUS, ids=[text.split("\n", 1)[0] for text, _ in CORPUS])
+def test_corpus(text, expected):
+    assert extract_date_from_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2025-01-15T10:00:00Z", date(2025, 1, 15)),
+        ("15 janv. 2025", date(2025, 1, 15)),
+        ("15. März 2025", date(2025, 3, 15)),
+        ("1er oct. 2024", date(2024, 10, 1)),
+        ("January 15, 2025", date(2025, 1, 15)),
+        ("07.03.25", date(2025, 3, 7)),
+        ("03/25/2025", date(2025, 3, 25)),  # month-first only because day-first is impossible
+    ],
+)
+def test_formats(text, expected):
+    assert extract_date_from_text(f"SHOP\n{text}\nTOTAL 1,00") == expected
+
+
+def test_no_date():
+    assert extract_date_from_text("SHOP\nTOTAL 12,50\nTel 621 123 456\nMerci") is None
+
+
+def test_discards_future_and_old_dates():
+    future = date.today() + timedelta(days=30)
+    old = date(date.today().year - 11, 6, 1)
+    assert extract_date_from_text(f"{future:%d/%m/%Y}\n{old:%d/%m/%Y}") is None
+
+
+def test_month_names_are_whole_words():
+    # "Mai" inside "Maison" and a day number before it are not a date
+    assert extract_date_from_text("12 Maison 2024\nTOTAL 3,00") is None
+
+
+def test_tie_goes_to_most_recent():
+    assert extract_date_from_text("01/02/2025 - 03/02/2025") == date(2025, 2, 3)
@@ -0,0 +1,49 @@
+"""
+The offline holiday calendars against expected holiday lists, so switching between
+them and Nager.Date doesn't change a summary.
+
+tests/fixtures/holidays/*.json are hand-written expectations, not recorded Nager.Date
+responses: each country's statutory calendar, with Easter-based days taken from
+published Easter dates (not from holiday_rules.easter_sunday), under Nager.Date's names
+and local names. "regional" entries are those Nager.Date scopes to some regions (German
+states, Alsace-Moselle). Years cover an early (2008) and late (2019, 2038) Easter and
+both sides of the `since=` rules (2018/2019). To check an expectation against the live
+API, compare it with
+
+    curl https://date.nager.at/api/v3/PublicHolidays/<year>/<country>
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services import holiday_rules
+
+FIXTURES = Path(__file__).parent / "fixtures" / "holidays"
+COUNTRIES = ["LU", "BE", "FR", "DE"]
+
+
+def _expected(country_code: str) -> dict:
+    return json.loads((FIXTURES / f"{country_code}.json").read_text(encoding="utf-8"))
+
+
+def _cases() -> list:
+    return [
+        pytest.param(country_code, int(year), scopes, id=f"{country_code}-{year}")
+        for country_code in COUNTRIES
+        for year, scopes in _expected(country_code).items()
+    ]
+
+
+@pytest.mark.parametrize("country_code, year, scopes", _cases())
+def test_matches_expected_holidays(country_code, year, scopes):
+    expected = sorted(tuple(h) for h in scopes["national"] + scopes["regional"])
+    got = sorted((h["date"], h["name"], h["local_name"]) for h in holiday_rules.public_holidays_detailed(year, country_code))
+    assert got == expected
+    assert {d.isoformat() for d in holiday_rules.public_holidays(year, country_code)} == {h[0] for h in expected}
+
+
+@pytest.mark.parametrize("year", [2008, 2018, 2019, 2024, 2038, 2100])
+def test_easter_sunday(year):
+    published = {2008: "03-23", 2018: "04-01", 2019: "04-21", 2024: "03-31", 2038: "04-25", 2100: "03-28"}
+    assert holiday_rules.easter_sunday(year).isoformat() == f"{year}-{published[year]}"
@@ -0,0 +1,51 @@
+"""Receipt loads span more rows than one PostgREST response returns (max 1000)."""
+import asyncio
+import random
+import uuid
+from datetime import date, timedelta
+
+from app.services import loaders
+from app.services.dashboard import DEFAULT_SETTINGS
+from benchmarks._fakes import AsyncFakeSupabase, FakeSupabase
+
+USER_ID = str(uuid.uuid4())
+
+
+def _store(first_year: int, last_year: int) -> tuple[FakeSupabase, set[date]]:
+    """Several receipts on most days of the years, capped at 1000 rows per response."""
+    rng = random.Random(18)
+    store = FakeSupabase(max_rows=1000)
+    store.tables["user_settings"] = [{**DEFAULT_SETTINGS, "user_id": USER_ID}]
+    store.tables["user_holidays"] = []
+    store.tables["work_schedule_periods"] = []
+    receipts, days = [], set()
+    day = date(first_year, 1, 1)
+    while day.year <= last_year:
+        if rng.random() < 0.7:
+            days.add(day)
+            receipts += [
+                {"id": str(uuid.uuid4()), "user_id": USER_ID, "receipt_date": day.isoformat(),
+                 "storage_path": f"{USER_ID}/{day}-{i}.jpg"}
+                for i in range(5)
+            ]
+        day += timedelta(days=1)
+    store.tables["receipts"] = receipts
+    return store, days
+
+
+def test_range_inputs_load_every_receipt():
+    store, days = _store(2021, 2024)
+    assert len(store.tables["receipts"]) > 1000
+    inputs, _ = asyncio.run(loaders.load_range_inputs_async(AsyncFakeSupabase(store), USER_ID, 2021, 2024, DEFAULT_SETTINGS))
+    assert inputs["receipt_dates"] == {year: {d for d in days if d.year == year} for year in range(2021, 2025)}
+
+
+def test_year_inputs_load_every_receipt():
+    store, days = _store(2024, 2024)
+    assert len(store.tables["receipts"]) > 1000
+    summary, _ = loaders.load_summary_inputs(store, USER_ID, 2024, DEFAULT_SETTINGS)
+    assert summary["receipt_dates"] == days
+
+    report, _ = asyncio.run(loaders.load_report_inputs_async(AsyncFakeSupabase(store), USER_ID, 2024, DEFAULT_SETTINGS, None))
+    ids = [r["id"] for r in report["receipts"]]
+    assert len(ids) == len(set(ids)) == len(store.tables["receipts"])
@@ -0,0 +1,55 @@
+"""GET /report/jobs/{id} for finished jobs whose PDF was replaced by a newer report."""
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import report_cache, report_jobs, signed_urls
+from benchmarks._fakes import AsyncFakeSupabase, FakeSupabase
+
+USER_ID = str(uuid.uuid4())
+YEAR = 2024
+
+
+@pytest.fixture
+def store():
+    signed_urls._cache.clear()
+    store = FakeSupabase()
+    path = report_cache.put(store, USER_ID, YEAR, "a" * 64, b"%PDF-old")
+    store.tables["report_jobs"] = [{"id": "job-1", "user_id": USER_ID, "year": YEAR, "status": "done", "storage_path": path}]
+    yield store
+    signed_urls._cache.clear()
+
+
+def _get(store: FakeSupabase) -> dict:
+    return asyncio.run(report_jobs.get_async(AsyncFakeSupabase(store), USER_ID, "job-1"))
+
+
+def _assert_gone(store: FakeSupabase) -> None:
+    with pytest.raises(HTTPException) as e:
+        _get(store)
+    assert e.value.status_code == 410
+
+
+def test_done_job_gets_a_link(store):
+    assert _get(store)["download_url"].startswith("https://fake/receipts/")
+
+
+def test_replaced_report_is_gone(store):
+    _get(store)  # caches the signed URL
+    report_cache.put(store, USER_ID, YEAR, "b" * 64, b"%PDF-new")
+    _assert_gone(store)
+
+
+def test_replaced_report_is_gone_async(store):
+    _get(store)
+    asyncio.run(report_cache.put_async(AsyncFakeSupabase(store), USER_ID, YEAR, "b" * 64, b"%PDF-new"))
+    _assert_gone(store)
+
+
+def test_replaced_by_another_instance_is_gone(store):
+    _get(store)
+    # Removed elsewhere: this process's signed-URL cache still holds the old link
+    del store.objects[store.tables["report_jobs"][0]["storage_path"]]
+    _assert_gone(store)
@@ -0,0 +1,117 @@
+"""Local access-token verification (AUTH_VERIFICATION=local) and its Supabase Auth fallback."""
+import time
+import uuid
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app import dependencies
+from app.config import settings
+from app.models.auth import AuthenticatedUser
+from app.services import tokens
+
+SECRET = "test-jwt-secret-" + "x" * 64
+URL = "https://project.supabase.co"
+USER_ID = str(uuid.uuid4())
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", URL)
+    monkeypatch.setattr(settings, "supabase_jwt_secret", SECRET)
+    monkeypatch.setattr(settings, "supabase_jwt_audience", "authenticated")
+    monkeypatch.setattr(settings, "auth_verification", "local")
+
+
+def _claims(**overrides) -> dict:
+    claims = {
+        "sub": USER_ID,
+        "email": "user@example.com",
+        "role": "authenticated",
+        "aud": "authenticated",
+        "iss": f"{URL}/auth/v1",
+        "exp": int(time.time()) + 3600,
+    }
+    claims.update(overrides)
+    return {k: v for k, v in claims.items() if v is not None}
+
+
+def _token(key=SECRET, algorithm="HS256", **overrides) -> str:
+    return jwt.encode(_claims(**overrides), key, algorithm=algorithm)
+
+
+def test_valid_hs256_token():
+    user = tokens.verify_access_token(_token())
+    assert user == AuthenticatedUser(id=USER_ID, email="user@example.com", role="authenticated", aud="authenticated")
+
+
+def test_trailing_slash_in_supabase_url(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", f"{URL}/")
+    assert tokens.verify_access_token(_token()) is not None
+
+
+def test_expired_token_is_401():
+    with pytest.raises(HTTPException) as e:
+        tokens.verify_access_token(_token(exp=int(time.time()) - 60))
+    assert e.value.status_code == 401
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "anon"},
+        {"iss": "https://other.supabase.co/auth/v1"},
+        {"sub": None},
+    ],
+    ids=["wrong-aud", "wrong-iss", "missing-sub"],
+)
+def test_rejected_claims_are_not_verified_locally(overrides):
+    assert tokens.verify_access_token(_token(**overrides)) is None
+
+
+def test_bad_signature():
+    assert tokens.verify_access_token(_token(key="another-secret-" + "y" * 64)) is None
+
+
+@pytest.mark.parametrize("algorithm", ["HS512", "none"])
+def test_algorithm_not_allowed(algorithm):
+    token = jwt.encode(_claims(), None if algorithm == "none" else SECRET, algorithm=algorithm)
+    assert tokens.verify_access_token(token) is None
+
+
+def test_jwks_failure_falls_back_to_supabase_auth(monkeypatch):
+    class _Unreachable:
+        def get_signing_key_from_jwt(self, token):
+            raise jwt.PyJWKClientError("Fail to fetch data from the url")
+
+    monkeypatch.setattr(tokens, "_jwks_client", lambda: _Unreachable())
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    token = _token(key=private_key, algorithm="RS256")
+    assert tokens.verify_access_token(token) is None
+
+    remote_user = SimpleNamespace(id=USER_ID, email="user@example.com", role="authenticated", aud="authenticated")
+    calls = []
+
+    def get_user(jwt_):
+        calls.append(jwt_)
+        return SimpleNamespace(user=remote_user)
+
+    monkeypatch.setattr(dependencies, "get_supabase_admin", lambda: SimpleNamespace(auth=SimpleNamespace(get_user=get_user)))
+    user = dependencies.get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    assert calls == [token]
+    assert user == tokens.verify_access_token(_token())  # same type and id (UUID) as the local path
+    assert isinstance(user.id, uuid.UUID)
+
+
+def test_remote_rejection_is_401(monkeypatch):
+    def get_user(jwt_):
+        raise RuntimeError("invalid JWT")
+
+    monkeypatch.setattr(dependencies, "get_supabase_admin", lambda: SimpleNamespace(auth=SimpleNamespace(get_user=get_user)))
+    with pytest.raises(HTTPException) as e:
+        dependencies.get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=_token(aud="anon")))
+    assert e.value.status_code == 401
@@ -0,0 +1,35 @@
+"""Uploads whose declared Content-Length is over UPLOAD_MAX_BYTES are rejected before the body is read."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _small_limit(monkeypatch):
+    monkeypatch.setattr(settings, "upload_max_bytes", 1024)
+    monkeypatch.setattr(settings, "upload_batch_max_files", 2)
+
+
+def _files(n: int, size: int) -> list:
+    return [("file" if n == 1 else "files", (f"{i}.jpg", b"\xff\xd8\xff" + b"\0" * size, "image/jpeg")) for i in range(n)]
+
+
+def test_oversized_upload_is_413_before_the_route():
+    # No Authorization header: the route (and its auth dependency) never runs
+    response = client.post("/receipts/upload", files=_files(1, 200 * 1024))
+    assert response.status_code == 413
+    assert response.json() == {"detail": "File exceeds the 0 MB upload limit"}
+
+
+def test_oversized_batch_is_413():
+    response = client.post("/receipts/upload-batch", files=_files(2, 200 * 1024))
+    assert response.status_code == 413
+
+
+def test_upload_within_limit_reaches_the_route():
+    response = client.post("/receipts/upload", files=_files(1, 512))
+    assert response.status_code in (401, 403)  # rejected by auth, not by size